@@ -25,6 +25,13 @@ CAPACIDAD_PICKING_DIARIA = 1500
 # Horas de jornada laboral
 HORAS_JORNADA = 8
 
+# Selección de pedidos para picking: "greedy" (por prioridad) o "mochila"
+# (maximiza unidades ponderadas por prioridad dentro de la capacidad)
+MODO_PICKING = "greedy"
+
+# Arrastrar al día siguiente los pedidos que no alcanzan capacidad de picking
+ARRASTRAR_BACKLOG = False
+
 # ============================================================================
 # GESTIÓN DE INVENTARIO
 # ============================================================================
@@ -38,6 +45,13 @@ PUNTO_REORDEN = 50
 # Cantidad a reponer cuando se alcanza punto de reorden
 LOTE_REPOSICION = 100
 
+# Política de reposición: "simple" (llegada inmediata), "sS" o "RQ"
+# (sobre la posición de inventario, con lead time)
+POLITICA_REPOSICION = "simple"
+
+# Días entre la orden de compra y su llegada (políticas "sS" y "RQ")
+LEAD_TIME_REPOSICION_DIAS = 0
+
 # ============================================================================
 # INDICADORES Y UMBRALES DE ALERTAS
 # ============================================================================
@@ -107,13 +121,17 @@ DIRECTORIO_DATOS = "data"
 ARCHIVO_REPORTE_TXT = "reporte_final.txt"
 ARCHIVO_REPORTE_CSV = "reporte_final.csv"
 ARCHIVO_SIMULACION_JSON = "simulacion.json"
+ARCHIVO_SIMULACION_CSV = "simulacion.csv"
+
+# Días entre fotos del diario de inventario que guarda la pantalla de simulación
+DIAS_FOTO_DIARIO_INVENTARIO = 7
 
 # ============================================================================
 # PARÁMETROS DE TRANSPORTE
 # ============================================================================
 
 # Algoritmo de asignación de vehículos
-ALGORITMO_TRANSPORTE = "greedy"  # "greedy", "optimal", "first-fit"
+ALGORITMO_TRANSPORTE = "greedy"  # "greedy", "optimal", "first-fit", "savings"
 
 # Distancias mínimas y máximas (km) para validación
 DISTANCIA_MINIMA = 10
@@ -2,8 +2,15 @@
 main.py - Punto de entrada de la aplicación PyQt6
 """
 
+import time
+
+INICIO = time.perf_counter()
+
+import logging
+import os
 import sys
 from pathlib import Path
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 
 # Agregar directorio padre al path para imports
@@ -11,9 +18,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from gui.ventanas.ventana_principal import VentanaPrincipal
 
+# Con esta variable de entorno definida se registran los tiempos de arranque
+# y de creación de cada pantalla
+VARIABLE_DEPURACION = "LOGISTICA_SIM_DEBUG"
+
+logger = logging.getLogger(__name__)
+
+
+def reportar_tiempo_inicio():
+    """Registra el tiempo de arranque de la aplicación (nivel DEBUG)"""
+    logger.debug("Interfaz lista en %.0f ms", (time.perf_counter() - INICIO) * 1000)
+
 
 def main():
     """Función principal que inicia la aplicación"""
+    if os.environ.get(VARIABLE_DEPURACION):
+        logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     app = QApplication(sys.argv)
 
     # Configurar estilo
@@ -23,6 +44,9 @@ def main():
     ventana = VentanaPrincipal()
     ventana.show()
 
+    # Tiempo hasta que el bucle de eventos queda libre con la ventana visible
+    QTimer.singleShot(0, reportar_tiempo_inicio)
+
     sys.exit(app.exec())
 
 
@@ -0,0 +1,375 @@
+"""
+modelos.py - Modelos de tabla sobre arreglos columnares
+
+ModeloColumnar guarda cada columna como un arreglo numpy y entrega el
+texto de una celda solo cuando la vista la pinta, sin un
+QTableWidgetItem por celda. ProxyColumnar ordena y filtra sobre los
+arreglos (argsort y máscaras) y expone el resultado como un arreglo de
+índices de filas del modelo.
+"""
+
+import numpy as np
+
+from PyQt6.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QHeaderView, QTableView
+
+
+class ModeloColumnar(QAbstractTableModel):
+    """
+    Tabla de solo lectura con una columna numpy por encabezado.
+
+    Las columnas crecen por duplicación de capacidad, así que agregar
+    filas de a una (por ejemplo, un día de simulación) es O(1) amortizado.
+    """
+
+    def __init__(self, encabezados, formatos=None, colores=None, padre=None):
+        """
+        Args:
+            encabezados: Lista de títulos de columna
+            formatos: {columna: función(valor) -> str} (por defecto, str)
+            colores: {columna: {valor: "#RRGGBB"}} para el fondo de la celda
+            padre: QObject padre
+        """
+        super().__init__(padre)
+        self.encabezados = list(encabezados)
+        self.formatos = formatos or {}
+        self.colores = {
+            col: {valor: QColor(color) for valor, color in mapa.items()}
+            for col, mapa in (colores or {}).items()
+        }
+        self._columnas = [np.empty(0, dtype=object) for _ in self.encabezados]
+        self._filas = 0
+
+    # --- Datos ---
+
+    @staticmethod
+    def _como_columna(valores):
+        arreglo = np.asarray(valores)
+        # Los textos se guardan como objeto para no truncarlos al crecer
+        if arreglo.dtype.kind in "USO":
+            arreglo = arreglo.astype(object)
+        return arreglo
+
+    def cargar(self, columnas):
+        """
+        Reemplaza todos los datos.
+
+        Args:
+            columnas: Lista de secuencias (una por encabezado, mismo largo)
+        """
+        self.beginResetModel()
+        self._columnas = [self._como_columna(c) for c in columnas]
+        self._filas = len(self._columnas[0]) if self._columnas else 0
+        self.endResetModel()
+
+    def limpiar(self):
+        """Deja la tabla sin filas"""
+        self.cargar([np.empty(0, dtype=object) for _ in self.encabezados])
+
+    def agregar_fila(self, valores):
+        """Agrega una fila al final (valores en el orden de los encabezados)"""
+        self.agregar_filas([[v] for v in valores])
+
+    def agregar_filas(self, columnas):
+        """
+        Agrega un bloque de filas al final.
+
+        Args:
+            columnas: Lista de secuencias (una por encabezado, mismo largo)
+        """
+        nuevas = [self._como_columna(c) for c in columnas]
+        n = len(nuevas[0]) if nuevas else 0
+        if n == 0:
+            return
+
+        inicio = self._filas
+        fin = inicio + n
+        self.beginInsertRows(QModelIndex(), inicio, fin - 1)
+        for j, nueva in enumerate(nuevas):
+            actual = self._columnas[j]
+            tipo = nueva.dtype if inicio == 0 else np.result_type(actual, nueva)
+            if fin > len(actual) or tipo != actual.dtype:
+                capacidad = len(actual)
+                if fin > capacidad:
+                    capacidad = max(fin, 2 * capacidad, 16)
+                crecida = np.empty(capacidad, dtype=tipo)
+                crecida[:inicio] = actual[:inicio]
+                actual = crecida
+                self._columnas[j] = actual
+            actual[inicio:fin] = nueva
+        self._filas = fin
+        self.endInsertRows()
+
+    def columna(self, j):
+        """Vista del arreglo de la columna j (solo las filas usadas)"""
+        return self._columnas[j][: self._filas]
+
+    def texto(self, fila, j):
+        """Texto a mostrar en la celda (fila, j)"""
+        valor = self._columnas[j][fila]
+        formato = self.formatos.get(j)
+        if formato is not None:
+            return formato(valor)
+        return str(valor)
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._filas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.encabezados)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        fila, j = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.texto(fila, j)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if self._columnas[j].dtype.kind in "iuf":
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            return None
+        if role == Qt.ItemDataRole.BackgroundRole and j in self.colores:
+            return self.colores[j].get(self._columnas[j][fila])
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientacion == Qt.Orientation.Horizontal:
+            return self.encabezados[seccion]
+        return str(seccion + 1)
+
+
+# Tramos de inserción por bloque de filas nuevas antes de reiniciar la vista
+MAX_TRAMOS_INSERCION = 64
+
+
+class ProxyColumnar(QAbstractProxyModel):
+    """
+    Orden y filtro de un ModeloColumnar calculados sobre sus arreglos.
+
+    La vista ve las filas self.indices del modelo, en ese orden. Las filas
+    agregadas al modelo se filtran y ubican de a bloque, sin recalcular
+    ni reiniciar la vista.
+    """
+
+    def __init__(self, modelo, padre=None):
+        super().__init__(padre)
+        self._columna_orden = None
+        self._descendente = False
+        self._filtro = ""
+        self._columna_filtro = None
+        self.indices = np.empty(0, dtype=np.int64)
+        self._posiciones = None
+        self.setSourceModel(modelo)
+        modelo.modelReset.connect(self._recalcular)
+        modelo.rowsInserted.connect(self._filas_agregadas)
+        self._recalcular()
+
+    # --- Orden y filtro ---
+
+    def sort(self, columna, orden=Qt.SortOrder.AscendingOrder):
+        """Ordena por la columna indicada (orden estable)"""
+        self._columna_orden = columna if columna >= 0 else None
+        self._descendente = orden == Qt.SortOrder.DescendingOrder
+        self._recalcular()
+
+    def filtrar(self, texto, columna=None):
+        """
+        Muestra solo las filas con algún valor que contiene el texto.
+
+        Args:
+            texto: Texto a buscar (sin distinguir mayúsculas); "" quita el filtro
+            columna: Columna donde buscar (por defecto, todas)
+        """
+        self._filtro = texto.strip().lower()
+        self._columna_filtro = columna
+        self._recalcular()
+
+    def _mascara_filtro(self, modelo, inicio=0, fin=None):
+        """Filas de modelo[inicio:fin] que pasan el filtro"""
+        columnas = (
+            range(modelo.columnCount())
+            if self._columna_filtro is None
+            else [self._columna_filtro]
+        )
+        if fin is None:
+            fin = modelo.rowCount()
+        mascara = np.zeros(fin - inicio, dtype=bool)
+        for j in columnas:
+            textos = np.char.lower(modelo.columna(j)[inicio:fin].astype(str))
+            mascara |= np.char.find(textos, self._filtro) >= 0
+        return mascara
+
+    def _calcular_indices(self):
+        modelo = self.sourceModel()
+        indices = np.arange(modelo.rowCount(), dtype=np.int64)
+        if self._filtro:
+            indices = indices[self._mascara_filtro(modelo)]
+        if self._columna_orden is not None:
+            claves = modelo.columna(self._columna_orden)[indices]
+            orden = np.argsort(claves, kind="stable")
+            if self._descendente:
+                orden = orden[::-1]
+            indices = indices[orden]
+        return indices
+
+    def _recalcular(self):
+        self.beginResetModel()
+        self.indices = self._calcular_indices()
+        self._posiciones = None
+        self.endResetModel()
+
+    def _filas_agregadas(self, parent, primera, ultima):
+        """
+        Incorpora filas nuevas del modelo sin recalcular las existentes:
+        solo las nuevas pasan por el filtro y, si hay orden, se ubican con
+        búsqueda binaria sobre las claves ya ordenadas.
+        """
+        modelo = self.sourceModel()
+        nuevas = np.arange(primera, ultima + 1, dtype=np.int64)
+        if self._filtro:
+            nuevas = nuevas[self._mascara_filtro(modelo, primera, ultima + 1)]
+        if len(nuevas) == 0:
+            return
+
+        if self._columna_orden is None:
+            inicio = len(self.indices)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevas) - 1)
+            self.indices = np.concatenate([self.indices, nuevas])
+            self._posiciones = None
+            self.endInsertRows()
+            return
+
+        # Se trabaja en orden ascendente; el descendente es su reverso
+        # (igual que en _calcular_indices)
+        claves = modelo.columna(self._columna_orden)
+        ascendente = self.indices[::-1] if self._descendente else self.indices
+        nuevas = nuevas[np.argsort(claves[nuevas], kind="stable")]
+        posiciones = np.searchsorted(claves[ascendente], claves[nuevas], side="right")
+        final = np.insert(ascendente, posiciones, nuevas)
+        es_nueva = np.insert(np.zeros(len(ascendente), dtype=bool), posiciones, True)
+        if self._descendente:
+            final = final[::-1]
+            es_nueva = es_nueva[::-1]
+        self._insertar_tramos(final, es_nueva)
+
+    def _insertar_tramos(self, final, es_nueva):
+        """
+        Pasa a la vista `final` avisando cada tramo contiguo de filas nuevas
+        como una inserción, para conservar selección y desplazamiento. Con
+        demasiados tramos sale más barato reiniciar la vista.
+        """
+        filas = np.flatnonzero(es_nueva)
+        tramos = np.split(filas, np.flatnonzero(np.diff(filas) > 1) + 1)
+        if len(tramos) > MAX_TRAMOS_INSERCION:
+            self.beginResetModel()
+            self.indices = final
+            self._posiciones = None
+            self.endResetModel()
+            return
+
+        insertadas = np.zeros(len(final), dtype=bool)
+        for tramo in tramos:
+            self.beginInsertRows(QModelIndex(), int(tramo[0]), int(tramo[-1]))
+            insertadas[tramo] = True
+            self.indices = final[~es_nueva | insertadas]
+            self._posiciones = None
+            self.endInsertRows()
+
+    # --- Interfaz de QAbstractProxyModel ---
+
+    def index(self, fila, columna, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= fila < len(self.indices)):
+            return QModelIndex()
+        return self.createIndex(fila, columna)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.indices)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        fila = int(self.indices[proxy_index.row()])
+        return self.sourceModel().index(fila, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._posiciones is None:
+            # Posición de cada fila del modelo en la vista (-1 si está filtrada)
+            self._posiciones = np.full(self.sourceModel().rowCount(), -1, dtype=np.int64)
+            self._posiciones[self.indices] = np.arange(len(self.indices))
+        fila = int(self._posiciones[source_index.row()])
+        if fila < 0:
+            return QModelIndex()
+        return self.createIndex(fila, source_index.column())
+
+    def headerData(self, seccion, orientacion, role=Qt.ItemDataRole.DisplayRole):
+        if orientacion == Qt.Orientation.Horizontal:
+            return self.sourceModel().headerData(seccion, orientacion, role)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(seccion + 1)
+        return None
+
+
+def crear_vista_tabla(modelo, ordenable=True):
+    """
+    QTableView sobre un ModeloColumnar (con ProxyColumnar si es ordenable).
+
+    El alto de fila es fijo para que la vista no mida cada fila.
+
+    Returns:
+        Tupla (vista, proxy) (proxy es None si no es ordenable)
+    """
+    vista = QTableView()
+    proxy = None
+    if ordenable:
+        proxy = ProxyColumnar(modelo, vista)
+        vista.setModel(proxy)
+        vista.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        vista.setSortingEnabled(True)
+    else:
+        vista.setModel(modelo)
+    vista.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    vista.verticalHeader().setDefaultSectionSize(vista.fontMetrics().height() + 8)
+    vista.horizontalHeader().setStretchLastSection(True)
+    return vista, proxy
+
+
+def ajustar_columnas(vista, muestra=200, margen=24):
+    """
+    Ajusta el ancho de las columnas mirando solo una muestra de filas.
+
+    A diferencia de resizeColumnsToContents, el costo no depende del
+    número de filas: se miden el encabezado y las primeras y últimas
+    muestra // 2 filas de la vista.
+    """
+    modelo = vista.model()
+    filas = modelo.rowCount()
+    mitad = muestra // 2
+    if filas <= muestra:
+        muestreadas = range(filas)
+    else:
+        muestreadas = list(range(mitad)) + list(range(filas - mitad, filas))
+
+    metricas = vista.fontMetrics()
+    for j in range(modelo.columnCount()):
+        encabezado = modelo.headerData(
+            j, Qt.Orientation.Horizontal, Qt.ItemDataRole.DisplayRole
+        )
+        ancho = metricas.horizontalAdvance(str(encabezado))
+        for i in muestreadas:
+            texto = modelo.data(modelo.index(i, j), Qt.ItemDataRole.DisplayRole)
+            if texto:
+                ancho = max(ancho, metricas.horizontalAdvance(texto))
+        vista.setColumnWidth(j, ancho + margen)
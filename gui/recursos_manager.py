@@ -1,21 +1,110 @@
 """
 recursos.py - Gestor de recursos (estilos e ícono) para la GUI
 
-Proporciona funciones para cargar estilos, ícono y logos
+Proporciona funciones para cargar estilos, ícono y logos.
+
+Los recursos se guardan en un caché de proceso: la carpeta se recorre una
+sola vez (y de nuevo cada INTERVALO_REVISION_S segundos como máximo) y lo
+cargado se descarta solo si cambia la fecha de modificación del archivo.
+Los logos escalados van a QPixmapCache con clave (nombre, ancho, mtime).
 """
 
 import os
+import time
 from pathlib import Path
-from PyQt6.QtGui import QIcon, QPixmap
+from PyQt6.QtGui import QIcon, QPixmap, QPixmapCache
 from PyQt6.QtCore import QSize
 
 
+INTERVALO_REVISION_S = 2.0
+
+
 def obtener_ruta_recursos():
     """Obtiene la ruta absoluta de la carpeta de recursos"""
     ruta_actual = Path(__file__).parent
     return ruta_actual / "recursos"
 
 
+class CacheRecursos:
+    """
+    Índice de la carpeta de recursos y caché de lo ya cargado.
+
+    El índice {"iconos/inicio.png": mtime} se arma con un solo recorrido
+    (os.scandir) en lugar de un exists() por llamada. Al revisar de nuevo,
+    las entradas cuyo mtime cambió salen del caché.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        self.indice = {}
+        self.ultima_revision = None
+        self.iconos = {}  # {(nombre, tamaño): (mtime, QIcon)}
+        self.estilos = None  # (mtime, texto)
+        self.avisados = set()
+
+    def revisar(self, forzar=False):
+        """Vuelve a recorrer la carpeta si pasó INTERVALO_REVISION_S"""
+        ahora = time.monotonic()
+        if (
+            not forzar
+            and self.ultima_revision is not None
+            and ahora - self.ultima_revision < INTERVALO_REVISION_S
+        ):
+            return
+        self.ultima_revision = ahora
+
+        indice = {}
+        pendientes = [("", self.ruta)]
+        while pendientes:
+            prefijo, carpeta = pendientes.pop()
+            try:
+                entradas = list(os.scandir(carpeta))
+            except OSError:
+                continue
+            for entrada in entradas:
+                relativa = prefijo + entrada.name
+                if entrada.is_dir():
+                    pendientes.append((relativa + "/", entrada.path))
+                else:
+                    indice[relativa] = entrada.stat().st_mtime_ns
+        self.indice = indice
+
+        self.iconos = {
+            clave: valor
+            for clave, valor in self.iconos.items()
+            if indice.get(f"iconos/{clave[0]}.png") == valor[0]
+        }
+
+    def mtime(self, relativa):
+        """Fecha de modificación del recurso o None si no existe"""
+        self.revisar()
+        return self.indice.get(relativa)
+
+    def avisar(self, mensaje):
+        """Imprime un aviso una sola vez"""
+        if mensaje not in self.avisados:
+            self.avisados.add(mensaje)
+            print(mensaje)
+
+
+_CACHE = None
+
+
+def obtener_cache():
+    """Caché de recursos del proceso (se crea en el primer uso)"""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = CacheRecursos(obtener_ruta_recursos())
+    return _CACHE
+
+
+def limpiar_cache():
+    """Descarta todo lo cargado y fuerza a recorrer la carpeta de nuevo"""
+    global _CACHE
+    _CACHE = None
+    QPixmapCache.clear()
+
+
 def cargar_estilos(app):
     """
     Carga y aplica los estilos CSS a la aplicación
@@ -27,16 +116,19 @@ def cargar_estilos(app):
         bool: True si se cargó correctamente, False en caso contrario
     """
     try:
-        ruta_estilos = obtener_ruta_recursos() / "estilos.qss"
+        cache = obtener_cache()
+        ruta_estilos = cache.ruta / "estilos.qss"
+        mtime = cache.mtime("estilos.qss")
         
-        if not ruta_estilos.exists():
+        if mtime is None:
             print(f"⚠️ Archivo de estilos no encontrado: {ruta_estilos}")
             return False
         
-        with open(ruta_estilos, 'r', encoding='utf-8') as f:
-            stylesheet = f.read()
+        if cache.estilos is None or cache.estilos[0] != mtime:
+            with open(ruta_estilos, 'r', encoding='utf-8') as f:
+                cache.estilos = (mtime, f.read())
         
-        app.setStyleSheet(stylesheet)
+        app.setStyleSheet(cache.estilos[1])
         print(f"✓ Estilos cargados correctamente")
         return True
         
@@ -57,14 +149,23 @@ def cargar_icono(nombre_icono, tamaño=64):
         QIcon: Ícono cargado o None si no existe
     """
     try:
-        ruta_icono = obtener_ruta_recursos() / "iconos" / f"{nombre_icono}.png"
+        cache = obtener_cache()
+        ruta_icono = cache.ruta / "iconos" / f"{nombre_icono}.png"
+        mtime = cache.mtime(f"iconos/{nombre_icono}.png")
         
-        if not ruta_icono.exists():
-            print(f"⚠️ Ícono no encontrado: {ruta_icono}")
+        if mtime is None:
+            cache.avisar(f"⚠️ Ícono no encontrado: {ruta_icono}")
             # Retornar ícono vacío para no romper la interfaz
             return QIcon()
         
-        icono = QIcon(str(ruta_icono))
+        clave = (nombre_icono, tamaño)
+        guardado = cache.iconos.get(clave)
+        if guardado is not None and guardado[0] == mtime:
+            return guardado[1]
+        
+        icono = QIcon()
+        icono.addFile(str(ruta_icono), QSize(tamaño, tamaño))
+        cache.iconos[clave] = (mtime, icono)
         return icono
         
     except Exception as e:
@@ -84,19 +185,32 @@ def cargar_logo(nombre_logo, ancho=200):
         QPixmap: Logo cargado o None si no existe
     """
     try:
-        ruta_logo = obtener_ruta_recursos() / "logos" / f"{nombre_logo}.png"
+        cache = obtener_cache()
+        ruta_logo = cache.ruta / "logos" / f"{nombre_logo}.png"
+        mtime = cache.mtime(f"logos/{nombre_logo}.png")
         
-        if not ruta_logo.exists():
-            print(f"⚠️ Logo no encontrado: {ruta_logo}")
+        if mtime is None:
+            cache.avisar(f"⚠️ Logo no encontrado: {ruta_logo}")
             return None
         
-        pixmap = QPixmap(str(ruta_logo))
-        if pixmap.isNull():
-            print(f"⚠️ No se pudo cargar la imagen: {ruta_logo}")
-            return None
+        # El mtime en la clave invalida las versiones de un archivo viejo
+        clave = f"logo:{nombre_logo}:{ancho}:{mtime}"
+        pixmap = QPixmapCache.find(clave)
+        if pixmap is not None:
+            return pixmap
+        
+        clave_original = f"logo:{nombre_logo}:original:{mtime}"
+        original = QPixmapCache.find(clave_original)
+        if original is None:
+            original = QPixmap(str(ruta_logo))
+            if original.isNull():
+                cache.avisar(f"⚠️ No se pudo cargar la imagen: {ruta_logo}")
+                return None
+            QPixmapCache.insert(clave_original, original)
         
         # Redimensionar manteniendo aspecto
-        pixmap = pixmap.scaledToWidth(ancho)
+        pixmap = original.scaledToWidth(ancho)
+        QPixmapCache.insert(clave, pixmap)
         return pixmap
         
     except Exception as e:
@@ -120,7 +234,8 @@ def obtener_icono_con_emoji(emoji_char, nombre_fallback="inicio"):
 
 def obtener_diccionario_iconos():
     """
-    Retorna diccionario con todos los ícono disponibles
+    Retorna diccionario con todos los ícono disponibles (ver cargar_icono,
+    los íconos salen del caché y no se vuelven a leer)
     
     Returns:
         dict: {nombre_icono: QIcon}
@@ -0,0 +1,137 @@
+"""
+trabajadores.py - Ejecución de la simulación fuera del hilo de la interfaz
+"""
+
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+
+# Segundos entre envíos de filas a la interfaz
+INTERVALO_EMISION_S = 0.1
+
+
+class TrabajadorSimulacion(QObject):
+    """
+    Ejecuta la simulación completa día a día en un QThread.
+
+    Las filas de los días (una por día, con sus indicadores) se envían por
+    bloques en dias_completados, como máximo cada INTERVALO_EMISION_S, junto
+    con progreso (día, total): una corrida larga no llena la cola de
+    eventos de la interfaz con una señal por día. Entre un día y el
+    siguiente revisa si se pidió cancelar.
+    """
+
+    progreso = pyqtSignal(int, int)
+    dias_completados = pyqtSignal(list)
+    terminado = pyqtSignal(object)
+    cancelado = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, n_dias, seed=None, parametros=None):
+        super().__init__()
+        self.n_dias = n_dias
+        self.seed = seed
+        self.parametros = parametros or {}
+        self._cancelar = threading.Event()
+
+    def cancelar(self):
+        """Pide detener la simulación al terminar el día en curso"""
+        self._cancelar.set()
+
+    def ejecutar(self):
+        """Bucle de simulación (corre en el hilo del trabajador)"""
+        try:
+            # El motor se importa al simular, no al abrir la pantalla
+            from sistema.catalogos import (
+                dic_sku,
+                dic_clientes,
+                dic_vehiculos,
+                distancias_km,
+            )
+            from sistema.demanda import iter_demanda, obtener_sku_mas_solicitado
+            from sistema.motor import Simulacion, ResultadoSimulacion
+
+            simulacion = Simulacion(
+                dic_clientes,
+                dic_sku,
+                dic_vehiculos,
+                distancias_km,
+                seed=self.seed,
+                **self.parametros,
+            )
+            resultado = ResultadoSimulacion()
+            bloque = []
+            ultimo_envio = time.monotonic()
+
+            for dia, pedidos_dia in iter_demanda(
+                self.n_dias, dic_clientes, dic_sku, seed=self.seed
+            ):
+                if self._cancelar.is_set():
+                    self._enviar(bloque)
+                    self.cancelado.emit()
+                    return
+
+                resultado_dia = simulacion.paso(dia, pedidos_dia)
+                resultado.registrar_dia(resultado_dia)
+                sku_popular, _ = obtener_sku_mas_solicitado(pedidos_dia)
+
+                bloque.append(
+                    {
+                        "dia": dia,
+                        "pedidos": resultado_dia["pedidos"],
+                        "unidades": resultado_dia["unidades_solicitadas"],
+                        "sku_popular": sku_popular,
+                        "indicadores": resultado_dia["indicadores"],
+                    }
+                )
+                if time.monotonic() - ultimo_envio >= INTERVALO_EMISION_S:
+                    bloque = self._enviar(bloque)
+                    ultimo_envio = time.monotonic()
+
+            self._enviar(bloque)
+            self.terminado.emit(simulacion.cerrar_resultado(resultado))
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _enviar(self, bloque):
+        """Emite las filas acumuladas y el progreso; devuelve un bloque vacío"""
+        if bloque:
+            self.dias_completados.emit(bloque)
+            self.progreso.emit(bloque[-1]["dia"], self.n_dias)
+        return []
+
+
+def iniciar_en_hilo(trabajador, padre=None):
+    """
+    Mueve el trabajador a un QThread nuevo y lo inicia.
+
+    El hilo se detiene y se libera cuando el trabajador termina, se
+    cancela o falla. Para cerrar con una simulación en curso, usar
+    detener_hilo.
+
+    Returns:
+        QThread (hay que guardar la referencia mientras corre)
+    """
+    hilo = QThread(padre)
+    trabajador.moveToThread(hilo)
+    hilo.started.connect(trabajador.ejecutar)
+    for senal in (trabajador.terminado, trabajador.cancelado, trabajador.error):
+        senal.connect(hilo.quit)
+    hilo.finished.connect(trabajador.deleteLater)
+    hilo.finished.connect(hilo.deleteLater)
+    hilo.start()
+    return hilo
+
+
+def detener_hilo(trabajador, hilo):
+    """
+    Cancela el trabajador y espera a que su hilo termine.
+
+    El trabajador se detiene al terminar el día en curso, así que la
+    espera dura como mucho un día de simulación.
+    """
+    trabajador.cancelar()
+    hilo.quit()
+    hilo.wait()
@@ -3,10 +3,11 @@ ventana_catalogos.py - Pantalla de gestión de catálogos
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QTabWidget, QLabel)
+                            QTabWidget, QLabel)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
+from gui.modelos import ModeloColumnar, crear_vista_tabla, ajustar_columnas
 from sistema.catalogos import dic_sku, dic_clientes, dic_vehiculos
 
 
@@ -63,64 +64,46 @@ class VentanaCatalogos(QWidget):
         h_botones.addWidget(btn_volver)
         layout.addLayout(h_botones)
     
-    def crear_tab_skus(self):
-        """Crea el tab de SKUs"""
+    def crear_tab_tabla(self, encabezados, columnas, formatos=None):
+        """Crea un tab con una tabla sobre columnas de datos"""
         widget = QWidget()
         layout = QVBoxLayout(widget)
         
-        tabla = QTableWidget()
-        tabla.setColumnCount(2)
-        tabla.setHorizontalHeaderLabels(["Código SKU", "Descripción"])
-        tabla.setRowCount(len(dic_sku))
-        
-        for i, (sku, desc) in enumerate(dic_sku.items()):
-            tabla.setItem(i, 0, QTableWidgetItem(sku))
-            tabla.setItem(i, 1, QTableWidgetItem(desc))
-        
-        tabla.resizeColumnsToContents()
+        modelo = ModeloColumnar(encabezados, formatos)
+        modelo.cargar(columnas)
+        tabla, _ = crear_vista_tabla(modelo)
+        ajustar_columnas(tabla)
         layout.addWidget(tabla)
         
         return widget
     
+    def crear_tab_skus(self):
+        """Crea el tab de SKUs"""
+        return self.crear_tab_tabla(
+            ["Código SKU", "Descripción"],
+            [list(dic_sku.keys()), list(dic_sku.values())],
+        )
+    
     def crear_tab_clientes(self):
         """Crea el tab de clientes"""
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        
-        tabla = QTableWidget()
-        tabla.setColumnCount(2)
-        tabla.setHorizontalHeaderLabels(["Código Cliente", "Nombre"])
-        tabla.setRowCount(len(dic_clientes))
-        
-        for i, (cid, nombre) in enumerate(dic_clientes.items()):
-            tabla.setItem(i, 0, QTableWidgetItem(cid))
-            tabla.setItem(i, 1, QTableWidgetItem(nombre))
-        
-        tabla.resizeColumnsToContents()
-        layout.addWidget(tabla)
-        
-        return widget
+        return self.crear_tab_tabla(
+            ["Código Cliente", "Nombre"],
+            [list(dic_clientes.keys()), list(dic_clientes.values())],
+        )
     
     def crear_tab_vehiculos(self):
         """Crea el tab de vehículos"""
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        
-        tabla = QTableWidget()
-        tabla.setColumnCount(4)
-        tabla.setHorizontalHeaderLabels(["Código", "Tipo", "Capacidad", "Costo/km"])
-        tabla.setRowCount(len(dic_vehiculos))
-        
-        for i, (vid, info) in enumerate(dic_vehiculos.items()):
-            tabla.setItem(i, 0, QTableWidgetItem(vid))
-            tabla.setItem(i, 1, QTableWidgetItem(info["tipo"]))
-            tabla.setItem(i, 2, QTableWidgetItem(str(info["capacidad"])))
-            tabla.setItem(i, 3, QTableWidgetItem(f"S/. {info['costo_km']:.2f}"))
-        
-        tabla.resizeColumnsToContents()
-        layout.addWidget(tabla)
-        
-        return widget
+        vehiculos = dic_vehiculos.values()
+        return self.crear_tab_tabla(
+            ["Código", "Tipo", "Capacidad", "Costo/km"],
+            [
+                list(dic_vehiculos.keys()),
+                [info["tipo"] for info in vehiculos],
+                [info["capacidad"] for info in vehiculos],
+                [info["costo_km"] for info in vehiculos],
+            ],
+            formatos={3: lambda costo: f"S/. {costo:.2f}"},
+        )
     
     def exportar_catalogos(self):
         """Exporta los catálogos a CSV (placeholder)"""
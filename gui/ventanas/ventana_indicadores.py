@@ -8,19 +8,52 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QPushButton,
     QLabel,
-    QTableWidget,
-    QTableWidgetItem,
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
+
+from config import UMBRALES_ALERTAS
+from gui.modelos import ModeloColumnar, crear_vista_tabla, ajustar_columnas
+
+COLORES_SEVERIDAD = {"ALTO": "#FFB6C6", "MEDIO": "#FFEB99"}
+
+# Repintados por segundo como máximo mientras corre una simulación
+FPS_ACTUALIZACION = 10
+
+# (título, métrica, formato) de cada tarjeta
+INDICADORES_CARDS = [
+    ("OTIF", "otif", "{:.1f}%"),
+    ("Fill Rate", "fill_rate", "{:.1f}%"),
+    ("Backlog", "backlog_rate", "{:.1f}%"),
+    ("Productividad", "productividad_picking", "{:.2f} unid/h"),
+    ("Flota", "utilizacion_flota", "{:.1f}%"),
+]
 
 
 class VentanaIndicadores(QWidget):
-    """Pantalla de indicadores y alertas"""
+    """
+    Pantalla de indicadores y alertas.
+
+    Se suscribe al flujo diario de un TrabajadorSimulacion: cada día se
+    encola y un QTimer a FPS_ACTUALIZACION lo incorpora por bloques
+    (acumulador de KPIs y ProcesadorAlertas), actualiza las tarjetas una
+    vez y agrega a la tabla solo las aperturas y cierres de alertas nuevos.
+    """
 
     def __init__(self, ventana_principal):
         super().__init__()
         self.ventana_principal = ventana_principal
+        self.pendientes = []
+        self.acumulador = None
+        self.procesador = None
+        self.reglas_por_metrica = {}
+        self.simulando = False
+        self.n_dias = 0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000 // FPS_ACTUALIZACION)
+        self.timer.timeout.connect(self.aplicar_pendientes)
+
         self.init_ui()
 
     def init_ui(self):
@@ -35,19 +68,17 @@ class VentanaIndicadores(QWidget):
         titulo.setFont(titulo_font)
         layout.addWidget(titulo)
 
+        self.label_estado = QLabel("Sin simulación")
+        self.label_estado.setStyleSheet("color: #666; font-style: italic;")
+        layout.addWidget(self.label_estado)
+
         # Grid de indicadores principales
         h_indicadores = QHBoxLayout()
 
-        indicadores_info = [
-            ("OTIF", "95.2%", "verde"),
-            ("Fill Rate", "97.1%", "verde"),
-            ("Backlog", "2.9%", "amarillo"),
-            ("Productividad", "181.25 unid/h", "verde"),
-            ("Flota", "86.7%", "amarillo"),
-        ]
-
-        for titulo_ind, valor, color in indicadores_info:
-            card = self.crear_card_indicador(titulo_ind, valor, color)
+        self.cards = {}
+        for titulo_ind, metrica, _ in INDICADORES_CARDS:
+            card = self.crear_card_indicador(titulo_ind, "--", None)
+            self.cards[metrica] = card
             h_indicadores.addWidget(card)
 
         layout.addLayout(h_indicadores)
@@ -58,35 +89,19 @@ class VentanaIndicadores(QWidget):
         label_alertas.setFont(QFont("Arial", 12, QFont.Weight.Bold))
         layout.addWidget(label_alertas)
 
-        tabla_alertas = QTableWidget()
-        tabla_alertas.setColumnCount(3)
-        tabla_alertas.setHorizontalHeaderLabels(["Tipo", "Severidad", "Mensaje"])
-        tabla_alertas.setRowCount(2)
-
-        # Ejemplos de alertas
-        alertas_ejemplo = [
-            ("OTIF_BAJO", "ALTO", "OTIF menor al 95% - Verificar tiempos"),
-            ("FLOTA_SATURADA", "MEDIO", "Utilización de flota > 85%"),
-        ]
-
-        for i, (tipo, severidad, mensaje) in enumerate(alertas_ejemplo):
-            tabla_alertas.setItem(i, 0, QTableWidgetItem(tipo))
-            item_sev = QTableWidgetItem(severidad)
-            if severidad == "ALTO":
-                item_sev.setBackground(QColor("#FFB6C6"))
-            elif severidad == "MEDIO":
-                item_sev.setBackground(QColor("#FFEB99"))
-            tabla_alertas.setItem(i, 1, item_sev)
-            tabla_alertas.setItem(i, 2, QTableWidgetItem(mensaje))
-
-        tabla_alertas.resizeColumnsToContents()
-        layout.addWidget(tabla_alertas)
+        self.modelo_alertas = ModeloColumnar(
+            ["Día", "Tipo", "Evento", "Severidad", "Mensaje"],
+            colores={3: COLORES_SEVERIDAD},
+        )
+        self.tabla_alertas, _ = crear_vista_tabla(self.modelo_alertas)
+        layout.addWidget(self.tabla_alertas)
 
         # Botones
         h_botones = QHBoxLayout()
 
         btn_actualizar = QPushButton("🔄 Actualizar")
         btn_actualizar.setFixedWidth(120)
+        btn_actualizar.clicked.connect(self.actualizar)
 
         btn_volver = QPushButton("◀ Volver")
         btn_volver.setFixedWidth(100)
@@ -111,6 +126,21 @@ class VentanaIndicadores(QWidget):
         label_valor.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         label_valor.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        layout.addWidget(label_titulo)
+        layout.addWidget(label_valor)
+
+        widget.label_valor = label_valor
+        widget.color = None
+        self.aplicar_color_card(widget, color)
+
+        return widget
+
+    def aplicar_color_card(self, widget, color):
+        """Cambia el color de una tarjeta (solo si cambió)"""
+        if widget.color == color and widget.styleSheet():
+            return
+        widget.color = color
+
         color_map = {"verde": "#D4EDDA", "amarillo": "#FFF3CD", "rojo": "#F8D7DA"}
 
         border_color_map = {
@@ -133,7 +163,128 @@ class VentanaIndicadores(QWidget):
         """
         )
 
-        layout.addWidget(label_titulo)
-        layout.addWidget(label_valor)
+    # --- Flujo de la simulación ---
 
-        return widget
+    def reiniciar(self):
+        """Vacía tarjetas, alertas y estado para una simulación nueva"""
+        from sistema.alertas import ProcesadorAlertas
+        from sistema.indicadores import AcumuladorKPI
+
+        self.pendientes = []
+        self.acumulador = AcumuladorKPI()
+        self.procesador = ProcesadorAlertas(umbrales=UMBRALES_ALERTAS)
+        self.reglas_por_metrica = {
+            regla["metrica"]: regla for regla in self.procesador.reglas
+        }
+        self.modelo_alertas.limpiar()
+        for card in self.cards.values():
+            card.label_valor.setText("--")
+            self.aplicar_color_card(card, None)
+
+    def suscribir(self, trabajador):
+        """
+        Sigue en vivo los KPIs diarios de un TrabajadorSimulacion.
+
+        Args:
+            trabajador: TrabajadorSimulacion aún sin iniciar
+        """
+        self.reiniciar()
+        self.simulando = True
+        self.n_dias = trabajador.n_dias
+        self.label_estado.setText("Simulación en curso...")
+        trabajador.dias_completados.connect(self.encolar_dias)
+        trabajador.terminado.connect(self.finalizar)
+        trabajador.cancelado.connect(self.finalizar)
+        trabajador.error.connect(self.finalizar)
+        self.timer.start()
+
+    def encolar_dias(self, filas):
+        """Guarda los días recibidos; se aplican en el próximo cuadro"""
+        self.pendientes.extend((fila["dia"], fila["indicadores"]) for fila in filas)
+
+    def finalizar(self, *args):
+        """Aplica lo pendiente y detiene las actualizaciones periódicas"""
+        self.simulando = False
+        self.timer.stop()
+        self.aplicar_pendientes()
+        ajustar_columnas(self.tabla_alertas)
+
+    def cargar_resultado(self, resultado):
+        """Muestra los indicadores de un ResultadoSimulacion ya terminado"""
+        self.reiniciar()
+        self.n_dias = resultado.dias_simulados
+        self.pendientes = [
+            (resumen["dia"], indicadores)
+            for resumen, indicadores in zip(
+                resultado.resumen_diario, resultado.indicadores_diarios
+            )
+        ]
+        self.aplicar_pendientes()
+        ajustar_columnas(self.tabla_alertas)
+
+    def actualizar(self):
+        """
+        Botón Actualizar: durante una simulación aplica lo pendiente; si
+        no, recarga el último resultado de la pantalla de simulación.
+        """
+        if self.simulando:
+            self.aplicar_pendientes()
+            return
+        resultado = self.ventana_principal.resultado_simulacion()
+        if resultado is None:
+            self.label_estado.setText("Sin simulación")
+            return
+        self.cargar_resultado(resultado)
+
+    def aplicar_pendientes(self):
+        """Incorpora los días encolados y repinta una sola vez"""
+        if not self.pendientes or self.acumulador is None:
+            return
+        pendientes, self.pendientes = self.pendientes, []
+
+        eventos = []
+        for dia, indicadores in pendientes:
+            self.acumulador.agregar_indicadores(indicadores)
+            eventos.extend(self.procesador.procesar(dia, indicadores))
+
+        consolidado = self.acumulador.consolidado()
+        for _, metrica, formato in INDICADORES_CARDS:
+            valor = consolidado.get(f"{metrica}_promedio")
+            if valor is None:
+                continue
+            card = self.cards[metrica]
+            card.label_valor.setText(formato.format(valor))
+            self.aplicar_color_card(card, self.color_indicador(metrica, valor))
+
+        if eventos:
+            self.modelo_alertas.agregar_filas(
+                [
+                    [e["dia"] for e in eventos],
+                    [e["tipo"] for e in eventos],
+                    [e["evento"] for e in eventos],
+                    [e["severidad"] for e in eventos],
+                    [e["mensaje"] for e in eventos],
+                ]
+            )
+
+        dia_actual = pendientes[-1][0]
+        activas = len(self.procesador.activas())
+        self.label_estado.setText(
+            f"Día {dia_actual} de {self.n_dias} · {activas} alertas activas"
+        )
+
+    def color_indicador(self, metrica, valor):
+        """
+        Rojo si el promedio incumple el umbral de su regla de alerta,
+        amarillo si está dentro de la banda de histéresis y verde si no.
+        """
+        from sistema.alertas import umbral_cierre
+
+        regla = self.reglas_por_metrica.get(metrica)
+        if regla is None:
+            return None
+        if regla["operador"](valor, regla["umbral"]):
+            return "rojo"
+        if regla["operador"](valor, umbral_cierre(regla)):
+            return "amarillo"
+        return "verde"
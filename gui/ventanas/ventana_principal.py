@@ -2,6 +2,10 @@
 ventana_principal.py - Pantalla principal de la aplicación
 """
 
+import importlib
+import logging
+import time
+
 from PyQt6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -16,10 +20,17 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPixmap, QColor
 from PyQt6.QtCore import QSize
 
-from .ventana_catalogos import VentanaCatalogos
-from .ventana_simulacion import VentanaSimulacion
-from .ventana_indicadores import VentanaIndicadores
-from .ventana_reporte import VentanaReporte
+logger = logging.getLogger(__name__)
+
+# Pantallas que se crean la primera vez que se muestran:
+# {indice: (módulo, clase)}. El módulo (y lo que importa, como sistema)
+# solo se carga al navegar a la pantalla.
+PANTALLAS = {
+    1: ("gui.ventanas.ventana_catalogos", "VentanaCatalogos"),
+    2: ("gui.ventanas.ventana_simulacion", "VentanaSimulacion"),
+    3: ("gui.ventanas.ventana_indicadores", "VentanaIndicadores"),
+    4: ("gui.ventanas.ventana_reporte", "VentanaReporte"),
+}
 
 
 class VentanaPrincipal(QMainWindow):
@@ -37,19 +48,10 @@ class VentanaPrincipal(QMainWindow):
         # Stack para cambiar entre pantallas
         self.stacked_widget = QStackedWidget()
 
-        # Crear todas las ventanas
+        # Solo el menú se crea al inicio; el resto, en obtener_pantalla
         self.ventana_menu = self.crear_menu_principal()
-        self.ventana_catalogos = VentanaCatalogos(self)
-        self.ventana_simulacion = VentanaSimulacion(self)
-        self.ventana_indicadores = VentanaIndicadores(self)
-        self.ventana_reporte = VentanaReporte(self)
-
-        # Agregar al stack
+        self.pantallas = {0: self.ventana_menu}
         self.stacked_widget.addWidget(self.ventana_menu)
-        self.stacked_widget.addWidget(self.ventana_catalogos)
-        self.stacked_widget.addWidget(self.ventana_simulacion)
-        self.stacked_widget.addWidget(self.ventana_indicadores)
-        self.stacked_widget.addWidget(self.ventana_reporte)
 
         # Layout principal
         layout = QVBoxLayout(self.widget_central)
@@ -89,7 +91,7 @@ class VentanaPrincipal(QMainWindow):
 
         # Botones principales
         botones_info = [
-            ("📚 Catálogos", "Gestionar SKUs, clientes y vehículos", 0),
+            ("📚 Catálogos", "Gestionar SKUs, clientes y vehículos", 1),
             ("🚀 Simular Demanda", "Generar pedidos y simulación", 2),
             ("📊 Indicadores", "Análisis de KPIs y alertas", 3),
             ("📋 Reporte Final", "Resumen y recomendaciones", 4),
@@ -133,9 +135,49 @@ class VentanaPrincipal(QMainWindow):
         btn.clicked.connect(lambda: self.mostrar_pantalla(indice))
         return btn
 
+    def obtener_pantalla(self, indice):
+        """
+        Devuelve la pantalla indicada, creándola si aún no existe.
+
+        Args:
+            indice: Índice de la pantalla (0 = menú, ver PANTALLAS)
+
+        Returns:
+            QWidget de la pantalla
+        """
+        if indice not in self.pantallas:
+            nombre_modulo, nombre_clase = PANTALLAS[indice]
+            inicio = time.perf_counter()
+            modulo = importlib.import_module(nombre_modulo)
+            pantalla = getattr(modulo, nombre_clase)(self)
+            self.stacked_widget.addWidget(pantalla)
+            self.pantallas[indice] = pantalla
+            logger.debug(
+                "Pantalla %s creada en %.0f ms",
+                nombre_clase,
+                (time.perf_counter() - inicio) * 1000,
+            )
+        return self.pantallas[indice]
+
     def mostrar_pantalla(self, indice):
         """Cambia a la pantalla indicada"""
-        self.stacked_widget.setCurrentIndex(indice)
+        self.stacked_widget.setCurrentWidget(self.obtener_pantalla(indice))
+
+    def suscribir_simulacion(self, trabajador):
+        """Conecta la pantalla de indicadores a una simulación que empieza"""
+        self.obtener_pantalla(3).suscribir(trabajador)
+
+    def resultado_simulacion(self):
+        """Último ResultadoSimulacion de la pantalla de simulación (o None)"""
+        pantalla = self.pantallas.get(2)
+        return pantalla.resultado_simulacion if pantalla is not None else None
+
+    def closeEvent(self, event):
+        """Detiene la simulación en curso antes de cerrar"""
+        simulacion = self.pantallas.get(2)
+        if simulacion is not None:
+            simulacion.detener_simulacion()
+        super().closeEvent(event)
 
     def volver_menu(self):
         """Vuelve al menú principal"""
@@ -2,6 +2,8 @@
 ventana_simulacion.py - Pantalla de simulación de demanda
 """
 
+import os
+
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -10,19 +12,22 @@ from PyQt6.QtWidgets import (
     QLabel,
     QSpinBox,
     QCheckBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QLineEdit,
     QMessageBox,
+    QProgressBar,
+    QFileDialog,
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
-from sistema.catalogos import dic_sku, dic_clientes
-from sistema.demanda import (
-    simular_demanda,
-    contar_unidades_pedidos,
-    obtener_sku_mas_solicitado,
+from config import (
+    GRUPOS_CLIENTES,
+    DIRECTORIO_DATOS,
+    ARCHIVO_SIMULACION_CSV,
+    DIAS_FOTO_DIARIO_INVENTARIO,
 )
+from gui.modelos import ModeloColumnar, crear_vista_tabla, ajustar_columnas
+from gui.trabajadores import TrabajadorSimulacion, iniciar_en_hilo, detener_hilo
 
 
 class VentanaSimulacion(QWidget):
@@ -31,7 +36,9 @@ class VentanaSimulacion(QWidget):
     def __init__(self, ventana_principal):
         super().__init__()
         self.ventana_principal = ventana_principal
-        self.pedidos_simulados = None
+        self.resultado_simulacion = None
+        self.trabajador = None
+        self.hilo = None
         self.init_ui()
 
     def init_ui(self):
@@ -52,7 +59,7 @@ class VentanaSimulacion(QWidget):
         h_controles.addWidget(QLabel("Número de días:"))
         self.spin_dias = QSpinBox()
         self.spin_dias.setMinimum(1)
-        self.spin_dias.setMaximum(30)
+        self.spin_dias.setMaximum(3650)
         self.spin_dias.setValue(7)
         h_controles.addWidget(self.spin_dias)
 
@@ -73,20 +80,36 @@ class VentanaSimulacion(QWidget):
 
         h_controles.addStretch()
 
-        btn_simular = QPushButton("🚀 Simular")
-        btn_simular.setFixedWidth(120)
-        btn_simular.clicked.connect(self.ejecutar_simulacion)
-        h_controles.addWidget(btn_simular)
+        self.btn_simular = QPushButton("🚀 Simular")
+        self.btn_simular.setFixedWidth(120)
+        self.btn_simular.clicked.connect(self.ejecutar_simulacion)
+        h_controles.addWidget(self.btn_simular)
+
+        self.btn_cancelar = QPushButton("⏹ Cancelar")
+        self.btn_cancelar.setFixedWidth(120)
+        self.btn_cancelar.setEnabled(False)
+        self.btn_cancelar.clicked.connect(self.cancelar_simulacion)
+        h_controles.addWidget(self.btn_cancelar)
 
         layout.addLayout(h_controles)
+
+        self.barra_progreso = QProgressBar()
+        self.barra_progreso.setValue(0)
+        layout.addWidget(self.barra_progreso)
         layout.addSpacing(10)
 
         # Tabla de resultados
-        self.tabla_resultados = QTableWidget()
-        self.tabla_resultados.setColumnCount(4)
-        self.tabla_resultados.setHorizontalHeaderLabels(
+        self.filtro_resultados = QLineEdit()
+        self.filtro_resultados.setPlaceholderText("🔍 Filtrar resultados...")
+        layout.addWidget(self.filtro_resultados)
+
+        self.modelo_resultados = ModeloColumnar(
             ["Día", "Pedidos", "Unidades", "SKU Popular"]
         )
+        self.tabla_resultados, self.proxy_resultados = crear_vista_tabla(
+            self.modelo_resultados
+        )
+        self.filtro_resultados.textChanged.connect(self.proxy_resultados.filtrar)
         layout.addWidget(self.tabla_resultados)
 
         # Información resumen
@@ -97,67 +120,145 @@ class VentanaSimulacion(QWidget):
         # Botones de acción
         h_botones = QHBoxLayout()
 
-        btn_guardar = QPushButton("💾 Guardar Simulación")
-        btn_guardar.setFixedWidth(150)
-        btn_guardar.clicked.connect(self.guardar_simulacion)
+        self.btn_guardar = QPushButton("💾 Guardar Simulación")
+        self.btn_guardar.setFixedWidth(150)
+        self.btn_guardar.setEnabled(False)
+        self.btn_guardar.clicked.connect(self.guardar_simulacion)
 
         btn_volver = QPushButton("◀ Volver")
         btn_volver.setFixedWidth(100)
         btn_volver.clicked.connect(self.ventana_principal.volver_menu)
 
         h_botones.addStretch()
-        h_botones.addWidget(btn_guardar)
+        h_botones.addWidget(self.btn_guardar)
         h_botones.addWidget(btn_volver)
         layout.addLayout(h_botones)
 
     def ejecutar_simulacion(self):
-        """Ejecuta la simulación de demanda"""
+        """Lanza la simulación en un hilo de fondo"""
+        if self.trabajador is not None:
+            return
+
         n_dias = self.spin_dias.value()
         seed = self.spin_seed.value() if self.check_seed.isChecked() else None
 
-        # Ejecutar simulación
-        self.pedidos_simulados = simular_demanda(
-            n_dias, dic_clientes, dic_sku, seed=seed
+        self.modelo_resultados.limpiar()
+        self.resultado_simulacion = None
+        self.btn_guardar.setEnabled(False)
+        self.barra_progreso.setMaximum(n_dias)
+        self.barra_progreso.setValue(0)
+        self.label_resumen.setText("Simulando...")
+        self.btn_simular.setEnabled(False)
+        self.btn_cancelar.setEnabled(True)
+
+        self.trabajador = TrabajadorSimulacion(
+            n_dias,
+            seed=seed,
+            parametros={
+                "grupos_clientes": GRUPOS_CLIENTES,
+                "diario_inventario": DIAS_FOTO_DIARIO_INVENTARIO,
+            },
         )
+        self.trabajador.dias_completados.connect(self.agregar_filas)
+        self.trabajador.progreso.connect(self.actualizar_progreso)
+        self.trabajador.terminado.connect(self.simulacion_terminada)
+        self.trabajador.cancelado.connect(self.simulacion_cancelada)
+        self.trabajador.error.connect(self.simulacion_fallida)
+        self.ventana_principal.suscribir_simulacion(self.trabajador)
+        self.hilo = iniciar_en_hilo(self.trabajador, self)
 
-        # Llenar tabla
-        self.tabla_resultados.setRowCount(n_dias)
-        total_unidades = 0
-        total_pedidos = 0
+    def cancelar_simulacion(self):
+        """Pide detener la simulación en curso"""
+        if self.trabajador is not None:
+            self.trabajador.cancelar()
+            self.btn_cancelar.setEnabled(False)
 
-        for dia in range(1, n_dias + 1):
-            pedidos_dia = self.pedidos_simulados[dia]
-            num_pedidos = len(pedidos_dia)
-            unidades = contar_unidades_pedidos(pedidos_dia)
-            sku_popular, _ = obtener_sku_mas_solicitado(pedidos_dia)
+    def detener_simulacion(self):
+        """Cancela la simulación en curso y espera a que su hilo termine"""
+        if self.trabajador is not None:
+            detener_hilo(self.trabajador, self.hilo)
+            self._liberar_trabajador()
 
-            total_unidades += unidades
-            total_pedidos += num_pedidos
+    def closeEvent(self, event):
+        self.detener_simulacion()
+        super().closeEvent(event)
 
-            self.tabla_resultados.setItem(dia - 1, 0, QTableWidgetItem(str(dia)))
-            self.tabla_resultados.setItem(
-                dia - 1, 1, QTableWidgetItem(str(num_pedidos))
-            )
-            self.tabla_resultados.setItem(dia - 1, 2, QTableWidgetItem(str(unidades)))
-            self.tabla_resultados.setItem(
-                dia - 1, 3, QTableWidgetItem(sku_popular or "N/A")
-            )
+    def agregar_filas(self, filas):
+        """Agrega a la tabla un bloque de días recién simulados"""
+        primeras = self.modelo_resultados.rowCount() == 0
+        self.modelo_resultados.agregar_filas(
+            [
+                [fila["dia"] for fila in filas],
+                [fila["pedidos"] for fila in filas],
+                [fila["unidades"] for fila in filas],
+                [fila["sku_popular"] or "N/A" for fila in filas],
+            ]
+        )
+        if primeras:
+            ajustar_columnas(self.tabla_resultados)
+
+    def actualizar_progreso(self, dia, total):
+        """Actualiza la barra de progreso"""
+        self.barra_progreso.setValue(dia)
 
-        self.tabla_resultados.resizeColumnsToContents()
+    def simulacion_terminada(self, resultado):
+        """Muestra el resumen al terminar la simulación"""
+        self.resultado_simulacion = resultado
+        self._liberar_trabajador()
+        self.btn_guardar.setEnabled(True)
+        ajustar_columnas(self.tabla_resultados)
 
-        # Actualizar resumen
-        promedio_pedidos = total_pedidos / n_dias
-        promedio_unidades = total_unidades / n_dias
+        n_dias = resultado.dias_simulados
+        total_pedidos = resultado.pedidos_totales
+        total_unidades = resultado.unidades_solicitadas
+        promedio_pedidos = total_pedidos / n_dias if n_dias else 0
+        promedio_unidades = total_unidades / n_dias if n_dias else 0
         self.label_resumen.setText(
             f"✓ Simulación exitosa: {total_pedidos} pedidos, {total_unidades:,} unidades "
             f"(promedio: {promedio_pedidos:.1f} pedidos, {promedio_unidades:.0f} unidades/día)"
         )
 
+    def simulacion_cancelada(self):
+        """Deja la tabla con los días ya simulados"""
+        self._liberar_trabajador()
+        self.label_resumen.setText(
+            f"Simulación cancelada tras {self.modelo_resultados.rowCount()} días"
+        )
+
+    def simulacion_fallida(self, mensaje):
+        """Informa un error de la simulación"""
+        self._liberar_trabajador()
+        self.label_resumen.setText("Simulación no ejecutada")
+        QMessageBox.critical(self, "Error", f"Error en la simulación: {mensaje}")
+
+    def _liberar_trabajador(self):
+        self.trabajador = None
+        self.hilo = None
+        self.btn_simular.setEnabled(True)
+        self.btn_cancelar.setEnabled(False)
+
     def guardar_simulacion(self):
-        """Guarda la simulación (placeholder)"""
-        if self.pedidos_simulados is None:
+        """Guarda el resumen diario en CSV y el diario de inventario en .npz"""
+        if self.resultado_simulacion is None:
             QMessageBox.warning(
                 self, "Advertencia", "Debe ejecutar una simulación primero"
             )
             return
-        print("Guardando simulación...")
+
+        ruta, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar simulación",
+            os.path.join(DIRECTORIO_DATOS, ARCHIVO_SIMULACION_CSV),
+            "CSV (*.csv)",
+        )
+        if not ruta:
+            return
+
+        try:
+            rutas = self.resultado_simulacion.guardar(ruta)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar: {e}")
+            return
+        QMessageBox.information(
+            self, "Simulación guardada", "Archivos escritos:\n" + "\n".join(rutas)
+        )
@@ -127,6 +127,7 @@ def probar_imports():
         ("sistema.indicadores", "módulo indicadores"),
         ("sistema.alertas", "módulo alertas"),
         ("sistema.reporte", "módulo reporte"),
+        ("sistema.motor", "módulo motor"),
     ]
 
     exitosos = 0
@@ -151,31 +152,22 @@ def probar_simulacion_rapida():
     print(f"{'='*70}\n")
 
     try:
-        from sistema.demanda import simular_demanda
-        from sistema.inventario import inicializar_stock
-        from sistema.picking import asignar_picking
-        from sistema.catalogos import dic_clientes, dic_sku
+        from sistema.motor import Simulacion
 
         print("▶ Inicializando simulación...")
 
-        # Generar demanda
-        demanda = simular_demanda(
-            n_dias=1, dic_clientes=dic_clientes, dic_sku=dic_sku, seed=42
-        )
-        print(f"✅ Demanda generada: {len(demanda)} día(s)")
-
-        # Inicializar inventario
-        stock = inicializar_stock(dic_sku, stock_inicial=200)
-        print(f"✅ Inventario inicializado: {len(stock)} SKUs")
+        simulacion = Simulacion(capacidad_picking=1500, stock_inicial=200, seed=42)
+        print(f"✅ Inventario inicializado: {len(simulacion.stock)} SKUs")
 
-        # Asignar picking para cada día
-        total_pedidos = 0
-        for dia, pedidos_dia in demanda.items():
-            resultado_picking = asignar_picking(dia, pedidos_dia, capacidad_diaria=1500)
-            total_pedidos += resultado_picking["num_pedidos_preparados"]
+        # Demanda, inventario, picking, transporte e indicadores en una pasada
+        resultado = simulacion.ejecutar(n_dias=1)
+        print(f"✅ Demanda generada: {resultado.dias_simulados} día(s)")
 
+        total_pedidos = sum(d["pedidos_preparados"] for d in resultado.resumen_diario)
         print(f"✅ Picking asignado: {total_pedidos} pedidos procesados")
-        print(f"✅ Indicadores calculados: {total_pedidos} pedidos finalizados")
+        print(
+            f"✅ Indicadores calculados: OTIF {resultado.consolidado()['otif_promedio']:.2f}%"
+        )
 
         print("\n✅ SIMULACIÓN RÁPIDA EXITOSA\n")
         return True
@@ -13,11 +13,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from sistema.catalogos import dic_sku, dic_clientes, dic_vehiculos, distancias_km
-from sistema.demanda import simular_demanda, contar_unidades_pedidos, obtener_sku_mas_solicitado
-from sistema.inventario import inicializar_stock, reservar_y_actualizar, reponer_simple
-from sistema.picking import asignar_picking
-from sistema.transporte import planificar_rutas
-from sistema.indicadores import calcular_indicadores, consolidar_indicadores_multiples_dias
+from sistema.motor import Simulacion
 from sistema.alertas import generar_alertas, generar_recomendaciones
 from sistema.reporte import reporte_logistica, formatear_reporte_texto
 
@@ -45,57 +41,37 @@ def main():
     print(f"   - Capacidad picking: {CAPACIDAD_PICKING} unidades")
     print(f"   - Stock inicial: {STOCK_INICIAL} unidades/SKU\n")
     
-    # 1. Simular demanda
-    print("1️⃣  Simulando demanda...")
-    pedidos = simular_demanda(N_DIAS, dic_clientes, dic_sku, seed=SEED)
-    total_pedidos = sum(len(pedidos[dia]) for dia in range(1, N_DIAS + 1))
-    total_unidades = sum(contar_unidades_pedidos(pedidos[dia]) for dia in range(1, N_DIAS + 1))
+    # 1-3. Demanda, inventario, picking y transporte en una sola pasada por día
+    print("1️⃣  Simulando demanda, inventario, picking y transporte...")
+    simulacion = Simulacion(
+        dic_clientes,
+        dic_sku,
+        dic_vehiculos,
+        distancias_km,
+        capacidad_picking=CAPACIDAD_PICKING,
+        horas_jornada=HORAS_JORNADA,
+        stock_inicial=STOCK_INICIAL,
+        punto_reorden=PUNTO_REORDEN,
+        lote_reposicion=LOTE_REPOSICION,
+        seed=SEED,
+    )
+    resultado = simulacion.ejecutar(N_DIAS)
+    total_pedidos = resultado.pedidos_totales
+    total_unidades = resultado.unidades_solicitadas
+    unidades_entregadas_total = resultado.unidades_entregadas
     print(f"    ✓ {total_pedidos} pedidos generados, {total_unidades:,} unidades solicitadas\n")
     
-    # 2. Gestionar inventario
-    print("2️⃣  Gestionando inventario...")
-    stock = inicializar_stock(dic_sku, STOCK_INICIAL)
-    unidades_entregadas_total = 0
-    unidades_no_entregadas_total = 0
-    
-    for dia in range(1, N_DIAS + 1):
-        stock, entregadas, no_entregadas, _ = reservar_y_actualizar(
-            stock, pedidos[dia], dic_clientes
-        )
-        stock, _ = reponer_simple(stock, dic_sku, PUNTO_REORDEN, LOTE_REPOSICION)
-        unidades_entregadas_total += entregadas
-        unidades_no_entregadas_total += no_entregadas
-    
+    print("2️⃣  Inventario:")
     print(f"    ✓ {unidades_entregadas_total:,} unidades entregadas")
-    print(f"    ✓ {unidades_no_entregadas_total:,} unidades no entregadas\n")
-    
-    # 3. Picking y transporte
-    print("3️⃣  Ejecutando operaciones de picking y transporte...")
-    lista_indicadores = []
-    
-    for dia in range(1, N_DIAS + 1):
-        picking = asignar_picking(dia, pedidos[dia], CAPACIDAD_PICKING)
-        rutas = planificar_rutas(dia, picking['preparados'], dic_vehiculos, distancias_km, dic_clientes)
-        
-        indicadores = calcular_indicadores(
-            len(pedidos[dia]),
-            rutas['unidades_transportadas'],
-            contar_unidades_pedidos(pedidos[dia]),
-            picking['unidades_preparadas'],
-            rutas['unidades_transportadas'],
-            picking['unidades_pendientes'],
-            rutas['utilizacion_promedio'],
-            HORAS_JORNADA
-        )
-        
-        lista_indicadores.append(indicadores)
+    print(f"    ✓ {resultado.unidades_no_entregadas:,} unidades no entregadas\n")
     
-    print(f"    ✓ Picking: {sum(i['unidades_preparadas'] for i in lista_indicadores):,} unidades")
-    print(f"    ✓ Transporte: {sum(i['unidades_entregadas'] for i in lista_indicadores):,} unidades\n")
+    print("3️⃣  Operaciones de picking y transporte:")
+    print(f"    ✓ Picking: {resultado.unidades_preparadas:,} unidades")
+    print(f"    ✓ Transporte: {resultado.unidades_transportadas:,} unidades\n")
     
     # 4. Consolidar indicadores
     print("4️⃣  Consolidando indicadores...")
-    indicadores_consolidados = consolidar_indicadores_multiples_dias(lista_indicadores)
+    indicadores_consolidados = resultado.consolidado()
     print(f"    ✓ OTIF promedio: {indicadores_consolidados['otif_promedio']:.2f}%")
     print(f"    ✓ Fill Rate promedio: {indicadores_consolidados['fill_rate_promedio']:.2f}%")
     print(f"    ✓ Backlog: {indicadores_consolidados['backlog_rate_promedio']:.2f}%\n")
@@ -3,26 +3,58 @@ Módulo del sistema de simulación logística Ferreyros / Andes Logistics S.A.
 """
 
 from .catalogos import dic_sku, dic_clientes, dic_vehiculos, distancias_km
-from .demanda import simular_demanda
-from .inventario import inicializar_stock, reservar_y_actualizar, reponer_simple
-from .picking import asignar_picking
+from .pedidos import LibroPedidos, OrderBook
+from .demanda import simular_demanda, simular_demanda_vectorizada, iter_demanda
+from .inventario import (
+    inicializar_stock,
+    reservar_y_actualizar,
+    reponer_simple,
+    skus_bajo_punto_reorden,
+    LibroInventario,
+    DiarioInventario,
+)
+from .reposicion import ReposicionConLeadTime
+from .picking import asignar_picking, asignar_picking_con_backlog, ColaBacklog
 from .transporte import planificar_rutas
-from .indicadores import calcular_indicadores
-from .alertas import generar_alertas
+from .indicadores import (
+    calcular_indicadores,
+    calcular_indicadores_lote,
+    AcumuladorKPI,
+    SketchCuantiles,
+)
+from .alertas import generar_alertas, evaluar_alertas_lote, ProcesadorAlertas
 from .reporte import reporte_logistica
+from .motor import Simulacion, ResultadoSimulacion
 
 __all__ = [
     "dic_sku",
     "dic_clientes",
     "dic_vehiculos",
     "distancias_km",
+    "LibroPedidos",
+    "OrderBook",
     "simular_demanda",
+    "simular_demanda_vectorizada",
+    "iter_demanda",
     "inicializar_stock",
     "reservar_y_actualizar",
     "reponer_simple",
+    "skus_bajo_punto_reorden",
+    "LibroInventario",
+    "DiarioInventario",
+    "ReposicionConLeadTime",
     "asignar_picking",
+    "asignar_picking_con_backlog",
+    "ColaBacklog",
     "planificar_rutas",
     "calcular_indicadores",
+    "calcular_indicadores_lote",
+    "AcumuladorKPI",
+    "SketchCuantiles",
     "generar_alertas",
+    "evaluar_alertas_lote",
+    "ProcesadorAlertas",
     "reporte_logistica",
+    "Simulacion",
+    "ResultadoSimulacion",
 ]
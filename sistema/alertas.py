@@ -2,6 +2,127 @@
 alertas.py - Generación de alertas automáticas según umbrales
 """
 
+import operator
+
+import numpy as np
+
+
+def _valor(indicadores, clave, defecto):
+    """Lee un indicador diario o su versión consolidada (clave + '_promedio')"""
+    return indicadores.get(clave, indicadores.get(f"{clave}_promedio", defecto))
+
+
+# Umbrales por defecto; la aplicación puede pasar los suyos con las mismas
+# claves (p. ej. config.UMBRALES_ALERTAS)
+UMBRALES_ALERTAS = {
+    "otif_minimo": 95.0,
+    "fill_rate_minimo": 96.0,
+    "backlog_maximo": 5.0,
+    "utilizacion_flota_maxima": 85.0,
+    "productividad_minima": 150.0,
+}
+
+# Reglas de alerta. "umbral" es la clave en el diccionario de umbrales,
+# "defecto" el valor del indicador si no está en el diccionario e
+# "histeresis" cuánto debe recuperarse el indicador más allá del umbral
+# para cerrar una alerta abierta (ProcesadorAlertas).
+REGLAS_ALERTAS = (
+    {
+        "tipo": "OTIF_BAJO",
+        "metrica": "otif",
+        "comparador": "<",
+        "umbral": "otif_minimo",
+        "defecto": 100,
+        "histeresis": 1.0,
+        "severidad": "ALTO",
+        "mensaje": "OTIF bajo ({valor:.1f}% < {umbral:.1f}%)",
+        "recomendacion": "Verificar tiempos de preparación y transporte",
+    },
+    {
+        "tipo": "FILL_RATE_BAJO",
+        "metrica": "fill_rate",
+        "comparador": "<",
+        "umbral": "fill_rate_minimo",
+        "defecto": 100,
+        "histeresis": 1.0,
+        "severidad": "ALTO",
+        "mensaje": "Fill Rate bajo ({valor:.1f}% < {umbral:.1f}%)",
+        "recomendacion": "Revisar disponibilidad de inventario",
+    },
+    {
+        "tipo": "BACKLOG_ALTO",
+        "metrica": "backlog_rate",
+        "comparador": ">",
+        "umbral": "backlog_maximo",
+        "defecto": 0,
+        "histeresis": 1.0,
+        "severidad": "MEDIO",
+        "mensaje": "Backlog alto ({valor:.1f}% > {umbral:.1f}%)",
+        "recomendacion": "Aumentar capacidad de picking o reasignar recursos",
+    },
+    {
+        "tipo": "FLOTA_SATURADA",
+        "metrica": "utilizacion_flota",
+        "comparador": ">",
+        "umbral": "utilizacion_flota_maxima",
+        "defecto": 0,
+        "histeresis": 5.0,
+        "severidad": "MEDIO",
+        "mensaje": "Utilización de flota alta ({valor:.1f}% > {umbral:.1f}%)",
+        "recomendacion": "Riesgo de saturación - considerar flota adicional",
+    },
+    {
+        "tipo": "PRODUCTIVIDAD_BAJA",
+        "metrica": "productividad_picking",
+        "comparador": "<",
+        "umbral": "productividad_minima",
+        "defecto": 0,
+        "histeresis": 10.0,
+        "severidad": "BAJO",
+        "mensaje": "Productividad baja ({valor:.1f} unid/h < {umbral:.1f})",
+        "recomendacion": "Revisar procesos de picking y capacitación del personal",
+    },
+)
+
+COMPARADORES = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+def compilar_reglas(umbrales=None, reglas=REGLAS_ALERTAS):
+    """
+    Resuelve umbrales y comparadores de las reglas.
+
+    Se compila en cada llamada (son pocas reglas), así que un cambio en los
+    umbrales se aplica a los procesadores y evaluaciones creados después.
+
+    Args:
+        umbrales: Diccionario de umbrales (por defecto, UMBRALES_ALERTAS)
+        reglas: Reglas con el formato de REGLAS_ALERTAS
+
+    Returns:
+        Lista de reglas con "umbral" numérico y "operador" (función)
+    """
+    if umbrales is None:
+        umbrales = UMBRALES_ALERTAS
+
+    compiladas = []
+    for regla in reglas:
+        if regla["comparador"] not in COMPARADORES:
+            raise ValueError(
+                f"Comparador desconocido en {regla['tipo']}: {regla['comparador']}"
+            )
+        compiladas.append(
+            {
+                **regla,
+                "umbral": float(umbrales[regla["umbral"]]),
+                "operador": COMPARADORES[regla["comparador"]],
+            }
+        )
+    return compiladas
+
 
 def generar_alertas(indicadores, umbrales=None):
     """
@@ -9,70 +130,173 @@ def generar_alertas(indicadores, umbrales=None):
     
     Args:
         indicadores: Diccionario de indicadores
-        umbrales: Diccionario con umbrales (opcional, usa defaults si no se proporciona)
+        umbrales: Diccionario con umbrales (opcional, usa UMBRALES_ALERTAS
+                  si no se proporciona)
     
     Returns:
         Lista de alertas con severidad
     """
+    alertas = []
+    for regla in compilar_reglas(umbrales):
+        valor = _valor(indicadores, regla["metrica"], regla["defecto"])
+        if regla["operador"](valor, regla["umbral"]):
+            alertas.append({
+                "tipo": regla["tipo"],
+                "mensaje": regla["mensaje"].format(valor=valor, umbral=regla["umbral"]),
+                "severidad": regla["severidad"],
+                "recomendacion": regla["recomendacion"]
+            })
     
-    # Umbrales por defecto
-    if umbrales is None:
-        umbrales = {
-            "otif_minimo": 95.0,
-            "fill_rate_minimo": 96.0,
-            "backlog_maximo": 5.0,
-            "utilizacion_flota_maxima": 85.0,
-            "productividad_minima": 150.0
-        }
+    return alertas
+
+
+def evaluar_alertas_lote(indicadores, umbrales=None, reglas=None):
+    """
+    Evalúa las reglas sobre arreglos de indicadores en una sola pasada.
     
-    alertas = []
+    El último eje es el tiempo (días); los ejes anteriores, escenarios.
+    Por ejemplo, la salida de calcular_indicadores_lote con forma
+    escenarios × días.
     
-    # Alerta OTIF
-    if indicadores.get("otif", 100) < umbrales["otif_minimo"]:
-        alertas.append({
-            "tipo": "OTIF_BAJO",
-            "mensaje": f"OTIF bajo ({indicadores['otif']:.1f}% < {umbrales['otif_minimo']:.1f}%)",
-            "severidad": "ALTO",
-            "recomendacion": "Verificar tiempos de preparación y transporte"
-        })
-    
-    # Alerta Fill Rate
-    if indicadores.get("fill_rate", 100) < umbrales["fill_rate_minimo"]:
-        alertas.append({
-            "tipo": "FILL_RATE_BAJO",
-            "mensaje": f"Fill Rate bajo ({indicadores['fill_rate']:.1f}% < {umbrales['fill_rate_minimo']:.1f}%)",
-            "severidad": "ALTO",
-            "recomendacion": "Revisar disponibilidad de inventario"
-        })
-    
-    # Alerta Backlog
-    if indicadores.get("backlog_rate", 0) > umbrales["backlog_maximo"]:
-        alertas.append({
-            "tipo": "BACKLOG_ALTO",
-            "mensaje": f"Backlog alto ({indicadores['backlog_rate']:.1f}% > {umbrales['backlog_maximo']:.1f}%)",
-            "severidad": "MEDIO",
-            "recomendacion": "Aumentar capacidad de picking o reasignar recursos"
-        })
-    
-    # Alerta Utilización de flota
-    if indicadores.get("utilizacion_flota", 0) > umbrales["utilizacion_flota_maxima"]:
-        alertas.append({
-            "tipo": "FLOTA_SATURADA",
-            "mensaje": f"Utilización de flota alta ({indicadores['utilizacion_flota']:.1f}% > {umbrales['utilizacion_flota_maxima']:.1f}%)",
-            "severidad": "MEDIO",
-            "recomendacion": "Riesgo de saturación - considerar flota adicional"
-        })
-    
-    # Alerta Productividad
-    if indicadores.get("productividad_picking", 0) < umbrales["productividad_minima"]:
-        alertas.append({
-            "tipo": "PRODUCTIVIDAD_BAJA",
-            "mensaje": f"Productividad baja ({indicadores['productividad_picking']:.1f} unid/h < {umbrales['productividad_minima']:.1f})",
-            "severidad": "BAJO",
-            "recomendacion": "Revisar procesos de picking y capacitación del personal"
-        })
+    Args:
+        indicadores: Diccionario {metrica: arreglo} (acepta también
+                     las claves consolidadas metrica + "_promedio")
+        umbrales: Diccionario de umbrales (por defecto, UMBRALES_ALERTAS)
+        reglas: Reglas ya compiladas (por defecto, compilar_reglas(umbrales))
     
-    return alertas
+    Returns:
+        Diccionario {tipo: {"conteo": días en alerta por escenario,
+                            "primer_indice": primer día en alerta (-1 si no hay),
+                            "severidad": ...}}
+        Las reglas cuyo indicador no está presente se omiten.
+    """
+    if reglas is None:
+        reglas = compilar_reglas(umbrales)
+    
+    resultado = {}
+    for regla in reglas:
+        valores = _valor(indicadores, regla["metrica"], None)
+        if valores is None:
+            continue
+        en_alerta = regla["operador"](np.asarray(valores), regla["umbral"])
+        hay_alerta = en_alerta.any(axis=-1)
+        resultado[regla["tipo"]] = {
+            "conteo": en_alerta.sum(axis=-1),
+            "primer_indice": np.where(hay_alerta, en_alerta.argmax(axis=-1), -1),
+            "severidad": regla["severidad"],
+        }
+    return resultado
+
+
+def umbral_cierre(regla):
+    """
+    Valor que debe superar (o no alcanzar) el indicador para dar por
+    recuperada una regla compilada: el umbral corrido en su histéresis.
+    """
+    banda = regla.get("histeresis", 0.0)
+    if regla["comparador"] in ("<", "<="):
+        return regla["umbral"] + banda
+    return regla["umbral"] - banda
+
+
+class ProcesadorAlertas:
+    """
+    Alertas en flujo, día a día, con estado por regla.
+
+    Una alerta se abre tras `dias_para_abrir` días seguidos fuera de umbral
+    y se cierra tras `dias_para_cerrar` días seguidos recuperada más allá
+    de la banda de histéresis de la regla. Solo se emiten los cambios de
+    estado (apertura y cierre), así que una semana mala produce un evento
+    de apertura y uno de cierre en lugar de una alerta por día. Cada día
+    cuesta O(número de reglas).
+
+    procesar(dia, indicadores) tiene la firma de los hooks de Simulacion:
+        simulacion.agregar_hook("indicadores", procesador.procesar)
+    """
+
+    def __init__(self, umbrales=None, reglas=None, dias_para_abrir=1, dias_para_cerrar=1):
+        self.reglas = reglas if reglas is not None else compilar_reglas(umbrales)
+        self.dias_para_abrir = dias_para_abrir
+        self.dias_para_cerrar = dias_para_cerrar
+        self.estado = {
+            regla["tipo"]: {
+                "abierta": False,
+                "consecutivos": 0,
+                "recuperados": 0,
+                "dia_apertura": None,
+            }
+            for regla in self.reglas
+        }
+        self.eventos = []
+
+    def procesar(self, dia, indicadores):
+        """
+        Incorpora los indicadores de un día.
+
+        Args:
+            dia: Número de día
+            indicadores: Diccionario de indicadores del día
+
+        Returns:
+            Lista de eventos del día: {"dia", "tipo", "evento" ("ABIERTA" o
+            "CERRADA"), "valor", "severidad", "mensaje", "recomendacion"};
+            los cierres incluyen "dias_activa"
+        """
+        eventos = []
+        for regla in self.reglas:
+            estado = self.estado[regla["tipo"]]
+            valor = _valor(indicadores, regla["metrica"], regla["defecto"])
+            fuera = regla["operador"](valor, regla["umbral"])
+
+            if not estado["abierta"]:
+                estado["consecutivos"] = estado["consecutivos"] + 1 if fuera else 0
+                if estado["consecutivos"] >= self.dias_para_abrir:
+                    estado["abierta"] = True
+                    estado["recuperados"] = 0
+                    estado["dia_apertura"] = dia
+                    eventos.append(
+                        {
+                            "dia": dia,
+                            "tipo": regla["tipo"],
+                            "evento": "ABIERTA",
+                            "valor": valor,
+                            "severidad": regla["severidad"],
+                            "mensaje": regla["mensaje"].format(
+                                valor=valor, umbral=regla["umbral"]
+                            ),
+                            "recomendacion": regla["recomendacion"],
+                        }
+                    )
+            else:
+                recuperado = not regla["operador"](valor, umbral_cierre(regla))
+                estado["recuperados"] = estado["recuperados"] + 1 if recuperado else 0
+                if estado["recuperados"] >= self.dias_para_cerrar:
+                    eventos.append(
+                        {
+                            "dia": dia,
+                            "tipo": regla["tipo"],
+                            "evento": "CERRADA",
+                            "valor": valor,
+                            "severidad": regla["severidad"],
+                            "mensaje": f"{regla['tipo']} normalizada ({valor:.1f})",
+                            "recomendacion": regla["recomendacion"],
+                            "dias_activa": dia - estado["dia_apertura"],
+                        }
+                    )
+                    estado["abierta"] = False
+                    estado["consecutivos"] = 0
+                    estado["dia_apertura"] = None
+
+        self.eventos.extend(eventos)
+        return eventos
+
+    def activas(self):
+        """Tipos de alerta abiertos y el día en que se abrieron"""
+        return {
+            tipo: estado["dia_apertura"]
+            for tipo, estado in self.estado.items()
+            if estado["abierta"]
+        }
 
 
 def generar_recomendaciones(alertas, indicadores):
@@ -95,16 +319,16 @@ def generar_recomendaciones(alertas, indicadores):
         recomendaciones_set.add(alerta["recomendacion"])
     
     # Recomendaciones adicionales basadas en análisis
-    if indicadores.get("backlog_rate", 0) > 3.0:
+    if _valor(indicadores, "backlog_rate", 0) > 3.0:
         recomendaciones_set.add("Reasignar pedidos entre zonas para equilibrar carga")
     
-    if indicadores.get("utilizacion_flota", 0) > 80.0:
+    if _valor(indicadores, "utilizacion_flota", 0) > 80.0:
         recomendaciones_set.add("Optimizar rutas de transporte para mejorar eficiencia")
     
-    if indicadores.get("productividad_picking", 0) < 180.0:
+    if _valor(indicadores, "productividad_picking", 0) < 180.0:
         recomendaciones_set.add("Incrementar personal de picking en horas pico")
     
-    if indicadores.get("fill_rate", 100) < 98.0:
+    if _valor(indicadores, "fill_rate", 100) < 98.0:
         recomendaciones_set.add("Mejorar pronóstico de demanda y reaprovisionamiento")
     
     # Convertir a lista ordenada
@@ -0,0 +1,362 @@
+"""
+barrido.py - Barrido de parámetros (análisis what-if)
+
+Evalúa una grilla de combinaciones de capacidad de picking, punto de
+reorden, lote de reposición y composición de flota. La demanda no depende
+de esos parámetros, así que se genera una sola vez y se reutiliza en
+todos los puntos de la grilla.
+
+Los KPIs consolidados (otif, fill_rate, backlog_rate, ...) miden lo
+preparado y transportado, como en el modelo original, y no ven el stock:
+el punto de reorden y el lote solo mueven las columnas de inventario
+(unidades_entregadas_stock, unidades_sin_stock, fill_rate_stock,
+reposiciones_total y dias_quiebre_stock).
+
+Los valores por defecto de la línea de comandos son los de Simulacion,
+así que el módulo no depende de config.py.
+
+Uso desde la línea de comandos:
+    python -m sistema.barrido --dias 30 --capacidad 1000:2000:250 \
+        --punto-reorden 30,50 --lote 100,150 --flota VH01+VH02,VH04
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .alertas import evaluar_alertas_lote
+from .catalogos import (
+    dic_sku,
+    dic_clientes,
+    dic_vehiculos,
+    distancias_km,
+    coordenadas_clientes,
+)
+from .demanda import simular_demanda_vectorizada
+from .motor import Simulacion
+from .picking import MODOS_PICKING
+from .reposicion import POLITICAS_REPOSICION
+from .transporte import ALGORITMOS_TRANSPORTE
+
+
+COLUMNAS_RESULTADO = [
+    "capacidad_picking",
+    "punto_reorden",
+    "lote_reposicion",
+    "flota",
+    "otif_promedio",
+    "fill_rate_promedio",
+    "backlog_rate_promedio",
+    "fill_rate_global",
+    "backlog_rate_global",
+    "productividad_picking_promedio",
+    "utilizacion_flota_promedio",
+    "unidades_entregadas_total",
+    "unidades_no_entregadas_total",
+    "costo_transporte",
+    "unidades_entregadas_stock",
+    "unidades_sin_stock",
+    "fill_rate_stock",
+    "reposiciones_total",
+    "dias_quiebre_stock",
+    "alertas",
+]
+
+# Estado de cada proceso trabajador (se llena una vez en el initializer)
+_CONTEXTO = {}
+
+
+def _inicializar_trabajador(pedidos, n_dias, catalogos, parametros_base):
+    """Guarda la demanda y los catálogos en el proceso (se envían una vez)"""
+    _CONTEXTO["pedidos"] = pedidos
+    _CONTEXTO["n_dias"] = n_dias
+    _CONTEXTO["catalogos"] = catalogos
+    _CONTEXTO["parametros_base"] = parametros_base
+
+
+def _evaluar_punto(punto):
+    """Simula un punto de la grilla con la demanda compartida"""
+    capacidad, punto_reorden, lote, flota = punto
+    catalogos = _CONTEXTO["catalogos"]
+    vehiculos = {v: catalogos["dic_vehiculos"][v] for v in flota}
+
+    simulacion = Simulacion(
+        catalogos["dic_clientes"],
+        catalogos["dic_sku"],
+        vehiculos,
+        catalogos["distancias_km"],
+        coordenadas_clientes=catalogos.get("coordenadas_clientes"),
+        capacidad_picking=capacidad,
+        punto_reorden=punto_reorden,
+        lote_reposicion=lote,
+        **_CONTEXTO["parametros_base"],
+    )
+    resultado = simulacion.ejecutar(_CONTEXTO["n_dias"], pedidos=_CONTEXTO["pedidos"])
+    consolidado = resultado.consolidado()
+
+    fila = {
+        "capacidad_picking": capacidad,
+        "punto_reorden": punto_reorden,
+        "lote_reposicion": lote,
+        "flota": "+".join(flota),
+        "costo_transporte": round(resultado.costo_transporte, 2),
+    }
+    fila.update(_resultados_inventario(resultado))
+    for columna in COLUMNAS_RESULTADO:
+        if columna in consolidado:
+            fila[columna] = consolidado[columna]
+    return fila
+
+
+def _resultados_inventario(resultado):
+    """
+    KPIs del inventario (reserva contra stock y reposición).
+
+    Los KPIs consolidados se calculan sobre unidades transportadas, que no
+    dependen del punto de reorden ni del lote; estos sí.
+    """
+    solicitadas = resultado.unidades_solicitadas
+    return {
+        "unidades_entregadas_stock": resultado.unidades_entregadas,
+        "unidades_sin_stock": resultado.unidades_no_entregadas,
+        "fill_rate_stock": (
+            round(resultado.unidades_entregadas / solicitadas * 100, 2)
+            if solicitadas
+            else 100.0
+        ),
+        "reposiciones_total": sum(d["reposiciones"] for d in resultado.resumen_diario),
+        "dias_quiebre_stock": sum(
+            1 for d in resultado.resumen_diario if d["unidades_no_entregadas"] > 0
+        ),
+    }
+
+
+def generar_grilla(capacidades, puntos_reorden, lotes, flotas):
+    """Producto cartesiano de los valores de cada parámetro"""
+    return list(
+        itertools.product(capacidades, puntos_reorden, lotes, [tuple(f) for f in flotas])
+    )
+
+
+def ejecutar_barrido(
+    n_dias,
+    capacidades,
+    puntos_reorden,
+    lotes,
+    flotas,
+    seed=42,
+    catalogos=None,
+    horas_jornada=8,
+    stock_inicial=200,
+    algoritmo_transporte="greedy",
+    modo_picking="greedy",
+    arrastrar_backlog=False,
+    politica_reposicion="simple",
+    lead_times=0,
+    n_procesos=None,
+    ruta_salida=None,
+):
+    """
+    Ejecuta la simulación en todos los puntos de la grilla de parámetros.
+
+    Args:
+        n_dias: Días a simular en cada punto
+        capacidades: Valores de capacidad de picking diaria
+        puntos_reorden: Valores de punto de reorden
+        lotes: Valores de lote de reposición
+        flotas: Composiciones de flota (listas de IDs de dic_vehiculos)
+        seed: Semilla de la demanda compartida
+        catalogos: Diccionario con dic_clientes, dic_sku, dic_vehiculos,
+                   distancias_km y (opcional) coordenadas_clientes (por
+                   defecto, los de sistema.catalogos)
+        horas_jornada: Horas de jornada (fijo en todo el barrido)
+        stock_inicial: Stock inicial por SKU (fijo en todo el barrido)
+        algoritmo_transporte: Algoritmo de asignación de vehículos
+        modo_picking: Selección de pedidos de picking ("greedy" o "mochila")
+        arrastrar_backlog: Arrastrar el backlog de picking entre días
+        politica_reposicion: "simple", "sS" o "RQ"
+        lead_times: Lead time de reposición en días (común o {sku: días})
+        n_procesos: Procesos a usar (por defecto, núcleos disponibles;
+                    1 ejecuta en el proceso actual)
+        ruta_salida: Ruta del CSV de resultados (opcional)
+
+    Returns:
+        Lista de filas (diccionarios con COLUMNAS_RESULTADO)
+    """
+    if catalogos is None:
+        catalogos = {
+            "dic_clientes": dic_clientes,
+            "dic_sku": dic_sku,
+            "dic_vehiculos": dic_vehiculos,
+            "distancias_km": distancias_km,
+            "coordenadas_clientes": coordenadas_clientes,
+        }
+    for flota in flotas:
+        desconocidos = [v for v in flota if v not in catalogos["dic_vehiculos"]]
+        if desconocidos:
+            raise ValueError(f"Vehículos desconocidos en la flota: {', '.join(desconocidos)}")
+    if n_procesos is None:
+        n_procesos = os.cpu_count() or 1
+
+    # La demanda se genera una sola vez para toda la grilla
+    pedidos = simular_demanda_vectorizada(
+        n_dias, catalogos["dic_clientes"], catalogos["dic_sku"], seed=seed
+    )
+    parametros_base = {
+        "horas_jornada": horas_jornada,
+        "stock_inicial": stock_inicial,
+        "algoritmo_transporte": algoritmo_transporte,
+        "modo_picking": modo_picking,
+        "arrastrar_backlog": arrastrar_backlog,
+        "politica_reposicion": politica_reposicion,
+        "lead_times": lead_times,
+    }
+    grilla = generar_grilla(capacidades, puntos_reorden, lotes, flotas)
+
+    if n_procesos <= 1:
+        _inicializar_trabajador(pedidos, n_dias, catalogos, parametros_base)
+        filas = [_evaluar_punto(punto) for punto in grilla]
+    else:
+        bloque = max(1, math.ceil(len(grilla) / (n_procesos * 4)))
+        with ProcessPoolExecutor(
+            max_workers=n_procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(pedidos, n_dias, catalogos, parametros_base),
+        ) as ejecutor:
+            filas = list(ejecutor.map(_evaluar_punto, grilla, chunksize=bloque))
+
+    _contar_alertas(filas)
+
+    if ruta_salida:
+        guardar_resultados_csv(filas, ruta_salida)
+
+    return filas
+
+
+def _contar_alertas(filas):
+    """
+    Agrega a cada fila el número de alertas de sus KPIs consolidados,
+    evaluando las reglas sobre todas las filas a la vez.
+    """
+    if not filas:
+        return
+    indicadores = {
+        columna: np.array([[fila[columna]] for fila in filas])
+        for columna in COLUMNAS_RESULTADO
+        if columna.endswith("_promedio") and all(columna in fila for fila in filas)
+    }
+    total = np.zeros(len(filas), dtype=np.int64)
+    for alerta in evaluar_alertas_lote(indicadores).values():
+        total += alerta["conteo"]
+    for fila, n_alertas in zip(filas, total.tolist()):
+        fila["alertas"] = n_alertas
+
+
+def guardar_resultados_csv(filas, ruta_salida):
+    """Escribe la tabla de resultados del barrido en CSV"""
+    directorio = os.path.dirname(ruta_salida)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta_salida, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS_RESULTADO)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def _parsear_rango(texto):
+    """
+    Convierte "inicio:fin:paso" (fin incluido) o "a,b,c" en lista de enteros.
+    """
+    if ":" in texto:
+        partes = [int(p) for p in texto.split(":")]
+        inicio, fin = partes[0], partes[1]
+        paso = partes[2] if len(partes) > 2 else 1
+        return list(range(inicio, fin + 1, paso))
+    return [int(p) for p in texto.split(",")]
+
+
+def _parsear_flotas(texto):
+    """Convierte "VH01+VH02,VH04" en [["VH01", "VH02"], ["VH04"]]"""
+    return [flota.split("+") for flota in texto.split(",")]
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Barrido de parámetros de la simulación logística"
+    )
+    parser.add_argument("--dias", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--capacidad", type=_parsear_rango, default=[1500],
+        help='Capacidades de picking: "inicio:fin:paso" o "a,b,c"',
+    )
+    parser.add_argument(
+        "--punto-reorden", type=_parsear_rango, default=[50],
+        help='Puntos de reorden: "inicio:fin:paso" o "a,b,c"',
+    )
+    parser.add_argument(
+        "--lote", type=_parsear_rango, default=[100],
+        help='Lotes de reposición: "inicio:fin:paso" o "a,b,c"',
+    )
+    parser.add_argument(
+        "--flota", type=_parsear_flotas, default=[list(dic_vehiculos.keys())],
+        help='Composiciones de flota: "VH01+VH02,VH04"',
+    )
+    parser.add_argument("--horas-jornada", type=float, default=8)
+    parser.add_argument("--stock-inicial", type=int, default=200)
+    parser.add_argument(
+        "--algoritmo", default="greedy", choices=list(ALGORITMOS_TRANSPORTE),
+        help="Algoritmo de asignación de vehículos",
+    )
+    parser.add_argument(
+        "--modo-picking", default="greedy", choices=list(MODOS_PICKING),
+        help="Selección de pedidos para picking",
+    )
+    parser.add_argument(
+        "--arrastrar-backlog", action="store_true",
+        help="Arrastrar al día siguiente los pedidos no preparados",
+    )
+    parser.add_argument(
+        "--politica-reposicion", default="simple",
+        choices=["simple", *POLITICAS_REPOSICION], help="Política de reposición",
+    )
+    parser.add_argument(
+        "--lead-time", type=int, default=0,
+        help="Lead time de reposición en días",
+    )
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument(
+        "--salida",
+        default=os.path.join("data", "barrido.csv"),
+        help="Ruta del CSV de resultados",
+    )
+    args = parser.parse_args(argv)
+
+    filas = ejecutar_barrido(
+        args.dias,
+        args.capacidad,
+        args.punto_reorden,
+        args.lote,
+        args.flota,
+        seed=args.seed,
+        horas_jornada=args.horas_jornada,
+        stock_inicial=args.stock_inicial,
+        algoritmo_transporte=args.algoritmo,
+        modo_picking=args.modo_picking,
+        arrastrar_backlog=args.arrastrar_backlog,
+        politica_reposicion=args.politica_reposicion,
+        lead_times=args.lead_time,
+        n_procesos=args.procesos,
+        ruta_salida=args.salida,
+    )
+    print(f"✓ {len(filas)} escenarios evaluados → {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,15 @@ dic_vehiculos = {
     "VH04": {"capacidad": 260, "costo_km": 8.1, "tipo": "Tráiler liviano"},
 }
 
+# Grupos de prioridad de picking (menor número = mayor prioridad). Los
+# clientes fuera de todo grupo toman el de menor prioridad. La aplicación
+# puede pasar otros grupos con el mismo formato (p. ej. config.GRUPOS_CLIENTES)
+grupos_clientes = {
+    "Minero": {"ids": ["CL01", "CL02", "CL03", "CL04", "CL05"], "prioridad": 1},
+    "Distribuidor": {"ids": ["CL06", "CL07", "CL08"], "prioridad": 2},
+    "Otros": {"ids": ["CL09", "CL10"], "prioridad": 3},
+}
+
 # Distancias estimadas por zona (para costos)
 distancias_km = {
     "Minera Antamina": 450,
@@ -51,6 +60,23 @@ distancias_km = {
     "Centro de Mantenimiento Arequipa": 1010,
 }
 
+# Ubicación aproximada (latitud, longitud) del almacén y de cada cliente,
+# usada para estimar distancias entre clientes en rutas con varias paradas
+coordenadas_almacen = (-12.05, -77.10)  # Almacén central Lima
+
+coordenadas_clientes = {
+    "Minera Antamina": (-9.54, -77.05),
+    "Minera Toquepala": (-17.25, -70.61),
+    "Minera Yanacocha": (-6.98, -78.50),
+    "Minera Las Bambas": (-14.08, -72.33),
+    "Minera Antapaccay": (-14.92, -71.35),
+    "Distribuidor Piura": (-5.19, -80.63),
+    "Distribuidor Arequipa": (-16.40, -71.54),
+    "Distribuidor Trujillo": (-8.11, -79.03),
+    "Centro de Mantenimiento Lima": (-12.05, -77.04),
+    "Centro de Mantenimiento Arequipa": (-16.42, -71.52),
+}
+
 
 def get_cliente_nombre(cliente_id):
     """Obtiene el nombre del cliente por ID"""
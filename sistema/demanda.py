@@ -5,6 +5,10 @@ demanda.py - Simulación de pedidos y demanda diaria
 import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from .pedidos import LibroPedidos
+
 
 def simular_demanda(n_dias, dic_clientes, dic_sku, seed=None):
     """
@@ -54,8 +58,184 @@ def simular_demanda(n_dias, dic_clientes, dic_sku, seed=None):
     return pedidos_por_dia
 
 
+RANGOS_DEMANDA = {
+    "pedidos_min": 10,
+    "pedidos_max": 15,
+    "lineas_min": 1,
+    "lineas_max": 3,
+    "cantidad_min": 5,
+    "cantidad_max": 50,
+}
+
+
+def _semilla_base(seed):
+    """Semilla común a todos los días (aleatoria si no se indica)"""
+    if seed is None:
+        return np.random.SeedSequence().entropy
+    return seed
+
+
+def _rng_dia(semilla, dia):
+    """
+    Generador independiente para un día.
+
+    Cada día usa su propio sub-flujo derivado de (semilla, dia), de modo que
+    el día N se puede regenerar sin generar los anteriores.
+    """
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(dia,)))
+
+
+def _sortear_dia(rng, n_clientes, n_skus, rangos):
+    """
+    Sortea los arreglos de pedidos de un día.
+
+    Returns:
+        Tupla (cliente, lineas_por_pedido, sku, cantidad)
+    """
+    n_pedidos = int(rng.integers(rangos["pedidos_min"], rangos["pedidos_max"] + 1))
+    cliente = rng.integers(0, n_clientes, size=n_pedidos, dtype=np.int32)
+    lineas_por_pedido = rng.integers(
+        rangos["lineas_min"], rangos["lineas_max"] + 1, size=n_pedidos
+    )
+    n_lineas = int(lineas_por_pedido.sum())
+    sku = rng.integers(0, n_skus, size=n_lineas, dtype=np.int32)
+    cantidad = rng.integers(
+        rangos["cantidad_min"], rangos["cantidad_max"] + 1, size=n_lineas, dtype=np.int32
+    )
+    return cliente, lineas_por_pedido, sku, cantidad
+
+
+def _libro_desde_dias(dias, sorteos, lista_clientes, lista_skus):
+    """Une los sorteos de varios días en un solo LibroPedidos"""
+    if not sorteos:
+        return LibroPedidos.vacio(lista_clientes, lista_skus)
+
+    clientes = [s[0] for s in sorteos]
+    lineas = np.concatenate([s[1] for s in sorteos])
+    pedidos_por_dia = [len(c) for c in clientes]
+
+    inicio_lineas = np.zeros(len(lineas) + 1, dtype=np.int64)
+    np.cumsum(lineas, out=inicio_lineas[1:])
+
+    return LibroPedidos(
+        np.repeat(np.asarray(dias, dtype=np.int32), pedidos_por_dia),
+        np.concatenate([np.arange(1, n + 1, dtype=np.int32) for n in pedidos_por_dia]),
+        np.concatenate(clientes),
+        inicio_lineas,
+        np.concatenate([s[2] for s in sorteos]),
+        np.concatenate([s[3] for s in sorteos]),
+        lista_clientes,
+        lista_skus,
+    )
+
+
+def simular_demanda_vectorizada(n_dias, dic_clientes, dic_sku, seed=None, **rangos):
+    """
+    Simula la demanda de todo el horizonte con arreglos NumPy.
+
+    En lugar de generar pedido por pedido, sortea de una sola vez por día
+    el número de pedidos, las líneas por pedido, los clientes, los SKUs y
+    las cantidades. Clientes y SKUs se guardan como índices sobre las
+    listas del catálogo. Produce los mismos pedidos que iter_demanda con
+    la misma semilla.
+
+    Args:
+        n_dias: Número de días a simular
+        dic_clientes: Diccionario de clientes
+        dic_sku: Diccionario de SKUs
+        seed: Semilla para reproducibilidad (opcional)
+        **rangos: Sobrescribe valores de RANGOS_DEMANDA
+                  (pedidos_min, pedidos_max, lineas_min, lineas_max,
+                  cantidad_min, cantidad_max)
+
+    Returns:
+        LibroPedidos con los pedidos de todo el horizonte
+    """
+    rangos = {**RANGOS_DEMANDA, **rangos}
+    semilla = _semilla_base(seed)
+    lista_clientes = list(dic_clientes.keys())
+    lista_skus = list(dic_sku.keys())
+
+    dias = list(range(1, n_dias + 1))
+    sorteos = [
+        _sortear_dia(_rng_dia(semilla, dia), len(lista_clientes), len(lista_skus), rangos)
+        for dia in dias
+    ]
+    return _libro_desde_dias(dias, sorteos, lista_clientes, lista_skus)
+
+
+def generar_demanda_dia(dia, dic_clientes, dic_sku, seed, **rangos):
+    """
+    Regenera los pedidos de un único día sin generar los anteriores.
+
+    Args:
+        dia: Número de día
+        dic_clientes: Diccionario de clientes
+        dic_sku: Diccionario de SKUs
+        seed: Semilla de la simulación
+        **rangos: Sobrescribe valores de RANGOS_DEMANDA
+
+    Returns:
+        LibroPedidos con los pedidos del día
+    """
+    rangos = {**RANGOS_DEMANDA, **rangos}
+    lista_clientes = list(dic_clientes.keys())
+    lista_skus = list(dic_sku.keys())
+    sorteo = _sortear_dia(
+        _rng_dia(seed, dia), len(lista_clientes), len(lista_skus), rangos
+    )
+    return _libro_desde_dias([dia], [sorteo], lista_clientes, lista_skus)
+
+
+def iter_demanda(n_dias, dic_clientes, dic_sku, seed=None, **rangos):
+    """
+    Genera la demanda día por día con memoria acotada.
+
+    Solo mantiene en memoria los pedidos del día en curso. Para la misma
+    semilla produce los mismos pedidos que simular_demanda_vectorizada.
+
+    Args:
+        n_dias: Número de días a simular
+        dic_clientes: Diccionario de clientes
+        dic_sku: Diccionario de SKUs
+        seed: Semilla para reproducibilidad (opcional)
+        **rangos: Sobrescribe valores de RANGOS_DEMANDA
+
+    Yields:
+        Tupla (dia, LibroPedidos del día)
+    """
+    rangos = {**RANGOS_DEMANDA, **rangos}
+    semilla = _semilla_base(seed)
+    lista_clientes = list(dic_clientes.keys())
+    lista_skus = list(dic_sku.keys())
+
+    for dia in range(1, n_dias + 1):
+        sorteo = _sortear_dia(
+            _rng_dia(semilla, dia), len(lista_clientes), len(lista_skus), rangos
+        )
+        yield dia, _libro_desde_dias([dia], [sorteo], lista_clientes, lista_skus)
+
+
+def columnas_a_pedidos(libro, fecha_base=None):
+    """
+    Convierte el resultado columnar al formato de diccionarios anidados
+    que usan la GUI y el notebook.
+
+    Args:
+        libro: LibroPedidos (resultado de simular_demanda_vectorizada)
+        fecha_base: Fecha del día 1 (por defecto, ahora)
+
+    Returns:
+        Diccionario con estructura: {dia: {"PED{dia}-{i}": {...}}}
+    """
+    return libro.a_diccionario(fecha_base)
+
+
 def contar_unidades_pedidos(pedidos_dia):
     """Cuenta el total de unidades en un día"""
+    if isinstance(pedidos_dia, LibroPedidos):
+        return pedidos_dia.unidades_totales()
+
     total = 0
     for pedido_info in pedidos_dia.values():
         for linea in pedido_info["lineas"]:
@@ -65,6 +245,13 @@ def contar_unidades_pedidos(pedidos_dia):
 
 def obtener_sku_mas_solicitado(pedidos_dia):
     """Encuentra el SKU más solicitado en un día"""
+    if isinstance(pedidos_dia, LibroPedidos):
+        if pedidos_dia.num_lineas == 0:
+            return None, 0
+        conteo = pedidos_dia.unidades_por_sku()
+        indice = int(np.argmax(conteo))
+        return pedidos_dia.skus[indice], int(conteo[indice])
+
     conteo_sku = {}
     for pedido_info in pedidos_dia.values():
         for linea in pedido_info["lineas"]:
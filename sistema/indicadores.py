@@ -2,6 +2,12 @@
 indicadores.py - Cálculo de indicadores logísticos (KPIs)
 """
 
+import math
+import random
+from collections import deque
+
+import numpy as np
+
 
 def calcular_indicadores(
     pedidos_totales,
@@ -30,6 +36,53 @@ def calcular_indicadores(
         Diccionario con todos los indicadores
     """
 
+    otif, fill_rate, backlog_rate, productividad_picking, indice_transporte = _ratios(
+        pedidos_totales,
+        unidades_entregadas,
+        unidades_solicitadas,
+        unidades_preparadas,
+        unidades_transportadas,
+        horas_jornada,
+    )
+    unidades_no_entregadas = unidades_solicitadas - unidades_entregadas
+
+    return {
+        "otif": round(otif, 2),
+        "fill_rate": round(fill_rate, 2),
+        "backlog_rate": round(backlog_rate, 2),
+        "productividad_picking": round(productividad_picking, 2),
+        "utilizacion_flota": round(utilizacion_flota, 2),
+        "indice_transporte": round(indice_transporte, 2),
+        "unidades_entregadas": unidades_entregadas,
+        "unidades_no_entregadas": unidades_no_entregadas,
+        "pedidos_totales": pedidos_totales,
+        "unidades_solicitadas": unidades_solicitadas,
+        "unidades_preparadas": unidades_preparadas,
+        "unidades_transportadas": unidades_transportadas,
+        "horas_jornada": horas_jornada,
+    }
+
+
+def _ratios(
+    pedidos_totales,
+    unidades_entregadas,
+    unidades_solicitadas,
+    unidades_preparadas,
+    unidades_transportadas,
+    horas_jornada,
+):
+    """
+    Fórmulas de los KPIs (sin redondear) a partir de conteos.
+
+    Se usan tanto para un día (calcular_indicadores) como para totales
+    acumulados (AcumuladorKPI), donde dan los ratios globales ponderados
+    por volumen.
+
+    Returns:
+        Tupla (otif, fill_rate, backlog_rate, productividad_picking,
+        indice_transporte)
+    """
+
     # OTIF: On-Time In-Full (asumiendo lead time estándar 48h)
     # Por ahora: pedidos completamente entregados / total
     otif = 0.0
@@ -63,22 +116,288 @@ def calcular_indicadores(
     if unidades_preparadas > 0:
         indice_transporte = (unidades_transportadas / unidades_preparadas) * 100
 
+    return otif, fill_rate, backlog_rate, productividad_picking, indice_transporte
+
+
+def _redondear_lote(valores, decimales=2):
+    """
+    np.round que coincide con round() de Python.
+
+    np.round escala, redondea y desescala, y puede diferir de round() en
+    valores que quedan a medio camino tras escalar; esos pocos casos se
+    recalculan con round().
+    """
+    forma = np.shape(valores)
+    planos = np.array(valores, dtype=float, ndmin=1).reshape(-1)
+    redondeado = np.round(planos, decimales)
+    escalado = planos * 10**decimales
+    dudosos = np.flatnonzero(np.abs(escalado - np.floor(escalado) - 0.5) < 1e-6)
+    for i in dudosos.tolist():
+        redondeado[i] = round(float(planos[i]), decimales)
+    return redondeado.reshape(forma)
+
+
+def _dividir(numerador, denominador, condicion):
+    """numerador / denominador donde se cumple la condición, 0.0 en el resto"""
+    return np.divide(
+        numerador,
+        denominador,
+        out=np.zeros(np.broadcast(numerador, denominador).shape),
+        where=condicion,
+    )
+
+
+def calcular_indicadores_lote(
+    pedidos_totales,
+    unidades_entregadas,
+    unidades_solicitadas,
+    unidades_preparadas,
+    unidades_transportadas,
+    unidades_no_transportadas,
+    utilizacion_flota,
+    horas_jornada=8,
+):
+    """
+    Versión vectorizada de calcular_indicadores.
+
+    Recibe arreglos de conteos diarios de cualquier forma compatible (por
+    ejemplo escenarios × días) y calcula todos los KPIs en una pasada.
+    Mantiene los mismos casos de división por cero y da exactamente los
+    mismos números que calcular_indicadores elemento a elemento.
+
+    Args:
+        (los de calcular_indicadores, como arreglos o escalares)
+
+    Returns:
+        Diccionario con las mismas claves que calcular_indicadores, cada
+        una con un arreglo
+    """
+    pedidos_totales = np.asarray(pedidos_totales)
+    entregadas = np.asarray(unidades_entregadas, dtype=float)
+    solicitadas = np.asarray(unidades_solicitadas, dtype=float)
+    preparadas = np.asarray(unidades_preparadas, dtype=float)
+    transportadas = np.asarray(unidades_transportadas, dtype=float)
+    horas = np.asarray(horas_jornada, dtype=float)
+
+    hay_solicitadas = solicitadas > 0
+    proporcion_entregada = _dividir(entregadas, solicitadas, hay_solicitadas)
+
+    otif = np.where(
+        pedidos_totales > 0, np.minimum(proporcion_entregada * 100, 100.0), 0.0
+    )
+    fill_rate = proporcion_entregada * 100
+    backlog_rate = _dividir(solicitadas - entregadas, solicitadas, hay_solicitadas) * 100
+    productividad_picking = _dividir(preparadas, horas, horas > 0)
+    indice_transporte = _dividir(transportadas, preparadas, preparadas > 0) * 100
+
+    unidades_entregadas = np.asarray(unidades_entregadas)
+    unidades_solicitadas = np.asarray(unidades_solicitadas)
     return {
-        "otif": round(otif, 2),
-        "fill_rate": round(fill_rate, 2),
-        "backlog_rate": round(backlog_rate, 2),
-        "productividad_picking": round(productividad_picking, 2),
-        "utilizacion_flota": round(utilizacion_flota, 2),
-        "indice_transporte": round(indice_transporte, 2),
+        "otif": _redondear_lote(otif),
+        "fill_rate": _redondear_lote(fill_rate),
+        "backlog_rate": _redondear_lote(backlog_rate),
+        "productividad_picking": _redondear_lote(productividad_picking),
+        "utilizacion_flota": _redondear_lote(np.asarray(utilizacion_flota, dtype=float)),
+        "indice_transporte": _redondear_lote(indice_transporte),
         "unidades_entregadas": unidades_entregadas,
-        "unidades_no_entregadas": unidades_no_entregadas,
+        "unidades_no_entregadas": unidades_solicitadas - unidades_entregadas,
         "pedidos_totales": pedidos_totales,
+        "unidades_solicitadas": unidades_solicitadas,
+        "unidades_preparadas": np.asarray(unidades_preparadas),
+        "unidades_transportadas": np.asarray(unidades_transportadas),
+        "horas_jornada": np.asarray(horas_jornada),
     }
 
 
+# Conteos que se suman día a día
+_CONTEOS = (
+    "pedidos_totales",
+    "unidades_entregadas",
+    "unidades_solicitadas",
+    "unidades_preparadas",
+    "unidades_transportadas",
+    "horas_jornada",
+)
+
+# Indicadores diarios que se promedian
+_PROMEDIOS = (
+    "otif",
+    "fill_rate",
+    "backlog_rate",
+    "productividad_picking",
+    "utilizacion_flota",
+)
+
+
+class _SumaVentana:
+    """Sumas de los últimos `dias` días, actualizadas al entrar cada día"""
+
+    def __init__(self, dias):
+        self.dias = dias
+        self.n = 0
+        self.sumas = dict.fromkeys(_CONTEOS + _PROMEDIOS, 0)
+
+    def entrar(self, valores, saliente):
+        for clave, valor in valores.items():
+            self.sumas[clave] += valor
+        if saliente is None:
+            self.n += 1
+        else:
+            for clave, valor in saliente.items():
+                self.sumas[clave] -= valor
+
+
+class AcumuladorKPI:
+    """
+    Acumula KPIs día a día sin guardar la lista de días.
+
+    Cada día se incorpora en O(1): se suman sus conteos (para los ratios
+    globales, ponderados por volumen) y sus indicadores (para los promedios
+    diarios). Las ventanas móviles se mantienen con sumas corrientes sobre
+    los últimos días, así que la memoria depende del tamaño de la ventana
+    más grande, no del horizonte.
+    """
+
+    def __init__(self, ventanas=(7, 30)):
+        self.ventanas = {dias: _SumaVentana(dias) for dias in ventanas}
+        self._recientes = deque(maxlen=max(ventanas, default=0) + 1)
+        self._total = _SumaVentana(None)
+
+    @property
+    def dias(self):
+        """Días incorporados"""
+        return self._total.n
+
+    def agregar_dia(
+        self,
+        pedidos_totales,
+        unidades_entregadas,
+        unidades_solicitadas,
+        unidades_preparadas,
+        unidades_transportadas,
+        unidades_no_transportadas,
+        utilizacion_flota,
+        horas_jornada=8,
+    ):
+        """
+        Calcula los indicadores del día (ver calcular_indicadores) y los
+        incorpora al acumulado.
+
+        Returns:
+            Diccionario de indicadores del día
+        """
+        indicadores = calcular_indicadores(
+            pedidos_totales,
+            unidades_entregadas,
+            unidades_solicitadas,
+            unidades_preparadas,
+            unidades_transportadas,
+            unidades_no_transportadas,
+            utilizacion_flota,
+            horas_jornada,
+        )
+        self.agregar_indicadores(indicadores)
+        return indicadores
+
+    def agregar_indicadores(self, indicadores):
+        """
+        Incorpora un diccionario de indicadores diarios ya calculado.
+
+        Los conteos que falten (diccionarios anteriores a estas claves) se
+        toman como 0, salvo las unidades solicitadas, que se reconstruyen
+        como entregadas + no entregadas.
+        """
+        valores = {clave: indicadores[clave] for clave in _PROMEDIOS}
+        for clave in _CONTEOS:
+            valores[clave] = indicadores.get(clave, 0)
+        if "unidades_solicitadas" not in indicadores:
+            valores["unidades_solicitadas"] = (
+                indicadores["unidades_entregadas"] + indicadores["unidades_no_entregadas"]
+            )
+
+        self._total.entrar(valores, None)
+        self._recientes.append(valores)
+        for ventana in self.ventanas.values():
+            saliente = None
+            if ventana.n == ventana.dias:
+                saliente = self._recientes[-ventana.dias - 1]
+            ventana.entrar(valores, saliente)
+
+    @staticmethod
+    def _resumen(suma):
+        """Promedios diarios y ratios globales de un conjunto de sumas"""
+        s = suma.sumas
+        n = suma.n
+        otif, fill_rate, backlog_rate, productividad, indice_transporte = _ratios(
+            s["pedidos_totales"],
+            s["unidades_entregadas"],
+            s["unidades_solicitadas"],
+            s["unidades_preparadas"],
+            s["unidades_transportadas"],
+            s["horas_jornada"],
+        )
+        resumen = {
+            f"{clave}_promedio": round(s[clave] / n, 2) for clave in _PROMEDIOS
+        }
+        resumen.update(
+            {
+                "otif_global": round(otif, 2),
+                "fill_rate_global": round(fill_rate, 2),
+                "backlog_rate_global": round(backlog_rate, 2),
+                "productividad_picking_global": round(productividad, 2),
+                "indice_transporte_global": round(indice_transporte, 2),
+            }
+        )
+        return resumen
+
+    def consolidado(self):
+        """
+        Indicadores de todos los días incorporados.
+
+        Returns:
+            Diccionario con los promedios diarios (*_promedio), los ratios
+            globales ponderados por volumen (*_global) y los totales
+        """
+        if self.dias == 0:
+            return {}
+        s = self._total.sumas
+        resultado = self._resumen(self._total)
+        resultado.update(
+            {
+                "unidades_entregadas_total": s["unidades_entregadas"],
+                "unidades_no_entregadas_total": (
+                    s["unidades_solicitadas"] - s["unidades_entregadas"]
+                ),
+                "unidades_solicitadas_total": s["unidades_solicitadas"],
+                "unidades_preparadas_total": s["unidades_preparadas"],
+                "unidades_transportadas_total": s["unidades_transportadas"],
+                "pedidos_totales": s["pedidos_totales"],
+                "dias_simulados": self.dias,
+            }
+        )
+        return resultado
+
+    def ventana(self, dias):
+        """
+        Indicadores de los últimos `dias` días (debe ser una de las
+        ventanas del acumulador).
+        """
+        if dias not in self.ventanas:
+            raise ValueError(
+                f"Ventana no disponible: {dias}. Opciones: {', '.join(map(str, self.ventanas))}"
+            )
+        suma = self.ventanas[dias]
+        if suma.n == 0:
+            return {}
+        resultado = self._resumen(suma)
+        resultado["dias"] = suma.n
+        return resultado
+
+
 def consolidar_indicadores_multiples_dias(lista_indicadores_diarios):
     """
-    Consolida indicadores de múltiples días en promedios globales.
+    Consolida indicadores de múltiples días en promedios globales
+    (ver AcumuladorKPI.consolidado).
 
     Args:
         lista_indicadores_diarios: Lista de diccionarios de indicadores diarios
@@ -87,34 +406,143 @@ def consolidar_indicadores_multiples_dias(lista_indicadores_diarios):
         Diccionario con indicadores consolidados
     """
 
-    if not lista_indicadores_diarios:
-        return {}
+    acumulador = AcumuladorKPI(ventanas=())
+    for indicadores in lista_indicadores_diarios:
+        acumulador.agregar_indicadores(indicadores)
+    return acumulador.consolidado()
 
-    n_dias = len(lista_indicadores_diarios)
 
-    # Sumar valores
-    suma_otif = sum(ind["otif"] for ind in lista_indicadores_diarios)
-    suma_fill_rate = sum(ind["fill_rate"] for ind in lista_indicadores_diarios)
-    suma_backlog = sum(ind["backlog_rate"] for ind in lista_indicadores_diarios)
-    suma_prod = sum(ind["productividad_picking"] for ind in lista_indicadores_diarios)
-    suma_util_flota = sum(ind["utilizacion_flota"] for ind in lista_indicadores_diarios)
+class SketchCuantiles:
+    """
+    Resumen de cuantiles de memoria acotada, combinable (estilo KLL).
 
-    total_entregadas = sum(
-        ind["unidades_entregadas"] for ind in lista_indicadores_diarios
-    )
-    total_no_entregadas = sum(
-        ind["unidades_no_entregadas"] for ind in lista_indicadores_diarios
-    )
-    total_pedidos = sum(ind["pedidos_totales"] for ind in lista_indicadores_diarios)
+    Los valores se guardan en niveles: un valor del nivel h representa 2**h
+    valores originales. Cuando un nivel se llena se ordena y se sube al
+    siguiente uno de cada dos valores (empezando en posición par o impar al
+    azar), lo que mantiene el error de rango en O(1/k) con O(k) valores
+    guardados. Dos sketches se combinan juntando sus niveles, así que cada
+    proceso puede llevar el suyo y el proceso principal solo los une.
 
-    return {
-        "otif_promedio": round(suma_otif / n_dias, 2),
-        "fill_rate_promedio": round(suma_fill_rate / n_dias, 2),
-        "backlog_rate_promedio": round(suma_backlog / n_dias, 2),
-        "productividad_picking_promedio": round(suma_prod / n_dias, 2),
-        "utilizacion_flota_promedio": round(suma_util_flota / n_dias, 2),
-        "unidades_entregadas_total": total_entregadas,
-        "unidades_no_entregadas_total": total_no_entregadas,
-        "pedidos_totales": total_pedidos,
-        "dias_simulados": n_dias,
-    }
+    Mientras no se haya comprimido nada, los cuantiles son exactos (misma
+    interpolación que np.percentile).
+    """
+
+    def __init__(self, k=200, semilla=0):
+        self.k = k
+        self.niveles = [[]]
+        self.n = 0
+        self.minimo = None
+        self.maximo = None
+        self._rng = random.Random(semilla)
+        self._tamano_maximo = self._capacidad(0)
+
+    def _capacidad(self, h):
+        return 2 + int(self.k * (2 / 3) ** (len(self.niveles) - h - 1))
+
+    def _crecer(self):
+        self.niveles.append([])
+        self._tamano_maximo = sum(self._capacidad(h) for h in range(len(self.niveles)))
+
+    def _tamano(self):
+        return sum(len(nivel) for nivel in self.niveles)
+
+    def _comprimir(self):
+        while self._tamano() >= self._tamano_maximo:
+            for h in range(len(self.niveles)):
+                nivel = self.niveles[h]
+                if len(nivel) >= self._capacidad(h):
+                    if h + 1 >= len(self.niveles):
+                        self._crecer()
+                    nivel.sort()
+                    resto = [nivel.pop()] if len(nivel) % 2 else []
+                    inicio = self._rng.randint(0, 1)
+                    self.niveles[h + 1].extend(nivel[inicio::2])
+                    self.niveles[h] = resto
+                    break
+
+    def agregar(self, valor):
+        """Agrega un valor"""
+        valor = float(valor)
+        self.n += 1
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+        self.niveles[0].append(valor)
+        if self._tamano() >= self._tamano_maximo:
+            self._comprimir()
+
+    def agregar_lote(self, valores):
+        """Agrega un arreglo de valores (por bloques de k)"""
+        valores = np.asarray(valores, dtype=float).ravel()
+        if len(valores) == 0:
+            return
+        self.n += len(valores)
+        minimo, maximo = float(valores.min()), float(valores.max())
+        self.minimo = minimo if self.minimo is None else min(self.minimo, minimo)
+        self.maximo = maximo if self.maximo is None else max(self.maximo, maximo)
+        for inicio in range(0, len(valores), self.k):
+            self.niveles[0].extend(valores[inicio : inicio + self.k].tolist())
+            self._comprimir()
+
+    def combinar(self, otro):
+        """
+        Incorpora otro sketch (en el lugar).
+
+        Returns:
+            self
+        """
+        if otro.n == 0:
+            return self
+        while len(self.niveles) < len(otro.niveles):
+            self._crecer()
+        for h, nivel in enumerate(otro.niveles):
+            self.niveles[h].extend(nivel)
+        self.n += otro.n
+        self.minimo = otro.minimo if self.minimo is None else min(self.minimo, otro.minimo)
+        self.maximo = otro.maximo if self.maximo is None else max(self.maximo, otro.maximo)
+        self._comprimir()
+        return self
+
+    @property
+    def exacto(self):
+        """True si aún no se comprimió ningún valor"""
+        return all(not nivel for nivel in self.niveles[1:])
+
+    def cuantiles(self, qs):
+        """
+        Cuantiles aproximados.
+
+        Args:
+            qs: Lista de cuantiles entre 0 y 1
+
+        Returns:
+            Lista de valores (None si el sketch está vacío)
+        """
+        if self.n == 0:
+            return [None for _ in qs]
+        if self.exacto:
+            return [float(v) for v in np.quantile(self.niveles[0], qs)]
+
+        valores = []
+        pesos = []
+        for h, nivel in enumerate(self.niveles):
+            valores.extend(nivel)
+            pesos.extend([2**h] * len(nivel))
+        orden = np.argsort(valores, kind="stable")
+        valores = np.asarray(valores)[orden]
+        acumulado = np.cumsum(np.asarray(pesos)[orden])
+        total = acumulado[-1]
+
+        resultado = []
+        for q in qs:
+            if q <= 0:
+                resultado.append(self.minimo)
+            elif q >= 1:
+                resultado.append(self.maximo)
+            else:
+                i = int(np.searchsorted(acumulado, q * total, side="left"))
+                resultado.append(float(valores[min(i, len(valores) - 1)]))
+        return resultado
+
+    def cuantil(self, q):
+        """Cuantil aproximado q (entre 0 y 1)"""
+        return self.cuantiles([q])[0]
@@ -2,6 +2,23 @@
 inventario.py - Control de inventario y reposición automática
 """
 
+import numpy as np
+
+from .pedidos import LibroPedidos
+
+
+# Registro compacto de transacciones de LibroInventario: una fila por línea.
+# "pedido" es la posición del pedido dentro de los pedidos del día y "sku"
+# el índice del SKU en LibroInventario.skus.
+DTYPE_TRANSACCION = np.dtype(
+    [
+        ("pedido", np.int32),
+        ("sku", np.int32),
+        ("solicitado", np.int32),
+        ("entregado", np.int32),
+    ]
+)
+
 
 def inicializar_stock(dic_sku, stock_inicial=200):
     """
@@ -17,19 +34,410 @@ def inicializar_stock(dic_sku, stock_inicial=200):
     return {sku: stock_inicial for sku in dic_sku.keys()}
 
 
-def reservar_y_actualizar(stock, pedidos_dia, dic_clientes):
+# Tipos de movimiento del diario de inventario
+TIPO_RESERVA = 0
+TIPO_REPOSICION = 1
+TIPO_AJUSTE = 2
+TIPOS_MOVIMIENTO = ("reserva", "reposicion", "ajuste")
+
+
+class DiarioInventario:
+    """
+    Diario de movimientos de inventario con fotos periódicas del stock.
+
+    Los movimientos (día, tipo, sku, delta) se agregan al final de arreglos
+    NumPy que crecen por duplicación; nunca se modifican. Cada `cada_n_dias`
+    días se guarda una foto del stock al cierre, así que el stock de un día
+    cualquiera se obtiene con la última foto anterior más, como máximo,
+    `cada_n_dias` días de movimientos.
+    """
+
+    def __init__(self, skus, stock_inicial, cada_n_dias=7):
+        self.skus = list(skus)
+        self.cada_n_dias = cada_n_dias
+        self.n = 0
+        self._dia = np.zeros(1024, dtype=np.int32)
+        self._tipo = np.zeros(1024, dtype=np.int8)
+        self._sku = np.zeros(1024, dtype=np.int32)
+        self._delta = np.zeros(1024, dtype=np.int64)
+        # Primer movimiento del día abierto (se fecha al cerrar el día)
+        self._inicio_dia = 0
+        self.ultimo_dia = 0
+        self.fotos = {0: np.array(stock_inicial, dtype=np.int64)}
+
+    def _asegurar_capacidad(self, extra):
+        requerido = self.n + extra
+        if requerido <= len(self._dia):
+            return
+        capacidad = max(requerido, 2 * len(self._dia))
+        for nombre in ("_dia", "_tipo", "_sku", "_delta"):
+            viejo = getattr(self, nombre)
+            nuevo = np.zeros(capacidad, dtype=viejo.dtype)
+            nuevo[: self.n] = viejo[: self.n]
+            setattr(self, nombre, nuevo)
+
+    def registrar(self, tipo, skus, deltas):
+        """
+        Agrega movimientos del día abierto.
+
+        Args:
+            tipo: TIPO_RESERVA, TIPO_REPOSICION o TIPO_AJUSTE
+            skus: Índices de SKU
+            deltas: Cambio de stock de cada SKU (negativo = salida)
+        """
+        skus = np.atleast_1d(np.asarray(skus))
+        deltas = np.broadcast_to(np.asarray(deltas, dtype=np.int64), skus.shape)
+        k = len(skus)
+        if k == 0:
+            return
+        self._asegurar_capacidad(k)
+        self._tipo[self.n : self.n + k] = tipo
+        self._sku[self.n : self.n + k] = skus
+        self._delta[self.n : self.n + k] = deltas
+        self.n += k
+
+    def cerrar_dia(self, dia, stock):
+        """
+        Fecha los movimientos del día abierto y, si corresponde, guarda la
+        foto del stock al cierre.
+
+        Args:
+            dia: Número de día (mayor que el último cerrado)
+            stock: Arreglo de stock al cierre del día
+        """
+        if dia <= self.ultimo_dia:
+            raise ValueError(f"El día {dia} ya está cerrado (último: {self.ultimo_dia})")
+        self._dia[self._inicio_dia : self.n] = dia
+        self._inicio_dia = self.n
+        self.ultimo_dia = dia
+        if dia % self.cada_n_dias == 0:
+            self.fotos[dia] = np.array(stock, dtype=np.int64)
+
+    def movimientos(self, desde=1, hasta=None):
+        """
+        Movimientos de los días [desde, hasta] como arreglo estructurado
+        con campos dia, tipo, sku y delta.
+        """
+        if hasta is None:
+            hasta = self.ultimo_dia
+        dias = self._dia[: self._inicio_dia]
+        inicio = int(np.searchsorted(dias, desde, side="left"))
+        fin = int(np.searchsorted(dias, hasta, side="right"))
+        resultado = np.empty(
+            fin - inicio,
+            dtype=[("dia", np.int32), ("tipo", np.int8), ("sku", np.int32), ("delta", np.int64)],
+        )
+        resultado["dia"] = self._dia[inicio:fin]
+        resultado["tipo"] = self._tipo[inicio:fin]
+        resultado["sku"] = self._sku[inicio:fin]
+        resultado["delta"] = self._delta[inicio:fin]
+        return resultado
+
+    def stock_en_dia(self, dia):
+        """
+        Stock al cierre de un día: última foto anterior + movimientos
+        posteriores a ella.
+
+        Args:
+            dia: Número de día (0 = stock inicial)
+
+        Returns:
+            Diccionario {sku: cantidad}
+        """
+        if dia < 0 or dia > self.ultimo_dia:
+            raise ValueError(f"Día fuera del diario: {dia} (0 a {self.ultimo_dia})")
+        dia_foto = max(d for d in self.fotos if d <= dia)
+        stock = self.fotos[dia_foto].copy()
+        if dia > dia_foto:
+            movimientos = self.movimientos(dia_foto + 1, dia)
+            stock += np.bincount(
+                movimientos["sku"], weights=movimientos["delta"], minlength=len(stock)
+            ).astype(np.int64)
+        return dict(zip(self.skus, stock.tolist()))
+
+    def guardar(self, ruta):
+        """Guarda el diario en un archivo .npz comprimido"""
+        dias_foto = sorted(self.fotos)
+        np.savez_compressed(
+            ruta,
+            skus=np.array(self.skus),
+            cada_n_dias=self.cada_n_dias,
+            ultimo_dia=self.ultimo_dia,
+            dia=self._dia[: self._inicio_dia],
+            tipo=self._tipo[: self._inicio_dia],
+            sku=self._sku[: self._inicio_dia],
+            delta=self._delta[: self._inicio_dia],
+            dias_foto=np.array(dias_foto, dtype=np.int32),
+            fotos=np.stack([self.fotos[d] for d in dias_foto]),
+        )
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un diario guardado con guardar()"""
+        with np.load(ruta) as datos:
+            fotos = datos["fotos"]
+            diario = cls(datos["skus"].tolist(), fotos[0], int(datos["cada_n_dias"]))
+            diario._dia = datos["dia"].astype(np.int32)
+            diario._tipo = datos["tipo"].astype(np.int8)
+            diario._sku = datos["sku"].astype(np.int32)
+            diario._delta = datos["delta"].astype(np.int64)
+            diario.n = diario._inicio_dia = len(diario._dia)
+            diario.ultimo_dia = int(datos["ultimo_dia"])
+            diario.fotos = {
+                int(d): foto for d, foto in zip(datos["dias_foto"].tolist(), fotos)
+            }
+        return diario
+
+
+class LibroInventario:
+    """
+    Stock como arreglo de enteros indexado por SKU.
+
+    A diferencia del diccionario de stock, se actualiza en el lugar (sin
+    copiar el stock cada día) y procesa las líneas de un día en bloque.
+    Admite las consultas de lectura de un diccionario (stock[sku], get,
+    keys, items), así que dict(libro) devuelve el stock en el formato de
+    siempre.
+    """
+
+    def __init__(self, skus, cantidad):
+        self.skus = list(skus)
+        self.indice = {sku: i for i, sku in enumerate(self.skus)}
+        self.cantidad = np.asarray(cantidad, dtype=np.int64)
+        self.diario = None
+        # SKUs pendientes de revisar para reposición: solo pueden caer bajo
+        # el punto de reorden los que tuvieron salidas desde la última
+        # revisión (al inicio, todos)
+        self._marcado = np.ones(len(self.skus), dtype=bool)
+        self._por_revisar = [np.arange(len(self.skus), dtype=np.int64)]
+
+    def marcar_para_revision(self, indices):
+        """Agrega SKUs (índices) al conjunto a revisar en la próxima reposición"""
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        indices = indices[~self._marcado[indices]]
+        if len(indices):
+            self._marcado[indices] = True
+            self._por_revisar.append(indices)
+
+    def candidatos_reposicion(self):
+        """
+        Extrae los SKUs marcados desde la última revisión y vacía el conjunto.
+
+        Returns:
+            Índices de SKU ordenados
+        """
+        if not self._por_revisar:
+            return np.zeros(0, dtype=np.int64)
+        indices = np.sort(np.concatenate(self._por_revisar))
+        self._marcado[indices] = False
+        self._por_revisar = []
+        return indices
+
+    def activar_diario(self, cada_n_dias=7):
+        """
+        Empieza a registrar los movimientos en un DiarioInventario.
+
+        Args:
+            cada_n_dias: Días entre fotos del stock
+
+        Returns:
+            DiarioInventario (también queda en self.diario)
+        """
+        self.diario = DiarioInventario(self.skus, self.cantidad, cada_n_dias)
+        return self.diario
+
+    def cerrar_dia(self, dia):
+        """Cierra el día en el diario (si está activo)"""
+        if self.diario is not None:
+            self.diario.cerrar_dia(dia, self.cantidad)
+
+    def ajustar(self, sku, delta):
+        """Ajuste manual de stock (conteo físico, mermas, etc.)"""
+        i = self.indice[sku]
+        self.cantidad[i] += delta
+        if delta < 0:
+            self.marcar_para_revision(i)
+        if self.diario is not None:
+            self.diario.registrar(TIPO_AJUSTE, i, delta)
+
+    @classmethod
+    def inicial(cls, dic_sku, stock_inicial=200):
+        """Libro con el mismo stock inicial para todos los SKUs"""
+        return cls(dic_sku.keys(), np.full(len(dic_sku), stock_inicial, dtype=np.int64))
+
+    @classmethod
+    def desde_diccionario(cls, stock):
+        """Libro a partir de un diccionario {sku: cantidad}"""
+        return cls(stock.keys(), list(stock.values()))
+
+    def a_diccionario(self):
+        """Stock como diccionario {sku: cantidad}"""
+        return dict(zip(self.skus, self.cantidad.tolist()))
+
+    def __len__(self):
+        return len(self.skus)
+
+    def __contains__(self, sku):
+        return sku in self.indice
+
+    def __getitem__(self, sku):
+        return int(self.cantidad[self.indice[sku]])
+
+    def get(self, sku, defecto=None):
+        i = self.indice.get(sku)
+        return defecto if i is None else int(self.cantidad[i])
+
+    def keys(self):
+        return list(self.skus)
+
+    def items(self):
+        return self.a_diccionario().items()
+
+    def _indices_sku(self, skus):
+        """Índice de cada SKU en el libro (-1 si no existe)"""
+        return np.array([self.indice.get(sku, -1) for sku in skus], dtype=np.int64)
+
+    def _lineas(self, pedidos_dia):
+        """
+        Arreglos por línea (pedido, sku, cantidad) en orden de llegada.
+        """
+        if isinstance(pedidos_dia, LibroPedidos):
+            sku = self._indices_sku(pedidos_dia.skus)[pedidos_dia.sku]
+            return (
+                pedidos_dia.pedido_de_linea(),
+                sku,
+                pedidos_dia.cantidad.astype(np.int64),
+            )
+
+        pedidos, skus, cantidades = [], [], []
+        for i, pedido_info in enumerate(pedidos_dia.values()):
+            for linea in pedido_info["lineas"]:
+                pedidos.append(i)
+                skus.append(self.indice.get(linea["sku"], -1))
+                cantidades.append(linea["cantidad"])
+        return (
+            np.array(pedidos, dtype=np.int64),
+            np.array(skus, dtype=np.int64),
+            np.array(cantidades, dtype=np.int64),
+        )
+
+    def reservar(self, pedidos_dia, registrar=False):
+        """
+        Descuenta del stock las líneas del día, en orden de llegada.
+
+        Las líneas se agrupan por SKU (ordenamiento estable) y a cada una se
+        le entrega min(cantidad, stock - lo pedido antes por el mismo SKU),
+        sin bajar de cero: el mismo resultado que recorrer las líneas una
+        por una.
+
+        Args:
+            pedidos_dia: Pedidos del día (diccionario o LibroPedidos)
+            registrar: Si es True, devuelve el registro de transacciones
+
+        Returns:
+            Tupla (unidades_entregadas, unidades_no_entregadas, log) donde
+            log es un arreglo estructurado DTYPE_TRANSACCION o None
+        """
+        pedido, sku, cantidad = self._lineas(pedidos_dia)
+        entregado = np.zeros(len(cantidad), dtype=np.int64)
+
+        conocido = np.flatnonzero(sku >= 0)
+        if len(conocido):
+            orden = conocido[np.argsort(sku[conocido], kind="stable")]
+            sku_ordenado = sku[orden]
+            cantidad_ordenada = cantidad[orden]
+
+            # Unidades pedidas antes que cada línea dentro de su SKU
+            acumulado = np.cumsum(cantidad_ordenada)
+            inicio_grupo = np.flatnonzero(np.r_[True, sku_ordenado[1:] != sku_ordenado[:-1]])
+            base = np.repeat(
+                acumulado[inicio_grupo] - cantidad_ordenada[inicio_grupo],
+                np.diff(np.r_[inicio_grupo, len(orden)]),
+            )
+            previo = acumulado - cantidad_ordenada - base
+
+            entregado[orden] = np.clip(
+                self.cantidad[sku_ordenado] - previo, 0, cantidad_ordenada
+            )
+            consumo = np.bincount(
+                sku[conocido], weights=entregado[conocido], minlength=len(self.skus)
+            ).astype(np.int64)
+            self.cantidad -= consumo
+            movidos = np.flatnonzero(consumo)
+            self.marcar_para_revision(movidos)
+            if self.diario is not None:
+                self.diario.registrar(TIPO_RESERVA, movidos, -consumo[movidos])
+
+        unidades_entregadas = int(entregado.sum())
+        unidades_no_entregadas = int(cantidad.sum()) - unidades_entregadas
+
+        log = None
+        if registrar:
+            log = np.empty(len(cantidad), dtype=DTYPE_TRANSACCION)
+            log["pedido"] = pedido
+            log["sku"] = sku
+            log["solicitado"] = cantidad
+            log["entregado"] = entregado
+
+        return unidades_entregadas, unidades_no_entregadas, log
+
+    def reponer(self, punto_reorden=50, lote=100):
+        """
+        Repone `lote` unidades a los SKUs con stock bajo el punto de reorden.
+
+        Solo revisa los SKUs con salidas desde la revisión anterior (ver
+        candidatos_reposicion); los que siguen bajo el punto tras reponer
+        quedan marcados para la próxima. Supone el mismo punto de reorden
+        en todas las llamadas.
+
+        Returns:
+            Log de reaprovisionamiento (mismo formato que reponer_simple)
+        """
+        candidatos = self.candidatos_reposicion()
+        indices = candidatos[self.cantidad[candidatos] < punto_reorden]
+        anteriores = self.cantidad[indices].tolist()
+        self.cantidad[indices] += lote
+        self.marcar_para_revision(indices[self.cantidad[indices] < punto_reorden])
+        if self.diario is not None:
+            self.diario.registrar(TIPO_REPOSICION, indices, lote)
+        return [
+            {
+                "sku": self.skus[i],
+                "stock_anterior": anterior,
+                "stock_posterior": anterior + lote,
+                "cantidad_añadida": lote,
+            }
+            for i, anterior in zip(indices.tolist(), anteriores)
+        ]
+
+
+def reservar_y_actualizar(stock, pedidos_dia, dic_clientes, registrar=True, tocados=None):
     """
     Procesa pedidos del día y actualiza el stock.
     Reduce inventario según líneas de pedidos.
 
     Args:
-        stock: Diccionario actual de stock
-        pedidos_dia: Pedidos del día
+        stock: Diccionario actual de stock (o LibroInventario, que se
+               actualiza en el lugar)
+        pedidos_dia: Pedidos del día (diccionario o LibroPedidos)
         dic_clientes: Catálogo de clientes
+        registrar: Si es False no se arma el log de transacciones (None)
+        tocados: Conjunto (set) al que se agregan los SKUs con salidas, para
+                 pasarlo como candidatos a reponer_simple. Un
+                 LibroInventario lleva su propio conjunto.
 
     Returns:
         Tupla (stock_actualizado, unidades_entregadas, unidades_no_entregadas, log_transacciones)
+        Con un LibroInventario, log_transacciones es un arreglo estructurado
+        DTYPE_TRANSACCION
     """
+    if isinstance(stock, LibroInventario):
+        entregadas, no_entregadas, log = stock.reservar(pedidos_dia, registrar)
+        return stock, entregadas, no_entregadas, log
+
+    if isinstance(pedidos_dia, LibroPedidos):
+        return _reservar_libro(stock, pedidos_dia, dic_clientes, registrar, tocados)
+
     stock_actualizado = stock.copy()
     log_transacciones = []
     unidades_entregadas = 0
@@ -50,12 +458,63 @@ def reservar_y_actualizar(stock, pedidos_dia, dic_clientes):
 
             # Actualizar stock
             stock_actualizado[sku] -= cantidad_entregada
+            if tocados is not None and cantidad_entregada:
+                tocados.add(sku)
 
             # Registrar transacción
+            if registrar:
+                log_transacciones.append(
+                    {
+                        "pedido": id_pedido,
+                        "cliente": cliente_nombre,
+                        "sku": sku,
+                        "solicitado": cantidad_solicitada,
+                        "entregado": cantidad_entregada,
+                        "no_entregado": cantidad_no_entregada,
+                    }
+                )
+
+            unidades_entregadas += cantidad_entregada
+            unidades_no_entregadas += cantidad_no_entregada
+
+    return (
+        stock_actualizado,
+        unidades_entregadas,
+        unidades_no_entregadas,
+        log_transacciones if registrar else None,
+    )
+
+
+def _reservar_libro(stock, libro, dic_clientes, registrar=True, tocados=None):
+    """Versión de reservar_y_actualizar que recorre los arreglos del libro"""
+    stock_actualizado = stock.copy()
+    log_transacciones = []
+    unidades_entregadas = 0
+    unidades_no_entregadas = 0
+
+    skus = libro.skus
+    ids_pedido = libro.ids() if registrar else None
+    pedido_de_linea = libro.pedido_de_linea().tolist()
+    clientes = libro.cliente.tolist()
+
+    for k, (id_sku, cantidad_solicitada) in enumerate(
+        zip(libro.sku.tolist(), libro.cantidad.tolist())
+    ):
+        sku = skus[id_sku]
+        i = pedido_de_linea[k]
+
+        stock_disponible = stock_actualizado.get(sku, 0)
+        cantidad_entregada = min(stock_disponible, cantidad_solicitada)
+        cantidad_no_entregada = cantidad_solicitada - cantidad_entregada
+        stock_actualizado[sku] = stock_disponible - cantidad_entregada
+        if tocados is not None and cantidad_entregada:
+            tocados.add(sku)
+
+        if registrar:
             log_transacciones.append(
                 {
-                    "pedido": id_pedido,
-                    "cliente": cliente_nombre,
+                    "pedido": ids_pedido[i],
+                    "cliente": dic_clientes.get(libro.clientes[clientes[i]], "Desconocido"),
                     "sku": sku,
                     "solicitado": cantidad_solicitada,
                     "entregado": cantidad_entregada,
@@ -63,34 +522,60 @@ def reservar_y_actualizar(stock, pedidos_dia, dic_clientes):
                 }
             )
 
-            unidades_entregadas += cantidad_entregada
-            unidades_no_entregadas += cantidad_no_entregada
+        unidades_entregadas += cantidad_entregada
+        unidades_no_entregadas += cantidad_no_entregada
 
     return (
         stock_actualizado,
         unidades_entregadas,
         unidades_no_entregadas,
-        log_transacciones,
+        log_transacciones if registrar else None,
     )
 
 
-def reponer_simple(stock, dic_sku, punto_reorden=50, lote=100):
+def skus_bajo_punto_reorden(stock, punto_reorden=50):
+    """
+    SKUs con stock bajo el punto de reorden: el conjunto inicial de
+    candidatos de reponer_simple (luego se le agregan los `tocados`).
+
+    Returns:
+        set de SKUs
+    """
+    return {sku for sku, cantidad in stock.items() if cantidad < punto_reorden}
+
+
+def reponer_simple(stock, dic_sku, punto_reorden=50, lote=100, candidatos=None):
     """
     Reposición automática: si stock < punto_reorden, añade lote.
 
     Args:
-        stock: Diccionario actual de stock
+        stock: Diccionario actual de stock (o LibroInventario, que se
+               actualiza en el lugar y solo revisa los SKUs con salidas)
         dic_sku: Catálogo de SKUs
         punto_reorden: Umbral mínimo
         lote: Cantidad a reponer
+        candidatos: SKUs a revisar (por defecto, todo dic_sku); se recorren
+                    en el orden de dic_sku, como la revisión completa. Si es
+                    un set (p. ej. el `tocados` de reservar_y_actualizar), se
+                    vacía y quedan en él los SKUs que siguen bajo el punto.
+                    Para que dé lo mismo que revisar todo dic_sku, el set
+                    debe empezar con skus_bajo_punto_reorden(stock_inicial).
 
     Returns:
         Tupla (stock_reaprovisionado, log_reaprovisionamiento)
     """
+    if isinstance(stock, LibroInventario):
+        return stock, stock.reponer(punto_reorden, lote)
+
     stock_repuesto = stock.copy()
     log_reaprovisionamiento = []
 
-    for sku in dic_sku.keys():
+    if candidatos is None:
+        revisar = dic_sku.keys()
+    else:
+        revisar = [sku for sku in dic_sku if sku in candidatos]
+
+    for sku in revisar:
         stock_actual = stock_repuesto.get(sku, 0)
 
         if stock_actual < punto_reorden:
@@ -104,6 +589,14 @@ def reponer_simple(stock, dic_sku, punto_reorden=50, lote=100):
                 }
             )
 
+    if isinstance(candidatos, set):
+        candidatos.clear()
+        candidatos.update(
+            registro["sku"]
+            for registro in log_reaprovisionamiento
+            if registro["stock_posterior"] < punto_reorden
+        )
+
     return stock_repuesto, log_reaprovisionamiento
 
 
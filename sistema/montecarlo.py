@@ -0,0 +1,265 @@
+"""
+montecarlo.py - Réplicas Monte Carlo de la simulación en paralelo
+
+Ejecuta muchas réplicas de la misma configuración con semillas distintas
+sobre un ProcessPoolExecutor y resume los indicadores consolidados con
+media, desviación estándar, intervalo de confianza y percentiles.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .catalogos import dic_sku, dic_clientes, dic_vehiculos, distancias_km
+from .alertas import REGLAS_ALERTAS, evaluar_alertas_lote
+from .indicadores import SketchCuantiles
+from .motor import Simulacion
+
+
+# Indicadores diarios cuya distribución (todos los días de todas las
+# réplicas) se resume con sketches de cuantiles
+INDICADORES_DIARIOS = ("otif", "fill_rate", "backlog_rate", "utilizacion_flota")
+
+
+# Estado de cada proceso trabajador (se llena una vez en el initializer)
+_CONTEXTO = {}
+
+
+def _inicializar_trabajador(catalogos, parametros):
+    """Guarda catálogos y parámetros en el proceso (se serializan una sola vez)"""
+    _CONTEXTO["catalogos"] = catalogos
+    _CONTEXTO["parametros"] = parametros
+
+
+def _ejecutar_replica(semilla, n_dias, catalogos, parametros):
+    """Ejecuta una réplica y devuelve su ResultadoSimulacion"""
+    simulacion = Simulacion(**catalogos, **parametros, seed=semilla)
+    return simulacion.ejecutar(n_dias)
+
+
+def _ejecutar_bloque(semillas, n_dias):
+    """
+    Ejecuta un bloque de réplicas dentro de un proceso trabajador y
+    devuelve su agregado local (no la lista de resultados).
+    """
+    agregador = _AgregadorReplicas(semilla=semillas[0])
+    for s in semillas:
+        agregador.agregar(
+            _ejecutar_replica(s, n_dias, _CONTEXTO["catalogos"], _CONTEXTO["parametros"])
+        )
+    return agregador
+
+
+def generar_semillas(n_replicas, semilla_base=42):
+    """
+    Genera semillas independientes para las réplicas.
+
+    Args:
+        n_replicas: Número de réplicas
+        semilla_base: Semilla de la que se derivan todas las demás
+
+    Returns:
+        Lista de enteros
+    """
+    return np.random.SeedSequence(semilla_base).generate_state(n_replicas).tolist()
+
+
+class _EstadisticaMetrica:
+    """Media y varianza (Welford), extremos y sketch de una métrica"""
+
+    def __init__(self, semilla):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.sketch = SketchCuantiles(semilla=semilla)
+
+    def agregar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        self.sketch.agregar(valor)
+
+    def combinar(self, otra):
+        n = self.n + otra.n
+        if n == 0:
+            return
+        delta = otra.media - self.media
+        self.m2 += otra.m2 + delta * delta * self.n * otra.n / n
+        self.media += delta * otra.n / n
+        self.n = n
+        self.sketch.combinar(otra.sketch)
+
+
+class _AgregadorReplicas:
+    """
+    Acumula las réplicas a medida que llegan, con memoria acotada: por
+    métrica guarda media/varianza corrientes y un sketch de cuantiles.
+    Los agregados de distintos procesos se unen con combinar().
+    """
+
+    def __init__(self, semilla=0):
+        self.semilla = semilla
+        self.metricas = {}
+        self.diarios = {}
+        self.n = 0
+
+    def _estadistica(self, metrica):
+        if metrica not in self.metricas:
+            self.metricas[metrica] = _EstadisticaMetrica(self.semilla)
+        return self.metricas[metrica]
+
+    def agregar(self, resultado):
+        self.n += 1
+        for metrica, valor in resultado.consolidado().items():
+            if metrica == "dias_simulados":
+                continue
+            self._estadistica(metrica).agregar(valor)
+
+        metricas_diarias = {regla["metrica"] for regla in REGLAS_ALERTAS}
+        diarios = {
+            indicador: np.array([dia[indicador] for dia in resultado.indicadores_diarios])
+            for indicador in metricas_diarias.union(INDICADORES_DIARIOS)
+        }
+        for indicador in INDICADORES_DIARIOS:
+            if indicador not in self.diarios:
+                self.diarios[indicador] = SketchCuantiles(semilla=self.semilla)
+            self.diarios[indicador].agregar_lote(diarios[indicador])
+
+        # Días con cada alerta activa en la réplica
+        for tipo, alerta in evaluar_alertas_lote(diarios).items():
+            self._estadistica(f"dias_alerta_{tipo.lower()}").agregar(int(alerta["conteo"]))
+
+    def combinar(self, otro):
+        self.n += otro.n
+        for metrica, estadistica in otro.metricas.items():
+            self._estadistica(metrica).combinar(estadistica)
+        for indicador, sketch in otro.diarios.items():
+            if indicador in self.diarios:
+                self.diarios[indicador].combinar(sketch)
+            else:
+                self.diarios[indicador] = sketch
+
+    def resumen(self, percentiles):
+        cuantiles = [p / 100 for p in percentiles]
+        resultado = {}
+        for metrica, estadistica in self.metricas.items():
+            media = estadistica.media
+            desviacion = (
+                math.sqrt(estadistica.m2 / (estadistica.n - 1)) if estadistica.n > 1 else 0.0
+            )
+            margen = 1.96 * desviacion / math.sqrt(estadistica.n)
+
+            estadisticas = {
+                "media": round(media, 4),
+                "desviacion": round(desviacion, 4),
+                "ic95_inferior": round(media - margen, 4),
+                "ic95_superior": round(media + margen, 4),
+                "minimo": float(estadistica.sketch.minimo),
+                "maximo": float(estadistica.sketch.maximo),
+            }
+            for p, valor in zip(percentiles, estadistica.sketch.cuantiles(cuantiles)):
+                estadisticas[f"p{p}"] = round(valor, 4)
+            resultado[metrica] = estadisticas
+        return resultado
+
+    def resumen_diario(self, percentiles):
+        cuantiles = [p / 100 for p in percentiles]
+        return {
+            indicador: {
+                f"p{p}": round(valor, 4)
+                for p, valor in zip(percentiles, sketch.cuantiles(cuantiles))
+            }
+            for indicador, sketch in self.diarios.items()
+            if sketch.n
+        }
+
+
+def ejecutar_montecarlo(
+    n_replicas,
+    n_dias,
+    semilla_base=42,
+    parametros=None,
+    catalogos=None,
+    n_procesos=None,
+    tamano_bloque=None,
+    percentiles=(5, 50, 95),
+):
+    """
+    Ejecuta réplicas independientes de la simulación y resume sus KPIs.
+
+    Las réplicas se reparten en bloques entre procesos; los catálogos y
+    parámetros se envían una sola vez a cada proceso (initializer), no en
+    cada tarea. Cada proceso agrega sus réplicas localmente (media,
+    varianza y sketches de cuantiles) y el proceso principal combina esos
+    agregados, así que la memoria no crece con el número de réplicas.
+
+    Args:
+        n_replicas: Número de réplicas
+        n_dias: Días a simular por réplica
+        semilla_base: Semilla de la que se derivan las de cada réplica
+        parametros: Parámetros de Simulacion (capacidad_picking,
+                    horas_jornada, stock_inicial, punto_reorden,
+                    lote_reposicion)
+        catalogos: Diccionario con dic_clientes, dic_sku, dic_vehiculos,
+                   distancias_km y (opcional) coordenadas_clientes (por
+                   defecto, los de sistema.catalogos)
+        n_procesos: Procesos a usar (por defecto, núcleos disponibles;
+                    1 ejecuta en el proceso actual)
+        tamano_bloque: Réplicas por tarea (por defecto, ~4 tareas por proceso)
+        percentiles: Percentiles a reportar
+
+    Returns:
+        Diccionario con: {
+            "replicas": n,
+            "dias": n_dias,
+            "metricas": {metrica: {"media", "desviacion", "ic95_inferior",
+                                   "ic95_superior", "minimo", "maximo",
+                                   "p5", "p50", "p95"}},
+            "distribuciones_diarias": {indicador: {"p5", "p50", "p95"}}
+        }
+        Los percentiles son aproximados (SketchCuantiles) a partir de unos
+        cientos de valores; por debajo son exactos.
+    """
+    parametros = parametros or {}
+    if catalogos is None:
+        catalogos = {
+            "dic_clientes": dic_clientes,
+            "dic_sku": dic_sku,
+            "dic_vehiculos": dic_vehiculos,
+            "distancias_km": distancias_km,
+        }
+    if n_procesos is None:
+        n_procesos = os.cpu_count() or 1
+
+    semillas = generar_semillas(n_replicas, semilla_base)
+    agregador = _AgregadorReplicas(semilla=semilla_base)
+
+    if n_procesos <= 1:
+        for semilla in semillas:
+            agregador.agregar(_ejecutar_replica(semilla, n_dias, catalogos, parametros))
+    else:
+        if tamano_bloque is None:
+            tamano_bloque = max(1, math.ceil(n_replicas / (n_procesos * 4)))
+        bloques = [
+            semillas[i : i + tamano_bloque]
+            for i in range(0, len(semillas), tamano_bloque)
+        ]
+
+        with ProcessPoolExecutor(
+            max_workers=n_procesos,
+            initializer=_inicializar_trabajador,
+            initargs=(catalogos, parametros),
+        ) as ejecutor:
+            futuros = [ejecutor.submit(_ejecutar_bloque, b, n_dias) for b in bloques]
+            for futuro in as_completed(futuros):
+                agregador.combinar(futuro.result())
+
+    return {
+        "replicas": agregador.n,
+        "dias": n_dias,
+        "metricas": agregador.resumen(list(percentiles)),
+        "distribuciones_diarias": agregador.resumen_diario(list(percentiles)),
+    }
@@ -0,0 +1,390 @@
+"""
+motor.py - Motor unificado de simulación multi-día
+
+Encadena en una sola pasada por día las etapas de la cadena logística:
+demanda → inventario → reposición → picking → transporte → indicadores,
+manteniendo el estado entre días (stock, backlog y flota).
+"""
+
+import csv
+import os
+
+from .catalogos import dic_sku, dic_clientes, dic_vehiculos, distancias_km
+from .demanda import iter_demanda
+from .inventario import LibroInventario, reservar_y_actualizar, reponer_simple
+from .pedidos import LibroPedidos
+from .reposicion import ReposicionConLeadTime
+from .picking import (
+    asignar_picking,
+    asignar_picking_con_backlog,
+    obtener_tabla_prioridades,
+    ColaBacklog,
+)
+from .transporte import planificar_rutas
+from .indicadores import calcular_indicadores, AcumuladorKPI
+
+
+ETAPAS = ("demanda", "inventario", "reposicion", "picking", "transporte", "indicadores", "dia")
+
+COLUMNAS_RESUMEN_DIARIO = [
+    "dia",
+    "pedidos",
+    "unidades_solicitadas",
+    "unidades_entregadas",
+    "unidades_no_entregadas",
+    "reposiciones",
+    "pedidos_preparados",
+    "pedidos_pendientes",
+    "unidades_preparadas",
+    "unidades_pendientes",
+    "num_rutas",
+    "unidades_transportadas",
+    "utilizacion_flota",
+    "costo_transporte",
+]
+
+
+class ResultadoSimulacion:
+    """Resultado acumulado de una simulación multi-día"""
+
+    def __init__(self):
+        self.indicadores_diarios = []
+        self.resumen_diario = []
+        self.pedidos_totales = 0
+        self.unidades_solicitadas = 0
+        self.unidades_entregadas = 0
+        self.unidades_no_entregadas = 0
+        self.unidades_preparadas = 0
+        self.unidades_transportadas = 0
+        self.costo_transporte = 0.0
+        self.stock_final = {}
+        self.backlog_final = {}
+        self.diario_inventario = None
+        self.acumulador = AcumuladorKPI()
+
+    @property
+    def dias_simulados(self):
+        return len(self.indicadores_diarios)
+
+    def registrar_dia(self, resultado_dia):
+        """Acumula el resultado de un día"""
+        picking = resultado_dia["picking"]
+        rutas = resultado_dia["transporte"]
+
+        self.indicadores_diarios.append(resultado_dia["indicadores"])
+        self.acumulador.agregar_indicadores(resultado_dia["indicadores"])
+        self.resumen_diario.append(
+            {
+                "dia": resultado_dia["dia"],
+                "pedidos": resultado_dia["pedidos"],
+                "unidades_solicitadas": resultado_dia["unidades_solicitadas"],
+                "unidades_entregadas": resultado_dia["inventario"]["unidades_entregadas"],
+                "unidades_no_entregadas": resultado_dia["inventario"][
+                    "unidades_no_entregadas"
+                ],
+                "reposiciones": len(resultado_dia["reposicion"]),
+                "pedidos_preparados": picking["num_pedidos_preparados"],
+                "pedidos_pendientes": picking["num_pedidos_pendientes"],
+                "unidades_preparadas": picking["unidades_preparadas"],
+                "unidades_pendientes": picking["unidades_pendientes"],
+                "num_rutas": rutas["num_rutas"],
+                "unidades_transportadas": rutas["unidades_transportadas"],
+                "utilizacion_flota": rutas["utilizacion_promedio"],
+                "costo_transporte": rutas["costo_total"],
+            }
+        )
+
+        self.pedidos_totales += resultado_dia["pedidos"]
+        self.unidades_solicitadas += resultado_dia["unidades_solicitadas"]
+        self.unidades_entregadas += resultado_dia["inventario"]["unidades_entregadas"]
+        self.unidades_no_entregadas += resultado_dia["inventario"][
+            "unidades_no_entregadas"
+        ]
+        self.unidades_preparadas += picking["unidades_preparadas"]
+        self.unidades_transportadas += rutas["unidades_transportadas"]
+        self.costo_transporte += rutas["costo_total"]
+
+    def consolidado(self):
+        """Indicadores consolidados de todos los días simulados"""
+        return self.acumulador.consolidado()
+
+    def guardar(self, ruta_csv):
+        """
+        Escribe el resumen diario en CSV.
+
+        Si la simulación llevó diario de inventario, lo guarda además junto
+        al CSV con la extensión .npz (ver DiarioInventario.cargar).
+
+        Returns:
+            Lista de rutas escritas
+        """
+        directorio = os.path.dirname(ruta_csv)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta_csv, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=COLUMNAS_RESUMEN_DIARIO)
+            escritor.writeheader()
+            escritor.writerows(self.resumen_diario)
+        rutas = [ruta_csv]
+
+        if self.diario_inventario is not None:
+            ruta_diario = os.path.splitext(ruta_csv)[0] + ".npz"
+            self.diario_inventario.guardar(ruta_diario)
+            rutas.append(ruta_diario)
+        return rutas
+
+
+class Simulacion:
+    """
+    Motor de simulación día a día.
+
+    Cada día pasa una sola vez por todas las etapas. Se pueden registrar
+    funciones (hooks) por etapa con agregar_hook; reciben (dia, resultado)
+    con el resultado de esa etapa.
+
+    Con arrastrar_backlog=True los pedidos que no alcanzan capacidad de
+    picking pasan al día siguiente en una ColaBacklog; por defecto se
+    descartan al cerrar el día, como en el modelo original.
+
+    politica_reposicion="simple" repone al instante con reponer_simple;
+    "sS" o "RQ" usan ReposicionConLeadTime con los lead_times indicados
+    (comunes o {sku: días}) y las órdenes en tránsito.
+
+    grupos_clientes ({nombre: {"ids": [...], "prioridad": n}}) fija la
+    prioridad de picking de cada cliente; por defecto, la del catálogo.
+
+    coordenadas_clientes ({nombre: (lat, lon)}) alimenta el algoritmo de
+    transporte "savings"; por defecto se usan las del catálogo.
+
+    Con diario_inventario=N se registran los movimientos de stock en un
+    DiarioInventario con una foto cada N días (ver stock_en_dia).
+    """
+
+    def __init__(
+        self,
+        dic_clientes=dic_clientes,
+        dic_sku=dic_sku,
+        dic_vehiculos=dic_vehiculos,
+        distancias_km=distancias_km,
+        capacidad_picking=1500,
+        modo_picking="greedy",
+        grupos_clientes=None,
+        horas_jornada=8,
+        stock_inicial=200,
+        punto_reorden=50,
+        lote_reposicion=100,
+        politica_reposicion="simple",
+        lead_times=0,
+        nivel_maximo=None,
+        algoritmo_transporte="greedy",
+        coordenadas_clientes=None,
+        arrastrar_backlog=False,
+        diario_inventario=None,
+        seed=None,
+    ):
+        self.dic_clientes = dic_clientes
+        self.dic_sku = dic_sku
+        self.distancias_km = distancias_km
+        self.capacidad_picking = capacidad_picking
+        self.modo_picking = modo_picking
+        self.tabla_prioridades = obtener_tabla_prioridades(grupos_clientes)
+        self.horas_jornada = horas_jornada
+        self.punto_reorden = punto_reorden
+        self.lote_reposicion = lote_reposicion
+        self.algoritmo_transporte = algoritmo_transporte
+        self.coordenadas_clientes = coordenadas_clientes
+        self.arrastrar_backlog = arrastrar_backlog
+        self.seed = seed
+
+        # Estado que se arrastra entre días
+        self.stock = LibroInventario.inicial(dic_sku, stock_inicial)
+        if diario_inventario:
+            self.stock.activar_diario(diario_inventario)
+        self.reposicion = None
+        if politica_reposicion != "simple":
+            self.reposicion = ReposicionConLeadTime(
+                self.stock.skus,
+                punto_reorden,
+                lote_reposicion,
+                nivel_maximo,
+                lead_times,
+                politica_reposicion,
+            )
+            self.reposicion.revisar(0, self.stock, self.stock.candidatos_reposicion())
+        self.backlog = ColaBacklog(self.tabla_prioridades) if arrastrar_backlog else {}
+        self.flota = dic_vehiculos
+        self.dia_actual = 0
+
+        self._hooks = {etapa: [] for etapa in ETAPAS}
+
+    def agregar_hook(self, etapa, funcion):
+        """
+        Registra una función a llamar al terminar una etapa.
+
+        Args:
+            etapa: Una de ETAPAS
+            funcion: Función f(dia, resultado_etapa)
+        """
+        if etapa not in self._hooks:
+            raise ValueError(f"Etapa desconocida: {etapa}. Opciones: {', '.join(ETAPAS)}")
+        self._hooks[etapa].append(funcion)
+
+    def _notificar(self, etapa, dia, resultado):
+        for funcion in self._hooks[etapa]:
+            funcion(dia, resultado)
+
+    def paso(self, dia, pedidos_dia):
+        """
+        Procesa un día completo a través de todas las etapas.
+
+        Args:
+            dia: Número de día
+            pedidos_dia: Pedidos del día (diccionario o LibroPedidos)
+
+        Returns:
+            Diccionario con el resultado de cada etapa del día
+        """
+        self._notificar("demanda", dia, pedidos_dia)
+
+        # Llegadas de órdenes en tránsito
+        if self.reposicion is not None:
+            self.reposicion.recibir(dia, self.stock)
+
+        # Inventario
+        self.stock, entregadas, no_entregadas, _ = reservar_y_actualizar(
+            self.stock, pedidos_dia, self.dic_clientes, registrar=False
+        )
+        inventario = {
+            "unidades_entregadas": entregadas,
+            "unidades_no_entregadas": no_entregadas,
+        }
+        self._notificar("inventario", dia, inventario)
+
+        # Reposición
+        if self.reposicion is not None:
+            log_reposicion = self.reposicion.revisar(
+                dia, self.stock, self.stock.candidatos_reposicion()
+            )
+        else:
+            self.stock, log_reposicion = reponer_simple(
+                self.stock, self.dic_sku, self.punto_reorden, self.lote_reposicion
+            )
+        self._notificar("reposicion", dia, log_reposicion)
+
+        # Picking
+        if self.arrastrar_backlog:
+            picking = asignar_picking_con_backlog(
+                dia,
+                pedidos_dia,
+                self.backlog,
+                self.capacidad_picking,
+                modo=self.modo_picking,
+            )
+        else:
+            picking = asignar_picking(
+                dia,
+                pedidos_dia,
+                self.capacidad_picking,
+                self.tabla_prioridades,
+                modo=self.modo_picking,
+            )
+        self.backlog = picking["pendientes"]
+        self._notificar("picking", dia, picking)
+
+        # Transporte
+        rutas = planificar_rutas(
+            dia,
+            picking["preparados"],
+            self.flota,
+            self.distancias_km,
+            self.dic_clientes,
+            self.algoritmo_transporte,
+            self.coordenadas_clientes,
+        )
+        self._notificar("transporte", dia, rutas)
+
+        # Indicadores
+        unidades_solicitadas = entregadas + no_entregadas
+        indicadores = calcular_indicadores(
+            len(pedidos_dia),
+            rutas["unidades_transportadas"],
+            unidades_solicitadas,
+            picking["unidades_preparadas"],
+            rutas["unidades_transportadas"],
+            picking["unidades_pendientes"],
+            rutas["utilizacion_promedio"],
+            self.horas_jornada,
+        )
+        self._notificar("indicadores", dia, indicadores)
+
+        self.stock.cerrar_dia(dia)
+        self.dia_actual = dia
+        resultado_dia = {
+            "dia": dia,
+            "pedidos": len(pedidos_dia),
+            "unidades_solicitadas": unidades_solicitadas,
+            "inventario": inventario,
+            "reposicion": log_reposicion,
+            "picking": picking,
+            "transporte": rutas,
+            "indicadores": indicadores,
+        }
+        self._notificar("dia", dia, resultado_dia)
+        return resultado_dia
+
+    def iterar(self, n_dias, pedidos=None):
+        """
+        Ejecuta la simulación día a día.
+
+        Args:
+            n_dias: Número de días a simular
+            pedidos: Demanda ya generada (opcional). Puede ser un
+                     LibroPedidos o el formato {dia: {...}}. Si no se
+                     indica, la demanda se genera día a día con iter_demanda.
+
+        Yields:
+            Resultado de cada día (ver paso)
+        """
+        if pedidos is None:
+            demanda = iter_demanda(n_dias, self.dic_clientes, self.dic_sku, seed=self.seed)
+        elif isinstance(pedidos, LibroPedidos):
+            demanda = ((dia, pedidos.vista_dia(dia)) for dia in range(1, n_dias + 1))
+        else:
+            demanda = ((dia, pedidos.get(dia, {})) for dia in range(1, n_dias + 1))
+
+        for dia, pedidos_dia in demanda:
+            yield self.paso(dia, pedidos_dia)
+
+    def ejecutar(self, n_dias, pedidos=None):
+        """
+        Ejecuta la simulación completa.
+
+        Args:
+            n_dias: Número de días a simular
+            pedidos: Demanda ya generada (opcional, ver iterar)
+
+        Returns:
+            ResultadoSimulacion
+        """
+        resultado = ResultadoSimulacion()
+        for resultado_dia in self.iterar(n_dias, pedidos):
+            resultado.registrar_dia(resultado_dia)
+        return self.cerrar_resultado(resultado)
+
+    def cerrar_resultado(self, resultado):
+        """
+        Completa el resultado con el estado final (stock, diario y backlog).
+
+        Args:
+            resultado: ResultadoSimulacion con los días ya registrados
+
+        Returns:
+            El mismo ResultadoSimulacion
+        """
+        resultado.stock_final = self.stock.a_diccionario()
+        resultado.diario_inventario = self.stock.diario
+        if self.arrastrar_backlog:
+            resultado.backlog_final = self.backlog.a_diccionario()
+        else:
+            resultado.backlog_final = self.backlog
+        return resultado
@@ -0,0 +1,329 @@
+"""
+pedidos.py - Libro de pedidos en formato columnar
+
+Guarda los pedidos como arreglos paralelos (un elemento por pedido o por
+línea) en lugar de diccionarios anidados. Las unidades por pedido se
+calculan una sola vez al construir el libro.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+def clave_id_pedido(id_pedido):
+    """
+    Clave de orden (dia, numero) de un ID "PED{dia}-{i}".
+
+    Ordenar los IDs como texto pone "PED01-1000" antes que "PED01-999";
+    esta clave da el mismo orden que los arreglos (dia, numero) del libro.
+    """
+    dia, numero = id_pedido[3:].rsplit("-", 1)
+    return int(dia), int(numero)
+
+
+class LibroPedidos:
+    """
+    Libro de pedidos columnar.
+
+    Arreglos por pedido: dia, numero, cliente, unidades.
+    Arreglos por línea: sku, cantidad.
+    inicio_lineas[i]:inicio_lineas[i + 1] son las líneas del pedido i.
+    Clientes y SKUs se guardan como índices sobre las listas `clientes`
+    y `skus`. Los pedidos están ordenados por (dia, numero).
+    """
+
+    def __init__(
+        self,
+        dia,
+        numero,
+        cliente,
+        inicio_lineas,
+        sku,
+        cantidad,
+        clientes,
+        skus,
+        unidades=None,
+    ):
+        self.dia = dia
+        self.numero = numero
+        self.cliente = cliente
+        self.inicio_lineas = inicio_lineas
+        self.sku = sku
+        self.cantidad = cantidad
+        self.clientes = clientes
+        self.skus = skus
+
+        if unidades is None:
+            acumulado = np.zeros(len(cantidad) + 1, dtype=np.int64)
+            np.cumsum(cantidad, out=acumulado[1:])
+            unidades = acumulado[inicio_lineas[1:]] - acumulado[inicio_lineas[:-1]]
+        self.unidades = unidades
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def vacio(cls, clientes, skus):
+        """Crea un libro sin pedidos"""
+        return cls(
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(1, dtype=np.int64),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.int32),
+            clientes,
+            skus,
+        )
+
+    @classmethod
+    def desde_diccionario(cls, pedidos_por_dia, dic_clientes=None, dic_sku=None):
+        """
+        Construye el libro desde el formato {dia: {"PED{dia}-{i}": {...}}}.
+
+        Args:
+            pedidos_por_dia: Pedidos en formato de diccionarios anidados
+            dic_clientes: Catálogo de clientes (opcional, fija los índices)
+            dic_sku: Catálogo de SKUs (opcional, fija los índices)
+
+        Returns:
+            LibroPedidos
+        """
+        clientes = list(dic_clientes.keys()) if dic_clientes is not None else []
+        skus = list(dic_sku.keys()) if dic_sku is not None else []
+        indice_cliente = {c: i for i, c in enumerate(clientes)}
+        indice_sku = {s: i for i, s in enumerate(skus)}
+
+        dias, numeros, ids_cliente = [], [], []
+        inicio_lineas = [0]
+        ids_sku, cantidades = [], []
+
+        for dia in sorted(pedidos_por_dia):
+            pedidos_dia = pedidos_por_dia[dia]
+            for id_pedido in sorted(pedidos_dia, key=clave_id_pedido):
+                pedido_info = pedidos_dia[id_pedido]
+                cliente = pedido_info["cliente"]
+                if cliente not in indice_cliente:
+                    indice_cliente[cliente] = len(clientes)
+                    clientes.append(cliente)
+
+                dias.append(dia)
+                numeros.append(int(id_pedido.rsplit("-", 1)[1]))
+                ids_cliente.append(indice_cliente[cliente])
+
+                for linea in pedido_info["lineas"]:
+                    sku = linea["sku"]
+                    if sku not in indice_sku:
+                        indice_sku[sku] = len(skus)
+                        skus.append(sku)
+                    ids_sku.append(indice_sku[sku])
+                    cantidades.append(linea["cantidad"])
+                inicio_lineas.append(len(cantidades))
+
+        return cls(
+            np.array(dias, dtype=np.int32),
+            np.array(numeros, dtype=np.int32),
+            np.array(ids_cliente, dtype=np.int32),
+            np.array(inicio_lineas, dtype=np.int64),
+            np.array(ids_sku, dtype=np.int32),
+            np.array(cantidades, dtype=np.int32),
+            clientes,
+            skus,
+        )
+
+    @classmethod
+    def desde_pedidos_dia(cls, dia, pedidos_dia, dic_clientes=None, dic_sku=None):
+        """Construye el libro desde los pedidos de un solo día {id: {...}}"""
+        return cls.desde_diccionario({dia: pedidos_dia}, dic_clientes, dic_sku)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.dia)
+
+    @property
+    def num_lineas(self):
+        """Número total de líneas"""
+        return len(self.sku)
+
+    def unidades_totales(self):
+        """Total de unidades del libro"""
+        return int(self.unidades.sum())
+
+    def lineas_por_pedido(self):
+        """Número de líneas de cada pedido"""
+        return np.diff(self.inicio_lineas)
+
+    def pedido_de_linea(self):
+        """Índice del pedido al que pertenece cada línea"""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lineas_por_pedido())
+
+    def dias(self):
+        """Días presentes en el libro (ordenados)"""
+        return np.unique(self.dia).tolist()
+
+    def id_pedido(self, i):
+        """ID del pedido i en formato PED{dia}-{i}"""
+        return f"PED{int(self.dia[i]):02d}-{int(self.numero[i]):03d}"
+
+    def ids(self):
+        """Lista de IDs de pedido, en el orden del libro"""
+        return [
+            f"PED{d:02d}-{n:03d}"
+            for d, n in zip(self.dia.tolist(), self.numero.tolist())
+        ]
+
+    def cliente_id(self, i):
+        """ID de cliente del pedido i"""
+        return self.clientes[self.cliente[i]]
+
+    def unidades_por_cliente(self):
+        """Unidades totales por índice de cliente"""
+        return np.bincount(
+            self.cliente, weights=self.unidades, minlength=len(self.clientes)
+        ).astype(np.int64)
+
+    def unidades_por_sku(self):
+        """Unidades totales por índice de SKU"""
+        return np.bincount(
+            self.sku, weights=self.cantidad, minlength=len(self.skus)
+        ).astype(np.int64)
+
+    # ------------------------------------------------------------------
+    # Vistas y subconjuntos
+    # ------------------------------------------------------------------
+
+    def _rango(self, inicio, fin):
+        """Sub-libro con los pedidos [inicio, fin) sin copiar las líneas"""
+        primera = self.inicio_lineas[inicio]
+        ultima = self.inicio_lineas[fin]
+        return LibroPedidos(
+            self.dia[inicio:fin],
+            self.numero[inicio:fin],
+            self.cliente[inicio:fin],
+            self.inicio_lineas[inicio : fin + 1] - primera,
+            self.sku[primera:ultima],
+            self.cantidad[primera:ultima],
+            self.clientes,
+            self.skus,
+            unidades=self.unidades[inicio:fin],
+        )
+
+    def vista_dia(self, dia):
+        """
+        Pedidos de un día.
+
+        Como el libro está ordenado por día, la vista es un corte de los
+        arreglos (no copia las líneas).
+        """
+        inicio = int(np.searchsorted(self.dia, dia, side="left"))
+        fin = int(np.searchsorted(self.dia, dia, side="right"))
+        return self._rango(inicio, fin)
+
+    def seleccionar(self, indices):
+        """
+        Sub-libro con los pedidos indicados.
+
+        Args:
+            indices: Índices de pedidos (o máscara booleana)
+
+        Returns:
+            LibroPedidos con los pedidos en su orden original
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        else:
+            indices = np.sort(indices)
+
+        inicios = self.inicio_lineas[indices]
+        largos = self.inicio_lineas[indices + 1] - inicios
+        nuevo_inicio = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(largos, out=nuevo_inicio[1:])
+        lineas = np.repeat(inicios - nuevo_inicio[:-1], largos) + np.arange(
+            nuevo_inicio[-1], dtype=np.int64
+        )
+
+        return LibroPedidos(
+            self.dia[indices],
+            self.numero[indices],
+            self.cliente[indices],
+            nuevo_inicio,
+            self.sku[lineas],
+            self.cantidad[lineas],
+            self.clientes,
+            self.skus,
+            unidades=self.unidades[indices],
+        )
+
+    # ------------------------------------------------------------------
+    # Conversión al formato de diccionarios
+    # ------------------------------------------------------------------
+
+    def pedido_info(self, i, fecha_base=None):
+        """Pedido i en el formato {"cliente": ..., "lineas": [...], ...}"""
+        if fecha_base is None:
+            fecha_base = datetime.now()
+        inicio = self.inicio_lineas[i]
+        fin = self.inicio_lineas[i + 1]
+        return {
+            "cliente": self.clientes[self.cliente[i]],
+            "lineas": [
+                {"sku": self.skus[s], "cantidad": c}
+                for s, c in zip(
+                    self.sku[inicio:fin].tolist(), self.cantidad[inicio:fin].tolist()
+                )
+            ],
+            "fecha_solicitud": fecha_base + timedelta(days=int(self.dia[i]) - 1),
+        }
+
+    def a_diccionario(self, fecha_base=None):
+        """
+        Materializa el libro como {dia: {"PED{dia}-{i}": {...}}}.
+
+        Args:
+            fecha_base: Fecha del día 1 (por defecto, ahora)
+        """
+        if fecha_base is None:
+            fecha_base = datetime.now()
+
+        clientes = self.clientes
+        skus = self.skus
+        ids_cliente = self.cliente.tolist()
+        inicio_lineas = self.inicio_lineas.tolist()
+        ids_sku = self.sku.tolist()
+        cantidades = self.cantidad.tolist()
+
+        pedidos_por_dia = {}
+        fechas = {}
+        for i, (dia, numero) in enumerate(zip(self.dia.tolist(), self.numero.tolist())):
+            if dia not in pedidos_por_dia:
+                pedidos_por_dia[dia] = {}
+                fechas[dia] = fecha_base + timedelta(days=dia - 1)
+
+            lineas = [
+                {"sku": skus[ids_sku[k]], "cantidad": cantidades[k]}
+                for k in range(inicio_lineas[i], inicio_lineas[i + 1])
+            ]
+            pedidos_por_dia[dia][f"PED{dia:02d}-{numero:03d}"] = {
+                "cliente": clientes[ids_cliente[i]],
+                "lineas": lineas,
+                "fecha_solicitud": fechas[dia],
+            }
+
+        return pedidos_por_dia
+
+    def a_pedidos_dia(self, fecha_base=None):
+        """Materializa el libro como {"PED{dia}-{i}": {...}} (sin nivel de día)"""
+        pedidos = {}
+        for pedidos_dia in self.a_diccionario(fecha_base).values():
+            pedidos.update(pedidos_dia)
+        return pedidos
+
+
+# Nombre alternativo usado en la documentación técnica
+OrderBook = LibroPedidos
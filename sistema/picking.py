@@ -2,29 +2,101 @@
 picking.py - Operaciones de preparación de pedidos (picking)
 """
 
+import heapq
 
-def prioridad_cliente(cliente_id):
+import numpy as np
+
+from .catalogos import grupos_clientes as grupos_clientes_catalogo
+from .pedidos import LibroPedidos, clave_id_pedido
+
+
+class TablaPrioridades:
+    """
+    Prioridad de cada cliente resuelta una sola vez desde los grupos de
+    clientes (ver catalogos.grupos_clientes).
+
+    Los clientes que no pertenecen a ningún grupo reciben la prioridad del
+    grupo de menor prioridad (número más alto).
+    """
+    
+    def __init__(self, grupos_clientes):
+        self.por_cliente = {}
+        for nombre_grupo, grupo in grupos_clientes.items():
+            for cliente_id in grupo["ids"]:
+                self.por_cliente[cliente_id] = (grupo["prioridad"], nombre_grupo)
+        
+        if grupos_clientes:
+            nombre_defecto, grupo_defecto = max(
+                grupos_clientes.items(), key=lambda x: x[1]["prioridad"]
+            )
+            self.defecto = (grupo_defecto["prioridad"], nombre_defecto)
+        else:
+            self.defecto = (1, "otros")
+        
+        self._clientes_indexados = None
+        self._arreglo = None
+    
+    def prioridad(self, cliente_id):
+        """Tupla (prioridad_numerica, nombre_grupo) del cliente"""
+        return self.por_cliente.get(cliente_id, self.defecto)
+    
+    def arreglo(self, clientes):
+        """
+        Prioridad por índice de cliente, para indexar LibroPedidos.cliente.
+        Se guarda para la última lista de clientes consultada.
+        """
+        if self._clientes_indexados is not clientes or len(self._arreglo) != len(clientes):
+            self._arreglo = np.array(
+                [self.prioridad(c)[0] for c in clientes], dtype=np.int16
+            )
+            self._clientes_indexados = clientes
+        return self._arreglo
+
+
+_tabla_por_defecto = None
+
+
+def obtener_tabla_prioridades(grupos_clientes=None):
+    """
+    Devuelve la tabla de prioridades.
+    
+    Args:
+        grupos_clientes: Grupos {nombre: {"ids": [...], "prioridad": n}}
+                         (por defecto, catalogos.grupos_clientes; esa tabla
+                         se construye una sola vez)
+    
+    Returns:
+        TablaPrioridades
     """
-    Determina la prioridad del cliente.
+    global _tabla_por_defecto
+    if grupos_clientes is not None:
+        return TablaPrioridades(grupos_clientes)
+    if _tabla_por_defecto is None:
+        _tabla_por_defecto = TablaPrioridades(grupos_clientes_catalogo)
+    return _tabla_por_defecto
+
+
+def prioridad_cliente(cliente_id, grupos_clientes=None):
+    """
+    Determina la prioridad del cliente (menor número = mayor prioridad).
     1. Clientes mineros (CL01-CL05): Mayor prioridad
     2. Distribuidores y otros: Menor prioridad
     
     Args:
         cliente_id: ID del cliente
+        grupos_clientes: Grupos de prioridad (por defecto, los del catálogo)
     
     Returns:
         Tupla (prioridad_numerica, nombre_grupo)
     """
-    if cliente_id in ["CL01", "CL02", "CL03", "CL04", "CL05"]:
-        return (1, "Minero")
-    elif cliente_id in ["CL06", "CL07", "CL08"]:
-        return (2, "Distribuidor")
-    else:
-        return (3, "Otros")
+    return obtener_tabla_prioridades(grupos_clientes).prioridad(cliente_id)
 
 
 def contar_unidades_pedidos(pedidos_dia):
     """Cuenta total de unidades en los pedidos"""
+    if isinstance(pedidos_dia, LibroPedidos):
+        return pedidos_dia.unidades_totales()
+
     total = 0
     for pedido_info in pedidos_dia.values():
         for linea in pedido_info["lineas"]:
@@ -32,18 +104,134 @@ def contar_unidades_pedidos(pedidos_dia):
     return total
 
 
-def asignar_picking(dia, pedidos_dia, capacidad_diaria=1500):
+MODOS_PICKING = ("greedy", "mochila")
+
+# Celdas máximas (pedidos × capacidad) de la tabla exacta de la mochila;
+# por encima se escala la capacidad y se resuelve una versión aproximada
+MAX_CELDAS_MOCHILA = 2_000_000
+
+# Pedidos del backlog (los primeros de la cola) que considera la mochila
+# cada día
+MAX_CANDIDATOS_MOCHILA = 1000
+
+
+def _valores_prioridad(prioridad):
+    """Peso de cada pedido según prioridad: la mejor prioridad pesa más"""
+    if len(prioridad) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return (int(prioridad.max()) + 1 - prioridad).astype(np.int64)
+
+
+def _seleccion_mochila(unidades, prioridad, capacidad, max_celdas=MAX_CELDAS_MOCHILA):
+    """
+    Elige los pedidos a preparar maximizando unidades ponderadas por
+    prioridad sin superar la capacidad (mochila 0/1).
+    
+    La tabla se recorre pedido a pedido con operaciones NumPy sobre todo
+    el eje de capacidad y se guardan solo los bits de decisión. Si la tabla
+    superaría max_celdas, las unidades se dividen por un factor (redondeo
+    hacia arriba, así la selección siempre cabe), la capacidad sobrante
+    se completa en orden de prioridad y, si aun así la selección greedy
+    vale más, se devuelve esa: el resultado nunca es peor que greedy.
+    
+    Args:
+        unidades: Unidades de cada pedido, en orden (prioridad, dia, numero)
+        prioridad: Prioridad numérica de cada pedido
+        capacidad: Capacidad de picking en unidades
+        max_celdas: Tamaño máximo de la tabla exacta
+    
+    Returns:
+        Máscara booleana de pedidos seleccionados
+    """
+    unidades = np.asarray(unidades, dtype=np.int64)
+    n = len(unidades)
+    seleccion = np.zeros(n, dtype=bool)
+    capacidad = int(capacidad)
+    if n == 0 or capacidad <= 0:
+        seleccion[unidades == 0] = True
+        return seleccion
+    
+    valores = unidades * _valores_prioridad(prioridad)
+    factor = max(1, -(-n * (capacidad + 1) // max_celdas))
+    pesos = -(-unidades // factor)
+    capacidad_escalada = capacidad // factor
+    
+    candidatos = np.flatnonzero(pesos <= capacidad_escalada)
+    mejor = np.zeros(capacidad_escalada + 1, dtype=np.int64)
+    decision = np.zeros((len(candidatos), capacidad_escalada + 1), dtype=bool)
+    
+    for k, i in enumerate(candidatos.tolist()):
+        peso = int(pesos[i])
+        valor = int(valores[i])
+        if peso == 0:
+            mejor += valor
+            decision[k, :] = True
+            continue
+        con_pedido = mejor[:-peso] + valor
+        toma = con_pedido > mejor[peso:]
+        decision[k, peso:] = toma
+        mejor[peso:] = np.where(toma, con_pedido, mejor[peso:])
+    
+    # Reconstrucción desde el último pedido
+    restante = capacidad_escalada
+    for k in range(len(candidatos) - 1, -1, -1):
+        if decision[k, restante]:
+            i = candidatos[k]
+            seleccion[i] = True
+            restante -= int(pesos[i])
+    
+    if factor > 1:
+        # Completar con lo que quepa de la capacidad real sobrante
+        usada = int(unidades[seleccion].sum())
+        for i in np.flatnonzero(~seleccion).tolist():
+            if usada + unidades[i] <= capacidad:
+                seleccion[i] = True
+                usada += int(unidades[i])
+        # La versión escalada no garantiza el óptimo: nunca devolver algo
+        # peor que la selección greedy en el mismo orden
+        greedy = _seleccion_greedy(unidades, capacidad)
+        if int(valores[greedy].sum()) > int(valores[seleccion].sum()):
+            return greedy
+    return seleccion
+
+
+def _seleccion_greedy(unidades, capacidad):
+    """
+    Recorre los pedidos en orden y toma los que caben en la capacidad.
+    
+    Args:
+        unidades: Unidades de cada pedido, en orden (prioridad, dia, numero)
+        capacidad: Capacidad de picking en unidades
+    
+    Returns:
+        Máscara booleana de pedidos seleccionados
+    """
+    seleccion = np.zeros(len(unidades), dtype=bool)
+    usada = 0
+    for i, unidades_pedido in enumerate(np.asarray(unidades).tolist()):
+        if usada + unidades_pedido <= capacidad:
+            seleccion[i] = True
+            usada += unidades_pedido
+    return seleccion
+
+
+def asignar_picking(dia, pedidos_dia, capacidad_diaria=1500, tabla_prioridades=None,
+                    modo="greedy"):
     """
     Asigna picking a pedidos según prioridad y capacidad.
     
     Args:
         dia: Número de día
-        pedidos_dia: Diccionario de pedidos del día
+        pedidos_dia: Diccionario de pedidos del día (o LibroPedidos)
         capacidad_diaria: Capacidad de picking en unidades
+        tabla_prioridades: TablaPrioridades (por defecto, la del catálogo)
+        modo: "greedy" recorre los pedidos por prioridad y salta los que no
+              caben; "mochila" elige el conjunto que maximiza las unidades
+              ponderadas por prioridad dentro de la capacidad
     
     Returns:
         Diccionario con: {
-            "preparados": {...},
+            "preparados": {...},   (LibroPedidos si la entrada es un libro)
             "pendientes": {...},
             "unidades_preparadas": n,
             "unidades_pendientes": m,
@@ -51,18 +239,54 @@ def asignar_picking(dia, pedidos_dia, capacidad_diaria=1500):
             "capacidad_usada": used
         }
     """
-    
-    # Ordenar pedidos por prioridad de cliente
-    pedidos_ordenados = sorted(
-        pedidos_dia.items(),
-        key=lambda x: (prioridad_cliente(x[1]["cliente"])[0], x[0])
-    )
+    if modo not in MODOS_PICKING:
+        raise ValueError(
+            f"Modo de picking desconocido: {modo}. Opciones: {', '.join(MODOS_PICKING)}"
+        )
+    if tabla_prioridades is None:
+        tabla_prioridades = obtener_tabla_prioridades()
+    if isinstance(pedidos_dia, LibroPedidos):
+        return _asignar_picking_libro(
+            dia, pedidos_dia, capacidad_diaria, tabla_prioridades, modo
+        )
+
+    # Ordenar pedidos por (prioridad, dia, numero) (un cubo por prioridad)
+    cubos = {}
+    for id_pedido, pedido_info in pedidos_dia.items():
+        prioridad = tabla_prioridades.prioridad(pedido_info["cliente"])[0]
+        cubos.setdefault(prioridad, []).append(id_pedido)
+    pedidos_ordenados = [
+        (id_pedido, pedidos_dia[id_pedido])
+        for prioridad in sorted(cubos)
+        for id_pedido in sorted(cubos[prioridad], key=clave_id_pedido)
+    ]
     
     preparados = {}
     pendientes = {}
     unidades_preparadas = 0
     unidades_pendientes = 0
     
+    if modo == "mochila":
+        unidades = [
+            sum(linea["cantidad"] for linea in pedido_info["lineas"])
+            for _, pedido_info in pedidos_ordenados
+        ]
+        prioridades = np.array(
+            [tabla_prioridades.prioridad(p["cliente"])[0] for _, p in pedidos_ordenados],
+            dtype=np.int64,
+        )
+        seleccion = _seleccion_mochila(unidades, prioridades, capacidad_diaria).tolist()
+        for (id_pedido, pedido_info), unidades_pedido, elegido in zip(
+            pedidos_ordenados, unidades, seleccion
+        ):
+            if elegido:
+                preparados[id_pedido] = pedido_info
+                unidades_preparadas += unidades_pedido
+            else:
+                pendientes[id_pedido] = pedido_info
+                unidades_pendientes += unidades_pedido
+        pedidos_ordenados = []
+    
     for id_pedido, pedido_info in pedidos_ordenados:
         unidades_pedido = sum(linea["cantidad"] for linea in pedido_info["lineas"])
         
@@ -88,6 +312,226 @@ def asignar_picking(dia, pedidos_dia, capacidad_diaria=1500):
     }
 
 
+def _asignar_picking_libro(dia, libro, capacidad_diaria, tabla_prioridades, modo="greedy"):
+    """Versión de asignar_picking sobre los arreglos de un LibroPedidos"""
+    prioridad = tabla_prioridades.arreglo(libro.clientes)[libro.cliente]
+    # El libro ya está en orden (dia, numero): un ordenamiento estable por
+    # prioridad (radix sobre enteros pequeños) da el orden (prioridad, dia, numero)
+    orden = np.argsort(prioridad, kind="stable")
+
+    preparado = np.zeros(len(libro), dtype=bool)
+
+    if modo == "mochila":
+        seleccion = _seleccion_mochila(
+            libro.unidades[orden], prioridad[orden], capacidad_diaria
+        )
+        preparado[orden[seleccion]] = True
+        unidades_preparadas = int(libro.unidades[preparado].sum())
+        unidades_pendientes = int(libro.unidades[~preparado].sum())
+    else:
+        seleccion = _seleccion_greedy(libro.unidades[orden], capacidad_diaria)
+        preparado[orden[seleccion]] = True
+        unidades_preparadas = int(libro.unidades[preparado].sum())
+        unidades_pendientes = int(libro.unidades[~preparado].sum())
+
+    preparados = libro.seleccionar(preparado)
+    pendientes = libro.seleccionar(~preparado)
+
+    return {
+        "dia": dia,
+        "preparados": preparados,
+        "pendientes": pendientes,
+        "unidades_preparadas": unidades_preparadas,
+        "unidades_pendientes": unidades_pendientes,
+        "capacidad_disponible": capacidad_diaria,
+        "capacidad_usada": unidades_preparadas,
+        "num_pedidos_preparados": len(preparados),
+        "num_pedidos_pendientes": len(pendientes)
+    }
+
+
+class ColaBacklog:
+    """
+    Backlog de picking que se arrastra entre días.
+
+    Montículo (heap) ordenado por (prioridad, día de ingreso, número de pedido):
+    primero los clientes de mayor prioridad y, dentro de la misma
+    prioridad, los pedidos más antiguos. Agregar y extraer un pedido
+    cuesta O(log n), así que el backlog no se reordena completo cada día.
+    """
+    
+    def __init__(self, tabla_prioridades=None):
+        if tabla_prioridades is None:
+            tabla_prioridades = obtener_tabla_prioridades()
+        self.tabla_prioridades = tabla_prioridades
+        self._monticulo = []
+        self._pedidos = {}
+        self.unidades = 0
+    
+    def __len__(self):
+        return len(self._monticulo)
+    
+    def __contains__(self, id_pedido):
+        return id_pedido in self._pedidos
+    
+    def agregar(self, id_pedido, pedido_info, dia_ingreso):
+        """Encola un pedido"""
+        prioridad = self.tabla_prioridades.prioridad(pedido_info["cliente"])[0]
+        unidades_pedido = sum(linea["cantidad"] for linea in pedido_info["lineas"])
+        heapq.heappush(
+            self._monticulo,
+            (prioridad, dia_ingreso, clave_id_pedido(id_pedido), id_pedido, unidades_pedido),
+        )
+        self._pedidos[id_pedido] = pedido_info
+        self.unidades += unidades_pedido
+    
+    def agregar_pedidos(self, dia, pedidos_dia):
+        """Encola los pedidos de un día (diccionario o LibroPedidos)"""
+        if isinstance(pedidos_dia, LibroPedidos):
+            pedidos_dia = pedidos_dia.a_pedidos_dia()
+        for id_pedido, pedido_info in pedidos_dia.items():
+            self.agregar(id_pedido, pedido_info, dia)
+    
+    def extraer_hasta(self, capacidad, max_omitidos=None):
+        """
+        Extrae pedidos en orden de la cola mientras quepan en la capacidad.
+        
+        Los pedidos que no caben se saltan (igual que asignar_picking) y
+        vuelven a la cola.
+        
+        Args:
+            capacidad: Unidades disponibles
+            max_omitidos: Pedidos que no caben a revisar antes de detenerse
+                          (None revisa toda la cola)
+        
+        Returns:
+            Tupla (pedidos_extraidos {id: info}, unidades_extraidas)
+        """
+        extraidos = {}
+        omitidos = []
+        usada = 0
+        while self._monticulo and usada < capacidad:
+            if max_omitidos is not None and len(omitidos) >= max_omitidos:
+                break
+            entrada = heapq.heappop(self._monticulo)
+            unidades_pedido = entrada[4]
+            if usada + unidades_pedido <= capacidad:
+                extraidos[entrada[3]] = self._pedidos.pop(entrada[3])
+                usada += unidades_pedido
+            else:
+                omitidos.append(entrada)
+        
+        for entrada in omitidos:
+            heapq.heappush(self._monticulo, entrada)
+        self.unidades -= usada
+        return extraidos, usada
+    
+    def extraer_mochila(self, capacidad, max_candidatos=MAX_CANDIDATOS_MOCHILA):
+        """
+        Extrae el conjunto de pedidos que maximiza las unidades ponderadas
+        por prioridad dentro de la capacidad (ver asignar_picking, modo
+        "mochila").
+        
+        Solo se consideran los primeros max_candidatos pedidos de la cola
+        (los de mejor prioridad y más antiguos), que se sacan del montículo
+        en orden: O(k log n) por llamada en lugar de reordenar toda la cola.
+        Los no elegidos vuelven al montículo.
+        
+        Args:
+            capacidad: Unidades disponibles
+            max_candidatos: Pedidos a considerar (None considera toda la cola)
+        
+        Returns:
+            Tupla (pedidos_extraidos {id: info}, unidades_extraidas)
+        """
+        if max_candidatos is None or max_candidatos >= len(self._monticulo):
+            entradas = sorted(self._monticulo)
+            self._monticulo = []
+        else:
+            entradas = [heapq.heappop(self._monticulo) for _ in range(max_candidatos)]
+        seleccion = _seleccion_mochila(
+            np.array([e[4] for e in entradas], dtype=np.int64),
+            np.array([e[0] for e in entradas], dtype=np.int64),
+            capacidad,
+        ).tolist()
+        
+        extraidos = {}
+        usada = 0
+        for entrada, elegido in zip(entradas, seleccion):
+            if elegido:
+                extraidos[entrada[3]] = self._pedidos.pop(entrada[3])
+                usada += entrada[4]
+            else:
+                heapq.heappush(self._monticulo, entrada)
+        self.unidades -= usada
+        return extraidos, usada
+    
+    def a_diccionario(self):
+        """Pedidos pendientes {id: info} en el orden de la cola"""
+        return {
+            entrada[3]: self._pedidos[entrada[3]]
+            for entrada in sorted(self._monticulo)
+        }
+
+
+def asignar_picking_con_backlog(
+    dia,
+    pedidos_dia,
+    cola,
+    capacidad_diaria=1500,
+    max_omitidos=None,
+    modo="greedy",
+    max_candidatos=MAX_CANDIDATOS_MOCHILA,
+):
+    """
+    Asigna picking atendiendo primero el backlog arrastrado de días previos.
+    
+    Los pedidos del día se encolan en `cola` junto con los pendientes
+    anteriores; lo que no se prepara queda en la cola para el día siguiente.
+    
+    Args:
+        dia: Número de día
+        pedidos_dia: Pedidos del día (diccionario o LibroPedidos)
+        cola: ColaBacklog que se conserva entre días
+        capacidad_diaria: Capacidad de picking en unidades
+        max_omitidos: Pedidos que no caben a revisar antes de cerrar el día
+                      (None, por defecto, revisa todo el backlog como
+                      asignar_picking; solo modo "greedy")
+        modo: "greedy" o "mochila" (ver asignar_picking)
+        max_candidatos: Primeros pedidos de la cola que considera el modo
+                        "mochila" (None considera todo el backlog)
+    
+    Returns:
+        Diccionario con el mismo formato que asignar_picking; "pendientes"
+        es la propia ColaBacklog
+    """
+    if modo not in MODOS_PICKING:
+        raise ValueError(
+            f"Modo de picking desconocido: {modo}. Opciones: {', '.join(MODOS_PICKING)}"
+        )
+    cola.agregar_pedidos(dia, pedidos_dia)
+    if modo == "mochila":
+        preparados, unidades_preparadas = cola.extraer_mochila(
+            capacidad_diaria, max_candidatos
+        )
+    else:
+        preparados, unidades_preparadas = cola.extraer_hasta(
+            capacidad_diaria, max_omitidos
+        )
+    
+    return {
+        "dia": dia,
+        "preparados": preparados,
+        "pendientes": cola,
+        "unidades_preparadas": unidades_preparadas,
+        "unidades_pendientes": cola.unidades,
+        "capacidad_disponible": capacidad_diaria,
+        "capacidad_usada": unidades_preparadas,
+        "num_pedidos_preparados": len(preparados),
+        "num_pedidos_pendientes": len(cola)
+    }
+
+
 def calcular_productividad_picking(unidades_preparadas, horas_jornada=8):
     """
     Calcula productividad en unidades por hora.
@@ -0,0 +1,161 @@
+"""
+reposicion.py - Reposición con lead time y pedidos en tránsito
+
+A diferencia de reponer_simple, las órdenes de compra no llegan al
+instante: cada SKU tiene su lead time en días y las órdenes quedan en
+tránsito en un calendario {dia_llegada: órdenes}. La decisión de pedir se
+toma sobre la posición de inventario (stock + en tránsito), con política
+(s,S) o (R,Q).
+"""
+
+import numpy as np
+
+from .inventario import TIPO_REPOSICION
+
+
+POLITICAS_REPOSICION = ("sS", "RQ")
+
+
+class ReposicionConLeadTime:
+    """
+    Motor de reposición sobre un LibroInventario.
+
+    Políticas (s = punto_reorden):
+      - "sS": si posición < s, pedir hasta llegar a S (nivel_maximo).
+      - "RQ": si posición < s, pedir el menor múltiplo de Q (lote) que
+        deja la posición en s o más.
+
+    Tras pedir, la posición queda en s o más y solo vuelve a bajar con
+    demanda, así que basta revisar los SKUs que se movieron en el día
+    (LibroInventario.candidatos_reposicion). Las llegadas se sacan del
+    calendario por día: el costo diario es proporcional a las órdenes que
+    llegan, no al catálogo.
+    """
+
+    def __init__(
+        self,
+        skus,
+        punto_reorden=50,
+        lote=100,
+        nivel_maximo=None,
+        lead_times=0,
+        politica="RQ",
+    ):
+        """
+        Args:
+            skus: Lista de SKUs (en el orden de LibroInventario.skus)
+            punto_reorden: s, común o {sku: s}
+            lote: Q de la política (R,Q), común o {sku: Q}
+            nivel_maximo: S de la política (s,S), común o {sku: S}
+                          (por defecto, s + Q)
+            lead_times: Días entre la orden y la llegada, común o {sku: días}
+            politica: "sS" o "RQ"
+        """
+        if politica not in POLITICAS_REPOSICION:
+            raise ValueError(
+                f"Política desconocida: {politica}. "
+                f"Opciones: {', '.join(POLITICAS_REPOSICION)}"
+            )
+        self.skus = list(skus)
+        self.politica = politica
+        self.punto_reorden = self._por_sku(punto_reorden)
+        self.lote = self._por_sku(lote)
+        if nivel_maximo is None:
+            self.nivel_maximo = self.punto_reorden + self.lote
+        else:
+            self.nivel_maximo = self._por_sku(nivel_maximo)
+        self.lead_times = self._por_sku(lead_times)
+
+        self.en_transito = np.zeros(len(self.skus), dtype=np.int64)
+        # {dia_llegada: [(indices_sku, cantidades), ...]}
+        self.calendario = {}
+
+    def _por_sku(self, valor):
+        """Arreglo por SKU desde un valor común o un diccionario {sku: valor}"""
+        if isinstance(valor, dict):
+            return np.array([valor.get(sku, 0) for sku in self.skus], dtype=np.int64)
+        return np.full(len(self.skus), valor, dtype=np.int64)
+
+    def recibir(self, dia, stock):
+        """
+        Ingresa al stock las órdenes que llegan en el día.
+
+        Args:
+            dia: Número de día
+            stock: LibroInventario (se actualiza en el lugar)
+
+        Returns:
+            Unidades recibidas
+        """
+        recibidas = 0
+        for indices, cantidades in self.calendario.pop(dia, []):
+            np.add.at(stock.cantidad, indices, cantidades)
+            np.subtract.at(self.en_transito, indices, cantidades)
+            if stock.diario is not None:
+                stock.diario.registrar(TIPO_REPOSICION, indices, cantidades)
+            recibidas += int(cantidades.sum())
+        return recibidas
+
+    def revisar(self, dia, stock, candidatos=None):
+        """
+        Emite órdenes para los SKUs cuya posición de inventario cayó bajo s.
+
+        Args:
+            dia: Número de día
+            stock: LibroInventario
+            candidatos: Índices de SKU a revisar (por defecto, todos)
+
+        Returns:
+            Log de órdenes emitidas: [{"sku", "posicion_anterior",
+            "cantidad_pedida", "dia_llegada"}]
+        """
+        if candidatos is None:
+            candidatos = np.arange(len(self.skus))
+        candidatos = np.asarray(candidatos, dtype=np.int64)
+
+        posicion = stock.cantidad[candidatos] + self.en_transito[candidatos]
+        bajo = posicion < self.punto_reorden[candidatos]
+        indices = candidatos[bajo]
+        posicion = posicion[bajo]
+        if len(indices) == 0:
+            return []
+
+        if self.politica == "sS":
+            cantidades = self.nivel_maximo[indices] - posicion
+        else:
+            lote = np.maximum(self.lote[indices], 1)
+            faltante = self.punto_reorden[indices] - posicion
+            cantidades = -(-faltante // lote) * lote
+
+        llegada = dia + self.lead_times[indices]
+        inmediatas = llegada <= dia
+        if inmediatas.any():
+            stock.cantidad[indices[inmediatas]] += cantidades[inmediatas]
+            if stock.diario is not None:
+                stock.diario.registrar(
+                    TIPO_REPOSICION, indices[inmediatas], cantidades[inmediatas]
+                )
+        en_camino = ~inmediatas
+        if en_camino.any():
+            self.en_transito[indices[en_camino]] += cantidades[en_camino]
+            for dia_llegada in np.unique(llegada[en_camino]).tolist():
+                del_dia = en_camino & (llegada == dia_llegada)
+                self.calendario.setdefault(dia_llegada, []).append(
+                    (indices[del_dia], cantidades[del_dia])
+                )
+
+        return [
+            {
+                "sku": self.skus[i],
+                "posicion_anterior": p,
+                "cantidad_pedida": q,
+                "dia_llegada": d,
+            }
+            for i, p, q, d in zip(
+                indices.tolist(), posicion.tolist(), cantidades.tolist(), llegada.tolist()
+            )
+        ]
+
+    def unidades_en_transito(self):
+        """Total de unidades pedidas que aún no llegan"""
+        return int(self.en_transito.sum())
@@ -2,17 +2,35 @@
 transporte.py - Planificación de rutas y asignación de vehículos
 """
 
+from functools import lru_cache
+
+import numpy as np
+
+from .catalogos import coordenadas_almacen, coordenadas_clientes
+from .pedidos import LibroPedidos
+
 
 def agrupar_pedidos_por_cliente(pedidos_preparados):
     """
     Agrupa pedidos preparados por cliente.
 
     Args:
-        pedidos_preparados: Diccionario de pedidos preparados
+        pedidos_preparados: Diccionario de pedidos preparados (o LibroPedidos)
 
     Returns:
         Diccionario {cliente_id: {pedido_id: pedido_info}}
+        ({cliente_id: LibroPedidos} si la entrada es un libro)
     """
+    if isinstance(pedidos_preparados, LibroPedidos):
+        libro = pedidos_preparados
+        orden = np.argsort(libro.cliente, kind="stable")
+        cortes = np.flatnonzero(np.diff(libro.cliente[orden])) + 1
+        return {
+            libro.clientes[int(libro.cliente[grupo[0]])]: libro.seleccionar(grupo)
+            for grupo in np.split(orden, cortes)
+            if len(grupo)
+        }
+
     agrupados = {}
     for id_pedido, pedido_info in pedidos_preparados.items():
         cliente_id = pedido_info["cliente"]
@@ -24,6 +42,9 @@ def agrupar_pedidos_por_cliente(pedidos_preparados):
 
 def contar_unidades_grupo(grupo_pedidos):
     """Cuenta unidades en un grupo de pedidos"""
+    if isinstance(grupo_pedidos, LibroPedidos):
+        return grupo_pedidos.unidades_totales()
+
     total = 0
     for pedido_info in grupo_pedidos.values():
         for linea in pedido_info["lineas"]:
@@ -31,6 +52,57 @@ def contar_unidades_grupo(grupo_pedidos):
     return total
 
 
+def _ids_pedidos(grupo_pedidos):
+    """Lista de IDs de un grupo de pedidos (diccionario o LibroPedidos)"""
+    if isinstance(grupo_pedidos, LibroPedidos):
+        return grupo_pedidos.ids()
+    return list(grupo_pedidos.keys())
+
+
+def _unidades_pedidos(grupo_pedidos):
+    """Lista de (id_pedido, unidades) de un grupo, en su orden"""
+    if isinstance(grupo_pedidos, LibroPedidos):
+        return list(zip(grupo_pedidos.ids(), grupo_pedidos.unidades.tolist()))
+    return [
+        (id_pedido, sum(linea["cantidad"] for linea in pedido_info["lineas"]))
+        for id_pedido, pedido_info in grupo_pedidos.items()
+    ]
+
+
+def _repartir_pedidos(pedidos, cargas):
+    """
+    Reparte pedidos enteros, en orden, entre viajes con cargas dadas.
+
+    Cada pedido figura en "pedidos" del viaje donde empieza; si no entra
+    completo, los viajes siguientes que llevan el resto lo listan en
+    "continuacion_de". Así cada pedido se cuenta en un solo viaje.
+
+    Args:
+        pedidos: Lista de (id_pedido, unidades) que suma lo mismo que cargas
+        cargas: Unidades de cada viaje
+
+    Returns:
+        Lista de tuplas (ids_pedidos, ids_continuados), una por viaje
+    """
+    viajes = [([], []) for _ in cargas]
+    t = 0
+    libre = cargas[0] if cargas else 0
+    for id_pedido, unidades in pedidos:
+        primero = True
+        while unidades > 0 and t < len(cargas):
+            if libre == 0:
+                t += 1
+                if t == len(cargas):
+                    break
+                libre = cargas[t]
+            viajes[t][0 if primero else 1].append(id_pedido)
+            primero = False
+            llevadas = min(unidades, libre)
+            unidades -= llevadas
+            libre -= llevadas
+    return viajes
+
+
 def asignar_vehiculos_greedy(
     grupos_por_cliente, vehiculos, distancias_km, dic_clientes
 ):
@@ -78,7 +150,7 @@ def asignar_vehiculos_greedy(
                         "distancia_km": distancia,
                         "costo_km": vehiculo_info["costo_km"],
                         "costo_total": costo_ruta,
-                        "pedidos": list(grupo_pedidos.keys()),
+                        "pedidos": _ids_pedidos(grupo_pedidos),
                     }
                 )
 
@@ -92,20 +164,529 @@ def asignar_vehiculos_greedy(
     return rutas_asignadas, no_asignadas, costo_total
 
 
-def planificar_rutas(dia, pedidos_preparados, vehiculos, distancias_km, dic_clientes):
+def _crear_ruta(
+    vehiculo_id, vehiculo_info, unidades, cliente_nombre, distancia, pedidos,
+    continuacion_de=(),
+):
+    """
+    Diccionario de una ruta (viaje ida y vuelta a un cliente).
+
+    "pedidos" son los pedidos que el viaje cuenta como propios y
+    "continuacion_de" los que lleva en parte porque empezaron en otro viaje.
+    """
+    costo_ruta = distancia * vehiculo_info["costo_km"]
+    return {
+        "vehiculo": vehiculo_id,
+        "cliente": cliente_nombre,
+        "unidades": unidades,
+        "capacidad": vehiculo_info["capacidad"],
+        "utilizacion": (unidades / vehiculo_info["capacidad"]) * 100,
+        "distancia_km": distancia,
+        "costo_km": vehiculo_info["costo_km"],
+        "costo_total": costo_ruta,
+        "pedidos": list(pedidos),
+        "continuacion_de": list(continuacion_de),
+    }
+
+
+def _dividir_first_fit(pedidos, flota):
+    """
+    Reparte los pedidos de un cliente en viajes con first-fit decreasing.
+
+    Los pedidos se recorren de mayor a menor y cada uno va al primer viaje
+    abierto donde cabe; si no cabe en ninguno se abre otro viaje del
+    vehículo más grande. Un pedido mayor que ese vehículo se divide antes
+    en viajes completos. Al final cada viaje pasa al vehículo más chico
+    (y más barato) que admite su carga.
+
+    Args:
+        pedidos: Lista de (id_pedido, unidades) del cliente
+        flota: Tupla ((vehiculo_id, capacidad, costo_km), ...) ordenada por capacidad
+
+    Returns:
+        Lista de (vehiculo_id, unidades_viaje, ids_pedidos, ids_continuados)
+    """
+    capacidad_maxima = flota[-1][1]
+    completos = []
+    cargas, contenidos = [], []
+    for id_pedido, unidades in sorted(pedidos, key=lambda p: p[1], reverse=True):
+        continuado = False
+        while unidades > capacidad_maxima:
+            if continuado:
+                completos.append((capacidad_maxima, [], [id_pedido]))
+            else:
+                completos.append((capacidad_maxima, [id_pedido], []))
+            continuado = True
+            unidades -= capacidad_maxima
+        if unidades <= 0:
+            continue
+        for k, carga in enumerate(cargas):
+            if carga + unidades <= capacidad_maxima:
+                break
+        else:
+            k = len(cargas)
+            cargas.append(0)
+            contenidos.append(([], []))
+        cargas[k] += unidades
+        contenidos[k][1 if continuado else 0].append(id_pedido)
+
+    viajes = []
+    for carga, ids, continuados in completos + [
+        (carga, ids, continuados) for carga, (ids, continuados) in zip(cargas, contenidos)
+    ]:
+        vehiculo_id = next(v for v, capacidad, _ in flota if capacidad >= carga)
+        viajes.append((vehiculo_id, carga, ids, continuados))
+    return viajes
+
+
+@lru_cache(maxsize=32)
+def _tabla_costo_minimo(flota):
+    """
+    Tabla de programación dinámica: menor suma de costo_km para cubrir
+    u unidades (0 <= u <= 4 * mayor capacidad) con viajes de la flota.
+
+    Se calcula una vez por composición de flota y queda en caché.
+
+    Returns:
+        Tupla (limite, eleccion) donde eleccion[u] es el índice del vehículo
+        del primer viaje de la combinación óptima para u unidades
+    """
+    limite = 4 * flota[-1][1]
+    costo = [0.0] + [float("inf")] * limite
+    eleccion = [-1] * (limite + 1)
+    for u in range(1, limite + 1):
+        for k, (_, capacidad, costo_km) in enumerate(flota):
+            candidato = costo_km + costo[max(0, u - capacidad)]
+            if candidato < costo[u]:
+                costo[u] = candidato
+                eleccion[u] = k
+    return limite, eleccion
+
+
+def _dividir_optimo(pedidos, flota):
+    """
+    Divide una carga en viajes minimizando la suma de costo_km.
+
+    Hasta 4 veces la mayor capacidad la división es exacta (tabla de
+    _tabla_costo_minimo); por encima se agregan primero viajes completos
+    del vehículo con menor costo por unidad de capacidad. Los pedidos se
+    reparten después entre los viajes (ver _repartir_pedidos).
+
+    Args:
+        pedidos: Lista de (id_pedido, unidades) del cliente
+        flota: Tupla ((vehiculo_id, capacidad, costo_km), ...) ordenada por capacidad
+
+    Returns:
+        Lista de (vehiculo_id, unidades_viaje, ids_pedidos, ids_continuados)
+    """
+    unidades = sum(u for _, u in pedidos)
+    limite, eleccion = _tabla_costo_minimo(flota)
+    mas_eficiente = min(flota, key=lambda v: v[2] / v[1])
+
+    vehiculos = []
+    while unidades > limite:
+        vehiculos.append(mas_eficiente)
+        unidades -= mas_eficiente[1]
+    while unidades > 0:
+        vehiculo = flota[eleccion[unidades]]
+        vehiculos.append(vehiculo)
+        unidades -= vehiculo[1]
+
+    # Repartir la carga llenando primero los vehículos más grandes
+    vehiculos.sort(key=lambda v: v[1], reverse=True)
+    restante = sum(v[1] for v in vehiculos) + unidades
+    viajes = []
+    for vehiculo_id, capacidad, _ in vehiculos:
+        carga = min(capacidad, restante)
+        viajes.append((vehiculo_id, carga))
+        restante -= carga
+    ordenados = sorted(pedidos, key=lambda p: p[1], reverse=True)
+    repartidos = _repartir_pedidos(ordenados, [carga for _, carga in viajes])
+    return [
+        (vehiculo_id, carga, ids, continuados)
+        for (vehiculo_id, carga), (ids, continuados) in zip(viajes, repartidos)
+    ]
+
+
+def _asignar_vehiculos_dividiendo(
+    grupos_por_cliente, vehiculos, distancias_km, dic_clientes, dividir
+):
+    """
+    Asigna vehículos repartiendo la carga de cada cliente en varios viajes.
+
+    Los grupos se procesan en orden decreciente de unidades, por lo que el
+    costo es O(n log n) en el número de grupos.
+    """
+    rutas_asignadas = []
+    no_asignadas = {}
+    costo_total = 0.0
+
+    flota = tuple(
+        sorted(
+            ((vid, info["capacidad"], info["costo_km"]) for vid, info in vehiculos.items()),
+            key=lambda v: (v[1], v[2]),
+        )
+    )
+    if not flota:
+        return rutas_asignadas, dict(grupos_por_cliente), costo_total
+
+    cargas = sorted(
+        ((contar_unidades_grupo(grupo), cliente_id) for cliente_id, grupo in grupos_por_cliente.items()),
+        reverse=True,
+    )
+
+    for unidades, cliente_id in cargas:
+        grupo_pedidos = grupos_por_cliente[cliente_id]
+        cliente_nombre = dic_clientes.get(cliente_id, "Desconocido")
+        distancia = distancias_km.get(cliente_nombre, 100)
+        pedidos = _unidades_pedidos(grupo_pedidos)
+
+        for vehiculo_id, unidades_viaje, ids, continuados in dividir(pedidos, flota):
+            ruta = _crear_ruta(
+                vehiculo_id,
+                vehiculos[vehiculo_id],
+                unidades_viaje,
+                cliente_nombre,
+                distancia,
+                ids,
+                continuados,
+            )
+            rutas_asignadas.append(ruta)
+            costo_total += ruta["costo_total"]
+
+    return rutas_asignadas, no_asignadas, costo_total
+
+
+def asignar_vehiculos_first_fit(
+    grupos_por_cliente, vehiculos, distancias_km, dic_clientes
+):
+    """
+    Asigna vehículos con first-fit decreasing sobre los pedidos de cada
+    cliente (ver _dividir_first_fit): los pedidos enteros se agrupan en
+    viajes y solo se dividen los mayores que el vehículo más grande.
+
+    Args:
+        grupos_por_cliente: Grupos de pedidos por cliente
+        vehiculos: Catálogo de vehículos
+        distancias_km: Distancias por zona
+        dic_clientes: Catálogo de clientes
+
+    Returns:
+        Tupla (rutas_asignadas, no_asignadas, costo_total)
+    """
+    return _asignar_vehiculos_dividiendo(
+        grupos_por_cliente, vehiculos, distancias_km, dic_clientes, _dividir_first_fit
+    )
+
+
+def asignar_vehiculos_optimo(
+    grupos_por_cliente, vehiculos, distancias_km, dic_clientes
+):
+    """
+    Asigna vehículos minimizando el costo por costo_km de cada cliente,
+    dividiendo la carga en la combinación de viajes más barata.
+
+    Args:
+        grupos_por_cliente: Grupos de pedidos por cliente
+        vehiculos: Catálogo de vehículos
+        distancias_km: Distancias por zona
+        dic_clientes: Catálogo de clientes
+
+    Returns:
+        Tupla (rutas_asignadas, no_asignadas, costo_total)
+    """
+    return _asignar_vehiculos_dividiendo(
+        grupos_por_cliente, vehiculos, distancias_km, dic_clientes, _dividir_optimo
+    )
+
+
+def _distancia_haversine(origen, destinos):
+    """Distancia en línea recta (km) desde origen a cada destino [(lat, lon)]"""
+    lat1, lon1 = np.radians(origen)
+    lat2 = np.radians(destinos[:, 0])
+    lon2 = np.radians(destinos[:, 1])
+    h = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371.0 * np.arcsin(np.sqrt(h))
+
+
+@lru_cache(maxsize=8)
+def _matriz_cacheada(nombres, distancias_almacen, coordenadas, almacen):
+    """Construye la matriz cliente-cliente (ver matriz_distancias)"""
+    n = len(nombres)
+    d0 = np.array(distancias_almacen, dtype=float)
+
+    # Sin coordenadas, la única conexión es pasando por el almacén
+    matriz = d0[:, None] + d0[None, :]
+    np.fill_diagonal(matriz, 0.0)
+
+    conocidos = np.array([c is not None for c in coordenadas])
+    if conocidos.sum() >= 2:
+        puntos = np.array([c if c is not None else (0.0, 0.0) for c in coordenadas])
+        recta_almacen = _distancia_haversine(almacen, puntos)
+
+        # Factor de corrección vial: distancia de catálogo / línea recta
+        validos = conocidos & (recta_almacen > 50)
+        factor = float(np.median(d0[validos] / recta_almacen[validos])) if validos.any() else 1.3
+
+        idx = np.flatnonzero(conocidos)
+        recta = np.array([_distancia_haversine(puntos[i], puntos[idx]) for i in idx])
+        estimada = recta * factor
+        # Mantener la desigualdad triangular respecto del almacén
+        d0_i = d0[idx][:, None]
+        d0_j = d0[idx][None, :]
+        estimada = np.clip(estimada, np.abs(d0_i - d0_j), d0_i + d0_j)
+        matriz[np.ix_(idx, idx)] = estimada
+        np.fill_diagonal(matriz, 0.0)
+
+    matriz.setflags(write=False)
+    d0.setflags(write=False)
+    return {nombre: k for k, nombre in enumerate(nombres)}, d0, matriz
+
+
+def matriz_distancias(
+    distancias_km, coordenadas=None, almacen=coordenadas_almacen
+):
+    """
+    Matriz de distancias entre clientes, calculada una vez por catálogo.
+
+    La distancia entre dos clientes se estima con la línea recta entre sus
+    coordenadas multiplicada por un factor vial calibrado con distancias_km.
+    Clientes sin coordenadas solo se conectan pasando por el almacén.
+
+    Args:
+        distancias_km: Distancias almacén-cliente por nombre de cliente
+        coordenadas: {nombre_cliente: (lat, lon)} (por defecto,
+                     coordenadas_clientes del catálogo)
+        almacen: (lat, lon) del almacén
+
+    Returns:
+        Tupla (indice {nombre_cliente: k}, distancias al almacén, matriz k×k)
+    """
+    if coordenadas is None:
+        coordenadas = coordenadas_clientes
+    nombres = tuple(distancias_km.keys())
+    return _matriz_cacheada(
+        nombres,
+        tuple(distancias_km[n] for n in nombres),
+        tuple(coordenadas.get(n) for n in nombres),
+        tuple(almacen),
+    )
+
+
+def _rutas_ahorros(d0, matriz, cargas, capacidad_maxima):
+    """
+    Heurística de ahorros de Clarke-Wright para rutas abiertas.
+
+    Como en el resto del módulo, un viaje se cobra por la distancia desde
+    el almacén (sin regreso), así que una ruta cuesta d0[primera parada]
+    más el recorrido entre paradas. Unir el final x de una ruta con el
+    inicio y de otra ahorra d0[y] - matriz[x, y].
+
+    Args:
+        d0: Distancia almacén-parada de cada parada
+        matriz: Distancias entre paradas
+        cargas: Unidades de cada parada (todas <= capacidad_maxima)
+        capacidad_maxima: Capacidad del vehículo más grande
+
+    Returns:
+        Lista de rutas (listas de índices de parada, en orden de visita)
+    """
+    n = len(cargas)
+    rutas = {i: [i] for i in range(n)}
+    ruta_de = list(range(n))
+    carga_ruta = list(cargas)
+
+    if n > 1:
+        ahorros = d0[None, :] - matriz
+        np.fill_diagonal(ahorros, 0.0)
+        origen, destino = np.nonzero(ahorros > 1e-9)
+        valores = ahorros[origen, destino]
+        orden = np.argsort(-valores, kind="stable")
+
+        for x, y in zip(origen[orden].tolist(), destino[orden].tolist()):
+            rx, ry = ruta_de[x], ruta_de[y]
+            if rx == ry or carga_ruta[rx] + carga_ruta[ry] > capacidad_maxima:
+                continue
+            # Solo se une el final de una ruta con el inicio de otra
+            if rutas[rx][-1] != x or rutas[ry][0] != y:
+                continue
+
+            rutas[rx].extend(rutas[ry])
+            carga_ruta[rx] += carga_ruta[ry]
+            for parada in rutas.pop(ry):
+                ruta_de[parada] = rx
+
+    return list(rutas.values())
+
+
+def asignar_vehiculos_ahorros(
+    grupos_por_cliente, vehiculos, distancias_km, dic_clientes, coordenadas=None
+):
+    """
+    Construye rutas con varias paradas usando la heurística de ahorros
+    (Clarke-Wright) sobre la matriz de distancias entre clientes.
+
+    Las cargas mayores que el vehículo más grande se envían primero en
+    viajes completos directos; el resto de cada cliente es una parada.
+    Cada ruta usa el vehículo de menor costo_km que admite su carga.
+
+    Args:
+        grupos_por_cliente: Grupos de pedidos por cliente
+        vehiculos: Catálogo de vehículos
+        distancias_km: Distancias por zona
+        dic_clientes: Catálogo de clientes
+        coordenadas: {nombre_cliente: (lat, lon)} (por defecto,
+                     coordenadas_clientes del catálogo)
+
+    Returns:
+        Tupla (rutas_asignadas, no_asignadas, costo_total)
+
+    Raises:
+        ValueError: Si algún cliente con pedidos no tiene coordenadas
+    """
+    rutas_asignadas = []
+    costo_total = 0.0
+    if not vehiculos:
+        return rutas_asignadas, dict(grupos_por_cliente), costo_total
+    if coordenadas is None:
+        coordenadas = coordenadas_clientes
+
+    # Sin coordenadas no hay distancias entre clientes y cada cliente
+    # terminaría en una ruta propia
+    sin_coordenadas = sorted(
+        {
+            dic_clientes.get(cliente_id, "Desconocido")
+            for cliente_id in grupos_por_cliente
+        }
+        - set(coordenadas)
+    )
+    if sin_coordenadas:
+        raise ValueError(
+            "Clientes sin coordenadas para el algoritmo de ahorros: "
+            f"{', '.join(sin_coordenadas)}"
+        )
+
+    flota = sorted(vehiculos.items(), key=lambda x: (x[1]["costo_km"], x[1]["capacidad"]))
+    mayor_id, mayor_info = max(vehiculos.items(), key=lambda x: x[1]["capacidad"])
+    capacidad_maxima = mayor_info["capacidad"]
+
+    indice, d0_catalogo, matriz_catalogo = matriz_distancias(distancias_km, coordenadas)
+
+    # (cliente_nombre, unidades, (ids_pedidos, ids_continuados), indice_matriz o None)
+    paradas = []
+    for cliente_id, grupo_pedidos in grupos_por_cliente.items():
+        unidades = contar_unidades_grupo(grupo_pedidos)
+        cliente_nombre = dic_clientes.get(cliente_id, "Desconocido")
+        n_completos, resto = divmod(unidades, capacidad_maxima)
+        if resto == 0 and n_completos:
+            n_completos, resto = n_completos - 1, capacidad_maxima
+        repartidos = _repartir_pedidos(
+            _unidades_pedidos(grupo_pedidos), [capacidad_maxima] * n_completos + [resto]
+        )
+
+        for ids, continuados in repartidos[:n_completos]:
+            ruta = _crear_ruta(
+                mayor_id,
+                mayor_info,
+                capacidad_maxima,
+                cliente_nombre,
+                distancias_km.get(cliente_nombre, 100),
+                ids,
+                continuados,
+            )
+            rutas_asignadas.append(ruta)
+            costo_total += ruta["costo_total"]
+        if resto > 0:
+            paradas.append(
+                (cliente_nombre, resto, repartidos[-1], indice.get(cliente_nombre))
+            )
+
+    if not paradas:
+        return rutas_asignadas, {}, costo_total
+
+    # Submatriz de las paradas del día (las que no están en el catálogo
+    # de distancias solo se conectan por el almacén)
+    d0 = np.array(
+        [
+            d0_catalogo[k] if k is not None else distancias_km.get(nombre, 100)
+            for nombre, _, _, k in paradas
+        ],
+        dtype=float,
+    )
+    posiciones = np.array([k if k is not None else -1 for *_, k in paradas])
+    conocidas = posiciones >= 0
+    matriz = d0[:, None] + d0[None, :]
+    idx = np.flatnonzero(conocidas)
+    matriz[np.ix_(idx, idx)] = matriz_catalogo[np.ix_(posiciones[idx], posiciones[idx])]
+    np.fill_diagonal(matriz, 0.0)
+
+    cargas = [unidades for _, unidades, _, _ in paradas]
+    for ruta in _rutas_ahorros(d0, matriz, cargas, capacidad_maxima):
+        carga = sum(cargas[p] for p in ruta)
+        distancia = float(d0[ruta[0]] + sum(matriz[a, b] for a, b in zip(ruta, ruta[1:])))
+        vehiculo_id, vehiculo_info = next(
+            (vid, info) for vid, info in flota if info["capacidad"] >= carga
+        )
+        nombres = [paradas[p][0] for p in ruta]
+        registro = _crear_ruta(
+            vehiculo_id,
+            vehiculo_info,
+            carga,
+            " → ".join(nombres),
+            distancia,
+            [pedido for p in ruta for pedido in paradas[p][2][0]],
+            [pedido for p in ruta for pedido in paradas[p][2][1]],
+        )
+        registro["paradas"] = nombres
+        rutas_asignadas.append(registro)
+        costo_total += registro["costo_total"]
+
+    return rutas_asignadas, {}, costo_total
+
+
+# Algoritmos seleccionables con config.ALGORITMO_TRANSPORTE
+ALGORITMOS_TRANSPORTE = {
+    "greedy": asignar_vehiculos_greedy,
+    "first-fit": asignar_vehiculos_first_fit,
+    "optimal": asignar_vehiculos_optimo,
+    "savings": asignar_vehiculos_ahorros,
+}
+
+
+def planificar_rutas(
+    dia,
+    pedidos_preparados,
+    vehiculos,
+    distancias_km,
+    dic_clientes,
+    algoritmo="greedy",
+    coordenadas=None,
+):
     """
     Planifica rutas de transporte para pedidos preparados.
 
     Args:
         dia: Número de día
-        pedidos_preparados: Pedidos listos para transportar
+        pedidos_preparados: Pedidos listos para transportar (diccionario o LibroPedidos)
         vehiculos: Catálogo de vehículos
         distancias_km: Distancias por zona
         dic_clientes: Catálogo de clientes
+        algoritmo: "greedy", "first-fit", "optimal" o "savings"
+                   (ver ALGORITMOS_TRANSPORTE)
+        coordenadas: {nombre_cliente: (lat, lon)} para "savings" (por
+                     defecto, coordenadas_clientes del catálogo)
 
     Returns:
         Diccionario con información de rutas, utilización y costos
     """
+    if algoritmo not in ALGORITMOS_TRANSPORTE:
+        raise ValueError(
+            f"Algoritmo de transporte desconocido: {algoritmo}. "
+            f"Opciones: {', '.join(ALGORITMOS_TRANSPORTE)}"
+        )
 
     if not pedidos_preparados:
         return {
@@ -123,8 +704,9 @@ def planificar_rutas(dia, pedidos_preparados, vehiculos, distancias_km, dic_clie
     grupos = agrupar_pedidos_por_cliente(pedidos_preparados)
 
     # Asignar vehículos
-    rutas, no_transportados, costo_total = asignar_vehiculos_greedy(
-        grupos, vehiculos, distancias_km, dic_clientes
+    opciones = {"coordenadas": coordenadas} if algoritmo == "savings" else {}
+    rutas, no_transportados, costo_total = ALGORITMOS_TRANSPORTE[algoritmo](
+        grupos, vehiculos, distancias_km, dic_clientes, **opciones
     )
 
     # Calcular estadísticas
@@ -0,0 +1,8 @@
+"""
+conftest.py - Configuración de pytest (raíz del proyecto en el path)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,130 @@
+"""
+test_alertas.py - Pruebas de reglas de alerta y del procesador con histéresis
+"""
+
+import numpy as np
+import pytest
+
+from sistema.alertas import (
+    UMBRALES_ALERTAS,
+    ProcesadorAlertas,
+    compilar_reglas,
+    evaluar_alertas_lote,
+    generar_alertas,
+)
+from sistema.motor import Simulacion
+
+
+def _dia(fill_rate):
+    """Indicadores de un día en los que solo el fill rate puede alertar"""
+    return {
+        "otif": 100.0,
+        "fill_rate": fill_rate,
+        "backlog_rate": 0.0,
+        "utilizacion_flota": 50.0,
+        "productividad_picking": 200.0,
+    }
+
+
+def test_umbrales_se_leen_en_cada_compilacion():
+    umbrales = dict(UMBRALES_ALERTAS)
+    assert not generar_alertas(_dia(95.5), {**umbrales, "fill_rate_minimo": 95.0})
+    alertas = generar_alertas(_dia(95.5), umbrales)
+    assert [a["tipo"] for a in alertas] == ["FILL_RATE_BAJO"]
+
+    umbrales["fill_rate_minimo"] = 90.0
+    reglas = {r["tipo"]: r for r in compilar_reglas(umbrales)}
+    assert reglas["FILL_RATE_BAJO"]["umbral"] == 90.0
+
+
+def test_umbrales_por_defecto_sin_cache(monkeypatch):
+    compilar_reglas()
+    monkeypatch.setitem(UMBRALES_ALERTAS, "otif_minimo", 80.0)
+    reglas = {r["tipo"]: r for r in ProcesadorAlertas().reglas}
+    assert reglas["OTIF_BAJO"]["umbral"] == 80.0
+
+
+def test_comparador_desconocido():
+    regla = {"tipo": "X", "metrica": "otif", "comparador": "~", "umbral": "otif_minimo"}
+    with pytest.raises(ValueError, match="Comparador desconocido"):
+        compilar_reglas(reglas=[regla])
+
+
+def test_histeresis_abre_y_cierra():
+    # Umbral 96 con banda 1: abre bajo 96 y cierra recién desde 97
+    procesador = ProcesadorAlertas()
+    serie = [98.0, 95.0, 96.5, 96.9, 97.5, 95.9, 96.99, 97.0]
+    eventos = {
+        dia: [e["evento"] for e in procesador.procesar(dia, _dia(valor))]
+        for dia, valor in enumerate(serie, start=1)
+    }
+    assert eventos == {
+        1: [], 2: ["ABIERTA"], 3: [], 4: [], 5: ["CERRADA"],
+        6: ["ABIERTA"], 7: [], 8: ["CERRADA"],
+    }
+    cierres = [e for e in procesador.eventos if e["evento"] == "CERRADA"]
+    assert [e["dias_activa"] for e in cierres] == [3, 2]
+    assert procesador.activas() == {}
+
+
+def test_dias_consecutivos_para_abrir_y_cerrar():
+    procesador = ProcesadorAlertas(dias_para_abrir=2, dias_para_cerrar=2)
+    serie = [95.0, 98.0, 95.0, 95.0, 98.0, 95.0, 98.0, 98.0]
+    eventos = [
+        (dia, e["evento"])
+        for dia, valor in enumerate(serie, start=1)
+        for e in procesador.procesar(dia, _dia(valor))
+    ]
+    assert eventos == [(4, "ABIERTA"), (8, "CERRADA")]
+
+
+def test_lote_igual_a_generar_alertas_por_dia():
+    rng = np.random.default_rng(2)
+    indicadores = {
+        "otif": rng.uniform(90, 100, size=(3, 20)),
+        "fill_rate": rng.uniform(90, 100, size=(3, 20)),
+        "backlog_rate": rng.uniform(0, 10, size=(3, 20)),
+        "utilizacion_flota": rng.uniform(60, 100, size=(3, 20)),
+        "productividad_picking": rng.uniform(100, 200, size=(3, 20)),
+    }
+    lote = evaluar_alertas_lote(indicadores)
+    for tipo, alerta in lote.items():
+        for escenario in range(3):
+            dias = [
+                d
+                for d in range(20)
+                if tipo in {
+                    a["tipo"]
+                    for a in generar_alertas(
+                        {k: float(v[escenario, d]) for k, v in indicadores.items()}
+                    )
+                }
+            ]
+            assert alerta["conteo"][escenario] == len(dias)
+            assert alerta["primer_indice"][escenario] == (dias[0] if dias else -1)
+
+
+def test_procesador_como_hook_emite_solo_transiciones():
+    simulacion = Simulacion(capacidad_picking=700, stock_inicial=80, seed=3)
+    procesador = ProcesadorAlertas()
+    diarios = []
+    simulacion.agregar_hook("indicadores", procesador.procesar)
+    simulacion.agregar_hook("indicadores", lambda dia, ind: diarios.append((dia, ind)))
+    simulacion.ejecutar(40)
+
+    dias_alerta = {}
+    for dia, indicadores in diarios:
+        for alerta in generar_alertas(indicadores):
+            dias_alerta.setdefault(alerta["tipo"], []).append(dia)
+    assert dias_alerta
+
+    for tipo, dias in dias_alerta.items():
+        eventos = [e for e in procesador.eventos if e["tipo"] == tipo]
+        # Abre el primer día fuera de umbral y alterna apertura y cierre
+        assert eventos[0]["evento"] == "ABIERTA" and eventos[0]["dia"] == dias[0]
+        assert [e["evento"] for e in eventos] == ["ABIERTA", "CERRADA"] * (
+            len(eventos) // 2
+        ) + ["ABIERTA"] * (len(eventos) % 2)
+        aperturas = [e for e in eventos if e["evento"] == "ABIERTA"]
+        assert all(e["dia"] in dias for e in aperturas)
+    assert len(procesador.eventos) < sum(len(d) for d in dias_alerta.values())
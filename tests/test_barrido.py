@@ -0,0 +1,52 @@
+"""
+test_barrido.py - Pruebas del barrido de parámetros
+"""
+
+import csv
+import subprocess
+import sys
+from pathlib import Path
+
+from sistema.barrido import COLUMNAS_RESULTADO, ejecutar_barrido
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def test_reorden_y_lote_cambian_los_resultados_de_inventario():
+    filas = ejecutar_barrido(
+        20, [1500], [10, 150], [20, 400], [["VH01", "VH02"]], seed=42, n_procesos=1
+    )
+
+    assert len(filas) == 4
+    assert all(set(COLUMNAS_RESULTADO) <= set(fila) for fila in filas)
+    inventario = {
+        (fila["unidades_entregadas_stock"], fila["reposiciones_total"]) for fila in filas
+    }
+    assert len(inventario) == 4
+    for fila in filas:
+        assert (
+            fila["unidades_entregadas_stock"] + fila["unidades_sin_stock"] > 0
+        )
+
+
+def test_linea_de_comandos_sin_config(tmp_path):
+    # Fuera de la raíz del repositorio config.py no es importable
+    salida = tmp_path / "barrido.csv"
+    codigo = (
+        "import sys; sys.path.insert(0, sys.argv[1]); "
+        "from sistema.barrido import main; "
+        "main(['--dias', '2', '--lote', '50,100', '--procesos', '1', "
+        "'--salida', sys.argv[2]]); "
+        "print('config' in sys.modules)"
+    )
+    proceso = subprocess.run(
+        [sys.executable, "-c", codigo, str(RAIZ), str(salida)],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proceso.stdout.strip().splitlines()[-1] == "False"
+    with open(salida, encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert [fila["lote_reposicion"] for fila in filas] == ["50", "100"]
@@ -0,0 +1,92 @@
+"""
+test_demanda.py - Pruebas de los generadores de demanda
+"""
+
+from itertools import islice
+
+import numpy as np
+import pytest
+
+from sistema.catalogos import dic_clientes, dic_sku
+from sistema.demanda import (
+    contar_unidades_pedidos,
+    generar_demanda_dia,
+    iter_demanda,
+    obtener_sku_mas_solicitado,
+    simular_demanda_vectorizada,
+)
+
+N_DIAS = 20
+
+
+def _ids_y_lineas(pedidos_dia):
+    return {
+        id_pedido: (info["cliente"], [(l["sku"], l["cantidad"]) for l in info["lineas"]])
+        for id_pedido, info in pedidos_dia.items()
+    }
+
+
+@pytest.mark.parametrize("seed", [0, 42, 2024])
+def test_vectorizada_igual_a_iter_demanda(seed):
+    libro = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=seed)
+
+    dias = []
+    for dia, libro_dia in iter_demanda(N_DIAS, dic_clientes, dic_sku, seed=seed):
+        dias.append(dia)
+        assert _ids_y_lineas(libro_dia.a_pedidos_dia()) == _ids_y_lineas(
+            libro.vista_dia(dia).a_pedidos_dia()
+        )
+    assert dias == list(range(1, N_DIAS + 1))
+    assert libro.dias() == dias
+
+
+def test_respeta_rangos_y_catalogo():
+    rangos = dict(
+        pedidos_min=3, pedidos_max=4, lineas_min=2, lineas_max=2, cantidad_min=7, cantidad_max=9
+    )
+    libro = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=1, **rangos)
+
+    por_dia = np.bincount(libro.dia, minlength=N_DIAS + 1)[1:]
+    assert por_dia.min() >= 3 and por_dia.max() <= 4
+    assert set(libro.lineas_por_pedido().tolist()) == {2}
+    assert libro.cantidad.min() >= 7 and libro.cantidad.max() <= 9
+    assert libro.clientes == list(dic_clientes) and libro.skus == list(dic_sku)
+    assert libro.unidades_totales() == int(libro.cantidad.sum())
+
+
+def test_misma_semilla_mismos_pedidos():
+    a = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=9)
+    b = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=9)
+    c = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=10)
+    assert _ids_y_lineas(a.a_pedidos_dia()) == _ids_y_lineas(b.a_pedidos_dia())
+    assert _ids_y_lineas(a.a_pedidos_dia()) != _ids_y_lineas(c.a_pedidos_dia())
+
+
+def test_resumenes_del_libro_igual_a_diccionario():
+    libro = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=5)
+    for dia in libro.dias():
+        libro_dia = libro.vista_dia(dia)
+        pedidos_dia = libro_dia.a_pedidos_dia()
+        assert contar_unidades_pedidos(libro_dia) == contar_unidades_pedidos(pedidos_dia)
+        assert obtener_sku_mas_solicitado(libro_dia)[1] == (
+            obtener_sku_mas_solicitado(pedidos_dia)[1]
+        )
+
+
+def test_generar_dia_sin_generar_los_anteriores():
+    por_dia = dict(iter_demanda(N_DIAS, dic_clientes, dic_sku, seed=11))
+    for dia in (1, 7, N_DIAS):
+        libro_dia = generar_demanda_dia(dia, dic_clientes, dic_sku, 11)
+        assert _ids_y_lineas(libro_dia.a_pedidos_dia()) == _ids_y_lineas(
+            por_dia[dia].a_pedidos_dia()
+        )
+
+
+def test_iter_demanda_es_perezoso_y_no_depende_del_horizonte():
+    # Un horizonte enorme no se genera por adelantado
+    primeros = list(islice(iter_demanda(10**9, dic_clientes, dic_sku, seed=4), 3))
+    cortos = list(iter_demanda(3, dic_clientes, dic_sku, seed=4))
+
+    assert [dia for dia, _ in primeros] == [1, 2, 3]
+    for (_, largo), (_, corto) in zip(primeros, cortos):
+        assert _ids_y_lineas(largo.a_pedidos_dia()) == _ids_y_lineas(corto.a_pedidos_dia())
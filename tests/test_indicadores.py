@@ -0,0 +1,211 @@
+"""
+test_indicadores.py - Pruebas de KPIs contra sus cálculos de referencia
+"""
+
+import numpy as np
+import pytest
+
+from sistema.indicadores import (
+    AcumuladorKPI,
+    SketchCuantiles,
+    calcular_indicadores,
+    calcular_indicadores_lote,
+    consolidar_indicadores_multiples_dias,
+)
+from sistema.motor import Simulacion
+
+_PROMEDIOS = (
+    "otif",
+    "fill_rate",
+    "backlog_rate",
+    "productividad_picking",
+    "utilizacion_flota",
+)
+
+
+@pytest.fixture(scope="module")
+def indicadores_diarios():
+    # Capacidad ajustada para que los KPIs varíen de un día a otro
+    resultado = Simulacion(capacidad_picking=700, stock_inicial=80, seed=3).ejecutar(60)
+    return resultado.indicadores_diarios
+
+
+def _consolidar_promediando(lista):
+    """Consolidación original: promedio simple de los KPIs diarios y totales"""
+    n = len(lista)
+    consolidado = {
+        f"{clave}_promedio": round(sum(ind[clave] for ind in lista) / n, 2)
+        for clave in _PROMEDIOS
+    }
+    consolidado.update(
+        {
+            "unidades_entregadas_total": sum(ind["unidades_entregadas"] for ind in lista),
+            "unidades_no_entregadas_total": sum(
+                ind["unidades_no_entregadas"] for ind in lista
+            ),
+            "pedidos_totales": sum(ind["pedidos_totales"] for ind in lista),
+            "dias_simulados": n,
+        }
+    )
+    return consolidado
+
+
+def test_consolidado_conserva_promedios(indicadores_diarios):
+    esperado = _consolidar_promediando(indicadores_diarios)
+    consolidado = consolidar_indicadores_multiples_dias(indicadores_diarios)
+    assert {clave: consolidado[clave] for clave in esperado} == esperado
+
+    # Diccionarios sin los conteos nuevos dan los mismos promedios
+    antiguos = [
+        {
+            clave: ind[clave]
+            for clave in _PROMEDIOS
+            + ("unidades_entregadas", "unidades_no_entregadas", "pedidos_totales")
+        }
+        for ind in indicadores_diarios
+    ]
+    consolidado = consolidar_indicadores_multiples_dias(antiguos)
+    assert {clave: consolidado[clave] for clave in esperado} == esperado
+    assert consolidar_indicadores_multiples_dias([]) == {}
+
+
+def test_ratios_globales_ponderados(indicadores_diarios):
+    consolidado = consolidar_indicadores_multiples_dias(indicadores_diarios)
+    entregadas = sum(ind["unidades_entregadas"] for ind in indicadores_diarios)
+    solicitadas = sum(ind["unidades_solicitadas"] for ind in indicadores_diarios)
+    assert consolidado["fill_rate_global"] == round(entregadas / solicitadas * 100, 2)
+    assert consolidado["backlog_rate_global"] == round(
+        (solicitadas - entregadas) / solicitadas * 100, 2
+    )
+
+
+def test_ventanas_igual_a_consolidar_ultimos_dias(indicadores_diarios):
+    acumulador = AcumuladorKPI(ventanas=(7, 30))
+    for n, indicadores in enumerate(indicadores_diarios, start=1):
+        acumulador.agregar_indicadores(indicadores)
+        for dias in (7, 30):
+            ultimos = indicadores_diarios[max(0, n - dias) : n]
+            esperado = consolidar_indicadores_multiples_dias(ultimos)
+            ventana = acumulador.ventana(dias)
+            assert ventana["dias"] == len(ultimos)
+            for clave, valor in ventana.items():
+                if clave != "dias":
+                    assert valor == pytest.approx(esperado[clave], abs=0.01)
+
+
+_ARGUMENTOS = (
+    "pedidos_totales",
+    "unidades_entregadas",
+    "unidades_solicitadas",
+    "unidades_preparadas",
+    "unidades_transportadas",
+    "unidades_no_transportadas",
+    "utilizacion_flota",
+    "horas_jornada",
+)
+
+
+def _conteos_escenarios():
+    """Conteos diarios (escenarios × días) de simulaciones con semilla"""
+    filas = []
+    for capacidad in (300, 700, 1500):
+        simulacion = Simulacion(capacidad_picking=capacidad, stock_inicial=80, seed=4)
+        resultado = simulacion.ejecutar(40)
+        filas.append(
+            [
+                [
+                    ind["pedidos_totales"],
+                    ind["unidades_entregadas"],
+                    ind["unidades_solicitadas"],
+                    ind["unidades_preparadas"],
+                    ind["unidades_transportadas"],
+                    0,
+                    ind["utilizacion_flota"],
+                    ind["horas_jornada"],
+                ]
+                for ind in resultado.indicadores_diarios
+            ]
+        )
+    conteos = np.array(filas, dtype=object)
+    # Días sin pedidos, sin preparación y sin horas: casos de división por cero
+    conteos[0, :4] = [
+        [0, 0, 0, 0, 0, 0, 0.0, 8],
+        [0, 4, 10, 4, 4, 0, 5.0, 8],
+        [5, 0, 0, 0, 0, 0, 0.0, 0],
+        [3, 7, 20, 0, 0, 0, 12.345, 8],
+    ]
+    return conteos
+
+
+def test_lote_igual_a_calcular_por_dia():
+    conteos = _conteos_escenarios()
+    lote = calcular_indicadores_lote(
+        *(np.array(conteos[..., k].tolist()) for k in range(len(_ARGUMENTOS)))
+    )
+    for i, j in np.ndindex(conteos.shape[:2]):
+        esperado = calcular_indicadores(*conteos[i, j].tolist())
+        obtenido = {clave: valor[i, j].item() for clave, valor in lote.items()}
+        assert obtenido == esperado, (i, j)
+
+
+def test_lote_con_escalares_igual_a_calcular_indicadores():
+    # 2.675 queda a medio camino al escalar: np.round y round() difieren
+    conteos = (10, 100, 200, 100, 100, 0, 2.675, 8)
+    lote = calcular_indicadores_lote(*conteos)
+    esperado = calcular_indicadores(*conteos)
+    assert {clave: valor.item() for clave, valor in lote.items()} == esperado
+    assert all(np.ndim(valor) == 0 for valor in lote.values())
+
+
+CUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+def _error_de_rango(datos, estimados):
+    ordenados = np.sort(datos)
+    rangos = np.searchsorted(ordenados, estimados, side="right") / len(datos)
+    return np.max(np.abs(rangos - np.array(CUANTILES)))
+
+
+def test_sketch_exacto_mientras_no_comprime():
+    datos = np.random.default_rng(0).normal(95, 3, size=150)
+    sketch = SketchCuantiles(k=200)
+    sketch.agregar_lote(datos)
+
+    assert sketch.exacto
+    np.testing.assert_allclose(sketch.cuantiles(CUANTILES), np.quantile(datos, CUANTILES))
+    assert SketchCuantiles().cuantiles([0.5]) == [None]
+
+
+@pytest.mark.parametrize("por_lote", [False, True])
+def test_sketch_error_de_rango_acotado(por_lote):
+    datos = np.random.default_rng(1).lognormal(3, 1, size=100_000)
+    sketch = SketchCuantiles(k=200, semilla=7)
+    if por_lote:
+        sketch.agregar_lote(datos)
+    else:
+        for valor in datos.tolist():
+            sketch.agregar(valor)
+
+    assert not sketch.exacto
+    assert sketch.n == len(datos)
+    assert sum(len(nivel) for nivel in sketch.niveles) < 1000
+    assert (sketch.minimo, sketch.maximo) == (datos.min(), datos.max())
+    assert sketch.cuantiles([0, 1]) == [datos.min(), datos.max()]
+    assert _error_de_rango(datos, sketch.cuantiles(CUANTILES)) < 0.02
+
+
+def test_sketch_combinado_igual_de_preciso():
+    rng = np.random.default_rng(2)
+    partes = [rng.normal(media, 5, size=25_000) for media in (80, 90, 95, 99)]
+
+    combinado = SketchCuantiles(semilla=0)
+    for i, parte in enumerate(partes):
+        sketch = SketchCuantiles(semilla=i + 1)
+        sketch.agregar_lote(parte)
+        combinado.combinar(sketch)
+    combinado.combinar(SketchCuantiles())
+
+    datos = np.concatenate(partes)
+    assert combinado.n == len(datos)
+    assert sum(len(nivel) for nivel in combinado.niveles) < 1000
+    assert _error_de_rango(datos, combinado.cuantiles(CUANTILES)) < 0.02
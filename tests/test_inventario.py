@@ -0,0 +1,134 @@
+"""
+test_inventario.py - Pruebas del libro de inventario contra el stock en diccionario
+"""
+
+import numpy as np
+import pytest
+
+from sistema.catalogos import dic_clientes, dic_sku
+from sistema.demanda import simular_demanda_vectorizada
+from sistema.inventario import (
+    TIPO_AJUSTE,
+    TIPO_REPOSICION,
+    TIPO_RESERVA,
+    DiarioInventario,
+    LibroInventario,
+    inicializar_stock,
+    reponer_simple,
+    reservar_y_actualizar,
+    skus_bajo_punto_reorden,
+)
+
+N_DIAS = 30
+PUNTO_REORDEN = 50
+LOTE = 40
+
+
+@pytest.mark.parametrize("como_libro", [False, True])
+def test_libro_igual_a_diccionario(como_libro):
+    # Stock inicial bajo para que haya quiebres y reposiciones casi a diario
+    demanda = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=11)
+    stock = inicializar_stock(dic_sku, stock_inicial=60)
+    libro = LibroInventario.inicial(dic_sku, stock_inicial=60)
+
+    faltantes = reposiciones = 0
+    for dia in range(1, N_DIAS + 1):
+        pedidos_dia = demanda.vista_dia(dia).a_pedidos_dia()
+        stock, entregadas, no_entregadas, log = reservar_y_actualizar(
+            stock, pedidos_dia, dic_clientes
+        )
+        entrada_libro = demanda.vista_dia(dia) if como_libro else pedidos_dia
+        _, entregadas_libro, no_entregadas_libro, log_libro = reservar_y_actualizar(
+            libro, entrada_libro, dic_clientes
+        )
+
+        assert (entregadas_libro, no_entregadas_libro) == (entregadas, no_entregadas)
+        assert log_libro["entregado"].tolist() == [t["entregado"] for t in log]
+        assert log_libro["solicitado"].tolist() == [t["solicitado"] for t in log]
+
+        stock, repuesto = reponer_simple(stock, dic_sku, PUNTO_REORDEN, LOTE)
+        _, repuesto_libro = reponer_simple(libro, dic_sku, PUNTO_REORDEN, LOTE)
+
+        assert repuesto_libro == repuesto
+        assert libro.a_diccionario() == stock
+        faltantes += no_entregadas
+        reposiciones += len(repuesto)
+
+    assert faltantes > 0 and reposiciones > 0
+    assert np.all(libro.cantidad >= 0)
+
+
+def test_candidatos_iguales_a_revisar_todo_con_stock_bajo_el_punto():
+    # Algunos SKUs empiezan bajo el punto de reorden, uno de ellos sin
+    # demanda (nunca se reserva), y el catálogo no está en orden
+    # alfabético: el log debe salir igual y en el mismo orden
+    catalogo = {"ZZ-SIN-DEMANDA": "Repuesto sin pedidos", **dic_sku}
+    demanda = simular_demanda_vectorizada(N_DIAS, dic_clientes, dic_sku, seed=5)
+    inicial = inicializar_stock(catalogo, stock_inicial=120)
+    bajos = list(catalogo)[::3]
+    for sku in bajos:
+        inicial[sku] = 10
+    assert list(catalogo) != sorted(catalogo)
+
+    completo = dict(inicial)
+    con_candidatos = dict(inicial)
+    tocados = skus_bajo_punto_reorden(inicial, PUNTO_REORDEN)
+    libro = LibroInventario.desde_diccionario(inicial)
+
+    for dia in range(1, N_DIAS + 1):
+        pedidos_dia = demanda.vista_dia(dia).a_pedidos_dia()
+        completo, *_ = reservar_y_actualizar(completo, pedidos_dia, dic_clientes)
+        con_candidatos, *_ = reservar_y_actualizar(
+            con_candidatos, pedidos_dia, dic_clientes, tocados=tocados
+        )
+        reservar_y_actualizar(libro, pedidos_dia, dic_clientes)
+
+        completo, esperado = reponer_simple(completo, catalogo, PUNTO_REORDEN, LOTE)
+        con_candidatos, repuesto = reponer_simple(
+            con_candidatos, catalogo, PUNTO_REORDEN, LOTE, candidatos=tocados
+        )
+        _, repuesto_libro = reponer_simple(libro, catalogo, PUNTO_REORDEN, LOTE)
+
+        if dia == 1:
+            assert {r["sku"] for r in esperado} >= set(bajos)
+        assert repuesto == esperado
+        assert repuesto_libro == esperado
+        assert con_candidatos == completo == libro.a_diccionario()
+
+
+def test_diario_reconstruye_el_stock_de_cada_dia(tmp_path):
+    n_dias = 80
+    demanda = simular_demanda_vectorizada(n_dias, dic_clientes, dic_sku, seed=13)
+    libro = LibroInventario.inicial(dic_sku, stock_inicial=60)
+    diario = libro.activar_diario(cada_n_dias=4)
+
+    cierres = {0: libro.a_diccionario()}
+    for dia in range(1, n_dias + 1):
+        reservar_y_actualizar(libro, demanda.vista_dia(dia), dic_clientes)
+        reponer_simple(libro, dic_sku, PUNTO_REORDEN, LOTE)
+        if dia % 10 == 0:
+            libro.ajustar(libro.skus[dia % len(libro.skus)], -3)
+        libro.cerrar_dia(dia)
+        cierres[dia] = libro.a_diccionario()
+
+    # Más movimientos que la capacidad inicial de los arreglos
+    assert diario.n > 1024
+    assert sorted(diario.fotos) == list(range(0, n_dias + 1, 4))
+    assert set(diario.movimientos()["tipo"].tolist()) == {
+        TIPO_RESERVA,
+        TIPO_REPOSICION,
+        TIPO_AJUSTE,
+    }
+    for dia, stock in cierres.items():
+        assert diario.stock_en_dia(dia) == stock
+
+    ruta = tmp_path / "diario.npz"
+    diario.guardar(ruta)
+    cargado = DiarioInventario.cargar(ruta)
+    for dia, stock in cierres.items():
+        assert cargado.stock_en_dia(dia) == stock
+
+    with pytest.raises(ValueError):
+        diario.cerrar_dia(n_dias, libro.cantidad)
+    with pytest.raises(ValueError):
+        diario.stock_en_dia(n_dias + 1)
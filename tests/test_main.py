@@ -0,0 +1,33 @@
+"""
+test_main.py - Arranque de la interfaz (requiere PyQt6)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def test_arranque_no_importa_numpy_ni_sistema():
+    # El menú no usa tablas ni el motor: numpy y sistema se cargan al
+    # abrir la primera pantalla que los necesita
+    codigo = (
+        "import sys, gui.main; "
+        "print(sorted(m for m in ('numpy', 'sistema', 'gui.modelos') "
+        "if m in sys.modules))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=RAIZ,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert salida.stdout.strip() == "[]"
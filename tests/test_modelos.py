@@ -0,0 +1,51 @@
+"""
+test_modelos.py - Pruebas del modelo columnar y su proxy (requiere PyQt6)
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, Qt  # noqa: E402
+
+from gui.modelos import ModeloColumnar, ProxyColumnar  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def aplicacion():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _columnas(rng, n):
+    return [
+        rng.integers(0, 20, size=n),
+        [f"CAT{v:03d}" for v in rng.integers(0, 50, size=n)],
+    ]
+
+
+@pytest.mark.parametrize("filtro", ["", "cat01"])
+@pytest.mark.parametrize(
+    "orden", [None, Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder]
+)
+@pytest.mark.parametrize("columna_orden", [0, 1])
+def test_agregar_filas_igual_a_recalcular(filtro, orden, columna_orden):
+    rng = np.random.default_rng(1)
+    modelo = ModeloColumnar(["Valor", "SKU"])
+    proxy = ProxyColumnar(modelo)
+    if orden is not None:
+        proxy.sort(columna_orden, orden)
+    proxy.filtrar(filtro)
+
+    reinicios = []
+    proxy.modelReset.connect(lambda: reinicios.append(True))
+    for tamano in (1, 5, 30, 2, 100):
+        modelo.agregar_filas(_columnas(rng, tamano))
+
+    incremental = proxy.indices.copy()
+    assert not reinicios
+    proxy._recalcular()
+    assert np.array_equal(incremental, proxy.indices)
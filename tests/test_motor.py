@@ -0,0 +1,56 @@
+"""
+test_motor.py - Pruebas del motor de simulación multi-día
+"""
+
+from sistema.motor import Simulacion
+
+
+def test_modo_mochila_se_aplica_con_backlog():
+    kwargs = dict(capacidad_picking=400, arrastrar_backlog=True, seed=5)
+    greedy = Simulacion(modo_picking="greedy", **kwargs).ejecutar(10)
+    mochila = Simulacion(modo_picking="mochila", **kwargs).ejecutar(10)
+
+    preparadas_greedy = [d["unidades_preparadas"] for d in greedy.resumen_diario]
+    preparadas_mochila = [d["unidades_preparadas"] for d in mochila.resumen_diario]
+    assert preparadas_greedy != preparadas_mochila
+    assert all(u <= 400 for u in preparadas_mochila)
+
+    # Ningún pedido se pierde: lo no preparado sigue en el backlog
+    assert (
+        sum(preparadas_mochila) + sum(
+            sum(l["cantidad"] for l in p["lineas"]) for p in mochila.backlog_final.values()
+        )
+        == mochila.unidades_solicitadas
+    )
+
+
+def test_guardar_escribe_resumen_y_diario(tmp_path):
+    import csv
+
+    from sistema.inventario import DiarioInventario
+    from sistema.motor import COLUMNAS_RESUMEN_DIARIO
+
+    resultado = Simulacion(seed=3, diario_inventario=2).ejecutar(5)
+    rutas = resultado.guardar(str(tmp_path / "salida" / "simulacion.csv"))
+    assert rutas == [
+        str(tmp_path / "salida" / "simulacion.csv"),
+        str(tmp_path / "salida" / "simulacion.npz"),
+    ]
+
+    with open(rutas[0], newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert list(filas[0]) == COLUMNAS_RESUMEN_DIARIO
+    assert [int(f["pedidos"]) for f in filas] == [
+        d["pedidos"] for d in resultado.resumen_diario
+    ]
+
+    diario = DiarioInventario.cargar(rutas[1])
+    assert diario.stock_en_dia(5) == resultado.stock_final
+
+
+def test_guardar_sin_diario_solo_escribe_csv(tmp_path):
+    resultado = Simulacion(seed=3).ejecutar(2)
+    assert resultado.guardar(str(tmp_path / "simulacion.csv")) == [
+        str(tmp_path / "simulacion.csv")
+    ]
+    assert not (tmp_path / "simulacion.npz").exists()
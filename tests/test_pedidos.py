@@ -0,0 +1,68 @@
+"""
+test_pedidos.py - Pruebas del libro de pedidos columnar
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from sistema.catalogos import dic_clientes, dic_sku
+from sistema.demanda import simular_demanda_vectorizada
+from sistema.pedidos import LibroPedidos, clave_id_pedido
+
+FECHA_BASE = datetime(2025, 1, 1)
+
+
+def _libro(n_dias=10, seed=3):
+    return simular_demanda_vectorizada(n_dias, dic_clientes, dic_sku, seed=seed)
+
+
+def test_a_diccionario_y_desde_diccionario_ida_y_vuelta():
+    libro = _libro()
+    pedidos = libro.a_diccionario(FECHA_BASE)
+    copia = LibroPedidos.desde_diccionario(pedidos, dic_clientes, dic_sku)
+
+    for nombre in ("dia", "numero", "cliente", "inicio_lineas", "sku", "cantidad", "unidades"):
+        np.testing.assert_array_equal(getattr(copia, nombre), getattr(libro, nombre))
+    assert copia.a_diccionario(FECHA_BASE) == pedidos
+
+
+def test_vista_dia_igual_al_dia_del_diccionario():
+    libro = _libro()
+    pedidos = libro.a_diccionario(FECHA_BASE)
+
+    for dia in libro.dias():
+        vista = libro.vista_dia(dia)
+        assert vista.a_pedidos_dia(FECHA_BASE) == pedidos[dia]
+        assert vista.ids() == sorted(pedidos[dia], key=clave_id_pedido)
+        assert vista.unidades_totales() == sum(
+            l["cantidad"] for p in pedidos[dia].values() for l in p["lineas"]
+        )
+    assert len(libro.vista_dia(libro.dias()[-1] + 1)) == 0
+
+
+def test_seleccionar_conserva_el_orden_y_las_lineas():
+    libro = _libro()
+    pedidos = libro.a_pedidos_dia(FECHA_BASE)
+    ids = libro.ids()
+    elegidos = [7, 2, 11, 5]
+
+    sub = libro.seleccionar(elegidos)
+    assert sub.ids() == [ids[i] for i in sorted(elegidos)]
+    assert sub.a_pedidos_dia(FECHA_BASE) == {ids[i]: pedidos[ids[i]] for i in elegidos}
+
+    mascara = np.zeros(len(libro), dtype=bool)
+    mascara[elegidos] = True
+    assert libro.seleccionar(mascara).ids() == sub.ids()
+
+
+def test_mas_de_999_pedidos_por_dia():
+    libro = simular_demanda_vectorizada(
+        1, dic_clientes, dic_sku, seed=1, pedidos_min=1200, pedidos_max=1200
+    )
+    ids = libro.ids()
+    assert ids[998:1001] == ["PED01-999", "PED01-1000", "PED01-1001"]
+
+    copia = LibroPedidos.desde_diccionario(libro.a_diccionario(FECHA_BASE), dic_clientes, dic_sku)
+    assert copia.ids() == ids
+    np.testing.assert_array_equal(copia.unidades, libro.unidades)
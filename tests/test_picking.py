@@ -0,0 +1,160 @@
+"""
+test_picking.py - Pruebas de selección de pedidos para picking
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sistema.catalogos import dic_clientes, dic_sku
+from sistema.demanda import simular_demanda_vectorizada
+from sistema.pedidos import LibroPedidos
+from sistema.picking import (
+    ColaBacklog,
+    asignar_picking,
+    asignar_picking_con_backlog,
+    obtener_tabla_prioridades,
+    prioridad_cliente,
+    _seleccion_greedy,
+    _seleccion_mochila,
+    _valores_prioridad,
+)
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def _demanda_dia(pedidos, seed=7):
+    libro = simular_demanda_vectorizada(
+        1, dic_clientes, dic_sku, seed=seed, pedidos_min=pedidos, pedidos_max=pedidos
+    )
+    return libro.vista_dia(1)
+
+
+def _valor_ponderado(libro_preparados, libro):
+    """Unidades ponderadas por prioridad (objetivo de la mochila)"""
+    tabla = obtener_tabla_prioridades()
+    prioridad_todos = tabla.arreglo(libro.clientes)[libro.cliente]
+    pesos = _valores_prioridad(prioridad_todos)
+    peso_por_prioridad = dict(zip(prioridad_todos.tolist(), pesos.tolist()))
+    prioridad = tabla.arreglo(libro_preparados.clientes)[libro_preparados.cliente]
+    return sum(
+        int(u) * peso_por_prioridad[int(p)]
+        for u, p in zip(libro_preparados.unidades.tolist(), prioridad.tolist())
+    )
+
+
+@pytest.mark.parametrize("capacidad", [1500, 20_000, 100_000, 150_000])
+def test_mochila_no_peor_que_greedy(capacidad):
+    libro = _demanda_dia(6000)
+    greedy = asignar_picking(1, libro, capacidad, modo="greedy")
+    mochila = asignar_picking(1, libro, capacidad, modo="mochila")
+
+    assert mochila["unidades_preparadas"] <= capacidad
+    assert _valor_ponderado(mochila["preparados"], libro) >= _valor_ponderado(
+        greedy["preparados"], libro
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mochila_escalada_no_peor_que_greedy(seed):
+    rng = np.random.default_rng(seed)
+    unidades = rng.integers(1, 150, size=400)
+    prioridad = np.sort(rng.integers(1, 4, size=400))
+    capacidad = int(unidades.sum() // 3)
+    valores = unidades * _valores_prioridad(prioridad)
+
+    # max_celdas pequeño fuerza la versión escalada
+    seleccion = _seleccion_mochila(unidades, prioridad, capacidad, max_celdas=5_000)
+    greedy = _seleccion_greedy(unidades, capacidad)
+
+    assert unidades[seleccion].sum() <= capacidad
+    assert valores[seleccion].sum() >= valores[greedy].sum()
+
+
+@pytest.mark.parametrize("modo", ["greedy", "mochila"])
+def test_diccionario_y_libro_eligen_los_mismos_pedidos(modo):
+    # Más de 999 pedidos en el día: "PED01-1000" va antes que "PED01-999"
+    # como texto, pero después en orden (dia, numero)
+    libro = _demanda_dia(1500, seed=3)
+    pedidos_dia = libro.a_pedidos_dia()
+
+    for capacidad in (5_000, 20_000):
+        por_libro = asignar_picking(1, libro, capacidad, modo=modo)
+        por_diccionario = asignar_picking(1, pedidos_dia, capacidad, modo=modo)
+
+        assert por_libro["preparados"].ids() == list(por_diccionario["preparados"])
+        assert por_libro["unidades_preparadas"] == por_diccionario["unidades_preparadas"]
+
+
+def test_desde_diccionario_conserva_el_orden_numerico():
+    libro = _demanda_dia(1200)
+    reconstruido = LibroPedidos.desde_diccionario(
+        {1: libro.a_pedidos_dia()}, dic_clientes, dic_sku
+    )
+
+    assert reconstruido.ids() == libro.ids()
+    assert np.array_equal(reconstruido.unidades, libro.unidades)
+
+
+def test_prioridad_cliente_grupos_del_catalogo():
+    assert prioridad_cliente("CL01") == (1, "Minero")
+    assert prioridad_cliente("CL07") == (2, "Distribuidor")
+    assert prioridad_cliente("CL99") == (3, "Otros")
+    grupos = {"vip": {"ids": ["CL10"], "prioridad": 1}, "resto": {"ids": [], "prioridad": 2}}
+    assert prioridad_cliente("CL10", grupos) == (1, "vip")
+    assert prioridad_cliente("CL01", grupos) == (2, "resto")
+
+
+def test_sistema_no_importa_config():
+    # El paquete no depende de config.py en la raíz del repositorio
+    codigo = (
+        "import sys; import sistema; "
+        "sistema.Simulacion(seed=1, arrastrar_backlog=True).ejecutar(2); "
+        "print('config' in sys.modules)"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert salida.stdout.strip() == "False"
+
+
+def test_backlog_greedy_revisa_todo_el_dia_por_defecto():
+    # 60 pedidos grandes de mineros (solo cabe uno) antes de pedidos chicos:
+    # con la cola se debe elegir lo mismo que asignar_picking
+    pedidos = {
+        f"PED01-{i:03d}": {
+            "cliente": "CL01" if i <= 60 else "CL09",
+            "lineas": [{"sku": "CAT140-0101", "cantidad": 1000 if i <= 60 else 5}],
+        }
+        for i in range(1, 101)
+    }
+    esperado = asignar_picking(1, pedidos, 1500)
+    con_cola = asignar_picking_con_backlog(1, pedidos, ColaBacklog(), 1500)
+    assert set(con_cola["preparados"]) == set(esperado["preparados"])
+    assert con_cola["unidades_preparadas"] == esperado["unidades_preparadas"] == 1200
+
+
+def test_mochila_del_backlog_acotada_a_los_primeros_de_la_cola():
+    pedidos = _demanda_dia(3000).a_pedidos_dia()
+    cola = ColaBacklog()
+    cola.agregar_pedidos(1, pedidos)
+    primeros = [e[3] for e in sorted(cola._monticulo)[:200]]
+    unidades = cola.unidades
+
+    extraidos, usada = cola.extraer_mochila(1500, max_candidatos=200)
+
+    assert set(extraidos) <= set(primeros)
+    assert 0 < usada <= 1500
+    assert len(cola) == 3000 - len(extraidos)
+    assert cola.unidades == unidades - usada
+    # La cola sigue siendo un montículo válido con el resto de pedidos
+    assert [e[3] for e in sorted(cola._monticulo)][:5] == [
+        p for p in primeros if p not in extraidos
+    ][:5]
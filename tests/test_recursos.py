@@ -0,0 +1,113 @@
+"""
+test_recursos.py - Pruebas del caché de recursos de la GUI (requiere PyQt6)
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QGuiApplication, QPixmap  # noqa: E402
+
+import gui.recursos_manager as recursos  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def aplicacion():
+    return QGuiApplication.instance() or QGuiApplication([])
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    """Carpeta de recursos propia con un ícono, un logo y los estilos"""
+    (tmp_path / "iconos").mkdir()
+    (tmp_path / "logos").mkdir()
+    QPixmap(16, 16).save(str(tmp_path / "iconos" / "inicio.png"))
+    QPixmap(400, 100).save(str(tmp_path / "logos" / "logo.png"))
+    (tmp_path / "estilos.qss").write_text("QWidget { color: red; }", encoding="utf-8")
+
+    monkeypatch.setattr(recursos, "obtener_ruta_recursos", lambda: tmp_path)
+    recursos.limpiar_cache()
+    yield tmp_path
+    recursos.limpiar_cache()
+
+
+class _App:
+    def __init__(self):
+        self.hojas = []
+
+    def setStyleSheet(self, texto):
+        self.hojas.append(texto)
+
+
+def _tocar(ruta):
+    """Adelanta la fecha de modificación del archivo"""
+    mtime = os.stat(ruta).st_mtime_ns + 10**9
+    os.utime(ruta, ns=(mtime, mtime))
+
+
+def test_un_recorrido_de_la_carpeta_por_intervalo(carpeta, monkeypatch):
+    recorridos = []
+    scandir = os.scandir
+    monkeypatch.setattr(
+        recursos.os, "scandir", lambda ruta: recorridos.append(ruta) or scandir(ruta)
+    )
+
+    for _ in range(10):
+        recursos.cargar_icono("inicio")
+        recursos.cargar_icono("no_existe")
+        recursos.cargar_logo("logo", 100)
+    # Raíz, iconos y logos: una sola vez
+    assert len(recorridos) == 3
+
+    recursos.obtener_cache().revisar(forzar=True)
+    assert len(recorridos) == 6
+
+
+def test_icono_y_logo_se_reutilizan_hasta_que_cambia_el_archivo(carpeta):
+    icono = recursos.cargar_icono("inicio", 32)
+    assert recursos.cargar_icono("inicio", 32) is icono
+    assert recursos.cargar_icono("inicio", 64) is not icono
+
+    logo = recursos.cargar_logo("logo", 100)
+    assert logo.width() == 100
+    assert recursos.cargar_logo("logo", 100).cacheKey() == logo.cacheKey()
+
+    _tocar(carpeta / "iconos" / "inicio.png")
+    _tocar(carpeta / "logos" / "logo.png")
+    recursos.obtener_cache().revisar(forzar=True)
+    assert recursos.cargar_icono("inicio", 32) is not icono
+    assert recursos.cargar_logo("logo", 100).cacheKey() != logo.cacheKey()
+
+
+def test_estilos_se_releen_solo_si_cambian(carpeta, monkeypatch):
+    lecturas = []
+    monkeypatch.setattr(
+        recursos, "open", lambda *a, **k: lecturas.append(a[0]) or open(*a, **k), raising=False
+    )
+    app = _App()
+    assert recursos.cargar_estilos(app)
+    assert recursos.cargar_estilos(app)
+    assert len(lecturas) == 1
+
+    (carpeta / "estilos.qss").write_text("QWidget { color: blue; }", encoding="utf-8")
+    _tocar(carpeta / "estilos.qss")
+    recursos.obtener_cache().revisar(forzar=True)
+    assert recursos.cargar_estilos(app)
+    assert len(lecturas) == 2
+    assert app.hojas == [
+        "QWidget { color: red; }",
+        "QWidget { color: red; }",
+        "QWidget { color: blue; }",
+    ]
+
+
+def test_recurso_faltante_avisa_una_vez(carpeta, capsys):
+    for _ in range(3):
+        assert recursos.cargar_icono("no_existe").isNull()
+        assert recursos.cargar_logo("no_existe") is None
+    salida = capsys.readouterr().out
+    assert salida.count("Ícono no encontrado") == 1
+    assert salida.count("Logo no encontrado") == 1
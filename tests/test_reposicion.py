@@ -0,0 +1,82 @@
+"""
+test_reposicion.py - Pruebas de la reposición con lead time
+"""
+
+import numpy as np
+import pytest
+
+from sistema.inventario import LibroInventario
+from sistema.motor import Simulacion
+from sistema.reposicion import ReposicionConLeadTime
+
+SKUS = ["A", "B", "C"]
+
+
+def _stock(cantidades):
+    return LibroInventario(SKUS, cantidades)
+
+
+def test_rq_pide_multiplos_del_lote_y_recibe_en_su_dia():
+    stock = _stock([10, 60, 0])
+    reposicion = ReposicionConLeadTime(
+        SKUS, punto_reorden=50, lote=30, lead_times={"A": 2, "B": 0, "C": 3}, politica="RQ"
+    )
+
+    log = reposicion.revisar(1, stock)
+    assert [(o["sku"], o["cantidad_pedida"], o["dia_llegada"]) for o in log] == [
+        ("A", 60, 3),
+        ("C", 60, 4),
+    ]
+    assert stock.cantidad.tolist() == [10, 60, 0]
+    assert reposicion.unidades_en_transito() == 120
+
+    # Lo que está en tránsito cuenta en la posición: no se repite la orden
+    assert reposicion.revisar(2, stock) == []
+    assert reposicion.recibir(2, stock) == 0
+
+    assert reposicion.recibir(3, stock) == 60
+    assert stock.cantidad.tolist() == [70, 60, 0]
+    assert reposicion.recibir(4, stock) == 60
+    assert stock.cantidad.tolist() == [70, 60, 60]
+    assert reposicion.unidades_en_transito() == 0 and reposicion.calendario == {}
+
+
+def test_ss_sube_hasta_el_nivel_maximo_y_lead_time_cero_es_inmediato():
+    stock = _stock([10, 49, 50])
+    reposicion = ReposicionConLeadTime(
+        SKUS, punto_reorden=50, nivel_maximo={"A": 120, "B": 80, "C": 80}, politica="sS"
+    )
+
+    log = reposicion.revisar(1, stock)
+    assert [(o["sku"], o["cantidad_pedida"]) for o in log] == [("A", 110), ("B", 31)]
+    assert stock.cantidad.tolist() == [120, 80, 50]
+    assert reposicion.unidades_en_transito() == 0
+
+
+def test_politica_desconocida():
+    with pytest.raises(ValueError):
+        ReposicionConLeadTime(SKUS, politica="EOQ")
+
+
+@pytest.mark.parametrize("politica", ["sS", "RQ"])
+def test_simulacion_con_lead_time_conserva_las_unidades(politica):
+    n_dias = 30
+    simulacion = Simulacion(
+        politica_reposicion=politica, lead_times=3, stock_inicial=80, seed=21
+    )
+    ordenes = []
+    simulacion.agregar_hook(
+        "reposicion", lambda dia, log: ordenes.extend((dia, o) for o in log)
+    )
+    resultado = simulacion.ejecutar(n_dias)
+
+    assert ordenes
+    assert all(o["dia_llegada"] == dia + 3 for dia, o in ordenes)
+    assert np.all(simulacion.reposicion.en_transito >= 0)
+
+    stock_inicial = 80 * len(simulacion.stock.skus)
+    pedido = sum(o["cantidad_pedida"] for _, o in ordenes)
+    assert (
+        sum(resultado.stock_final.values()) + simulacion.reposicion.unidades_en_transito()
+        == stock_inicial + pedido - resultado.unidades_entregadas
+    )
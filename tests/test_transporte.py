@@ -0,0 +1,119 @@
+"""
+test_transporte.py - Pruebas de planificación de rutas
+"""
+
+import pytest
+
+from sistema.motor import Simulacion
+from sistema.transporte import planificar_rutas
+
+
+CLIENTES = {"C1": "Norte 1", "C2": "Norte 2", "C3": "Sur"}
+DISTANCIAS = {"Norte 1": 400, "Norte 2": 420, "Sur": 300}
+COORDENADAS = {
+    "Norte 1": (-8.0, -79.0),
+    "Norte 2": (-8.2, -79.1),
+    "Sur": (-14.0, -75.7),
+}
+VEHICULOS = {"VH01": {"tipo": "Camión", "capacidad": 1000, "costo_km": 2.0}}
+
+
+def _pedidos():
+    return {
+        f"PED01-00{i}": {"cliente": cliente, "lineas": [{"sku": "S1", "cantidad": 100}]}
+        for i, cliente in enumerate(CLIENTES, start=1)
+    }
+
+
+def test_ahorros_usa_coordenadas_de_un_catalogo_propio():
+    rutas = planificar_rutas(
+        1, _pedidos(), VEHICULOS, DISTANCIAS, CLIENTES, "savings", COORDENADAS
+    )
+
+    paradas = sorted(sorted(r["paradas"]) for r in rutas["rutas"])
+    assert ["Norte 1", "Norte 2"] in paradas
+    assert rutas["unidades_transportadas"] == 300
+
+
+def test_ahorros_sin_coordenadas_falla():
+    with pytest.raises(ValueError, match="sin coordenadas"):
+        planificar_rutas(1, _pedidos(), VEHICULOS, DISTANCIAS, CLIENTES, "savings")
+
+
+def test_simulacion_pasa_coordenadas_al_transporte():
+    simulacion = Simulacion(
+        CLIENTES,
+        {"S1": "Repuesto"},
+        VEHICULOS,
+        DISTANCIAS,
+        algoritmo_transporte="savings",
+        coordenadas_clientes=COORDENADAS,
+        stock_inicial=10_000,
+    )
+    resultado = simulacion.paso(1, _pedidos())
+
+    assert resultado["transporte"]["num_rutas"] == 2
+
+
+def _pedidos_grandes():
+    # Un cliente con pedidos que suman más que el vehículo más grande
+    # (uno solo ya lo supera) y otro con carga chica
+    unidades = {
+        "PED01-001": 600,
+        "PED01-002": 250,
+        "PED01-003": 180,
+        "PED01-004": 90,
+        "PED01-005": 70,
+        "PED01-006": 40,
+    }
+    pedidos = {
+        id_pedido: {"cliente": "C1", "lineas": [{"sku": "S1", "cantidad": u}]}
+        for id_pedido, u in unidades.items()
+    }
+    pedidos["PED01-007"] = {"cliente": "C3", "lineas": [{"sku": "S1", "cantidad": 30}]}
+    return pedidos
+
+
+FLOTA = {
+    "VH01": {"capacidad": 180, "costo_km": 6.5},
+    "VH02": {"capacidad": 220, "costo_km": 7.2},
+    "VH03": {"capacidad": 140, "costo_km": 5.8},
+    "VH04": {"capacidad": 260, "costo_km": 8.1},
+}
+
+
+@pytest.mark.parametrize("algoritmo", ["first-fit", "optimal", "savings"])
+def test_cada_pedido_se_cuenta_en_un_solo_viaje(algoritmo):
+    pedidos = _pedidos_grandes()
+    rutas = planificar_rutas(
+        1, pedidos, FLOTA, DISTANCIAS, CLIENTES, algoritmo, COORDENADAS
+    )
+
+    propios = [p for r in rutas["rutas"] for p in r["pedidos"]]
+    assert sorted(propios) == sorted(pedidos)
+    for r in rutas["rutas"]:
+        assert not set(r["pedidos"]) & set(r["continuacion_de"])
+        assert 0 < r["unidades"] <= r["capacidad"]
+    assert rutas["unidades_transportadas"] == 1260
+    assert rutas["unidades_no_transportadas"] == 0
+
+
+def test_first_fit_decreasing_agrupa_pedidos_enteros():
+    rutas = planificar_rutas(
+        1, _pedidos_grandes(), FLOTA, DISTANCIAS, CLIENTES, "first-fit"
+    )
+    viajes = sorted(
+        (r["pedidos"], r["continuacion_de"], r["unidades"], r["vehiculo"])
+        for r in rutas["rutas"]
+        if r["cliente"] == "Norte 1"
+    )
+    # 600 = 260 + 260 + 80. El resto de 80 abre el primer viaje; 250 no
+    # cabe ahí y abre otro; 180 completa el primero; 90, 70 y 40 comparten
+    # un tercero, que baja al vehículo más chico que los admite
+    assert viajes == [
+        ([], ["PED01-001"], 260, "VH04"),
+        (["PED01-001"], [], 260, "VH04"),
+        (["PED01-002"], [], 250, "VH04"),
+        (["PED01-003"], ["PED01-001"], 260, "VH04"),
+        (["PED01-004", "PED01-005", "PED01-006"], [], 200, "VH02"),
+    ]
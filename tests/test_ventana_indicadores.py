@@ -0,0 +1,122 @@
+"""
+test_ventana_indicadores.py - Pruebas de la pantalla de indicadores en vivo (requiere PyQt6)
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from gui.trabajadores import TrabajadorSimulacion  # noqa: E402
+from gui.ventanas.ventana_indicadores import (  # noqa: E402
+    INDICADORES_CARDS,
+    VentanaIndicadores,
+)
+from sistema.alertas import ProcesadorAlertas  # noqa: E402
+from sistema.motor import Simulacion  # noqa: E402
+
+N_DIAS = 40
+PARAMETROS = {"capacidad_picking": 700, "stock_inicial": 80}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def aplicacion():
+    return QApplication.instance() or QApplication([])
+
+
+class _Principal:
+    def __init__(self):
+        self.resultado = None
+
+    def volver_menu(self):
+        pass
+
+    def resultado_simulacion(self):
+        return self.resultado
+
+
+def _estado(ventana):
+    tarjetas = {
+        metrica: ventana.cards[metrica].label_valor.text()
+        for _, metrica, _ in INDICADORES_CARDS
+    }
+    modelo = ventana.modelo_alertas
+    alertas = [
+        tuple(modelo.texto(fila, j) for j in range(modelo.columnCount()))
+        for fila in range(modelo.rowCount())
+    ]
+    return tarjetas, alertas
+
+
+def _simular_en_vivo(ventana):
+    """Corre la simulación en este hilo con la pantalla suscrita"""
+    trabajador = TrabajadorSimulacion(N_DIAS, seed=3, parametros=PARAMETROS)
+    resultados = []
+    trabajador.terminado.connect(resultados.append)
+    ventana.suscribir(trabajador)
+    trabajador.ejecutar()
+    return resultados[0]
+
+
+def test_en_vivo_igual_a_cargar_el_resultado():
+    principal = _Principal()
+    ventana = VentanaIndicadores(principal)
+    principal.resultado = _simular_en_vivo(ventana)
+
+    assert not ventana.simulando and not ventana.timer.isActive()
+    en_vivo = _estado(ventana)
+    assert en_vivo[1]
+
+    ventana.actualizar()
+    assert _estado(ventana) == en_vivo
+
+    consolidado = principal.resultado.consolidado()
+    for _, metrica, formato in INDICADORES_CARDS:
+        assert en_vivo[0][metrica] == formato.format(consolidado[f"{metrica}_promedio"])
+
+    procesador = ProcesadorAlertas()
+    for resumen, indicadores in zip(
+        principal.resultado.resumen_diario, principal.resultado.indicadores_diarios
+    ):
+        procesador.procesar(resumen["dia"], indicadores)
+    assert [(fila[0], fila[1], fila[2]) for fila in en_vivo[1]] == [
+        (str(e["dia"]), e["tipo"], e["evento"]) for e in procesador.eventos
+    ]
+
+
+def test_los_dias_se_aplican_por_cuadro():
+    ventana = VentanaIndicadores(_Principal())
+    trabajador = TrabajadorSimulacion(N_DIAS, seed=3, parametros=PARAMETROS)
+    ventana.suscribir(trabajador)
+    assert ventana.timer.isActive()
+
+    resultado = Simulacion(seed=3, **PARAMETROS).ejecutar(3)
+    filas = [
+        {"dia": dia, "indicadores": indicadores}
+        for dia, indicadores in enumerate(resultado.indicadores_diarios, start=1)
+    ]
+    for fila in filas:
+        ventana.encolar_dias([fila])
+    # Encolar no repinta
+    assert ventana.cards["otif"].label_valor.text() == "--"
+    assert len(ventana.pendientes) == 3
+
+    ventana.aplicar_pendientes()
+    assert ventana.pendientes == []
+    otif = resultado.consolidado()["otif_promedio"]
+    assert ventana.cards["otif"].label_valor.text() == f"{otif:.1f}%"
+    assert ventana.label_estado.text().startswith(f"Día 3 de {N_DIAS}")
+    ventana.timer.stop()
+
+
+@pytest.mark.parametrize(
+    "valor, color", [(95.0, "rojo"), (96.5, "amarillo"), (97.5, "verde")]
+)
+def test_color_de_tarjeta_sigue_la_banda_de_histeresis(valor, color):
+    ventana = VentanaIndicadores(_Principal())
+    ventana.reiniciar()
+    assert ventana.color_indicador("fill_rate", valor) == color